@@ -1,3 +1,22 @@
-from .base import Finance
-from .tools import write_excel
-from .calculate import cal_price
\ No newline at end of file
+# 包的常用对象在首次访问时才导入（延迟加载 numpy_financial、xlsxwriter、numba 等较重的依赖），
+# 以缩短命令行和多进程工作进程的启动时间
+import importlib
+
+_EXPORTS = {'Finance': 'finance.base',
+            'write_excel': 'finance.tools',
+            'cal_price': 'finance.calculate',
+            'cal_aep': 'finance.calculate',
+            'sweep': 'finance.sweep',
+            'SweepResult': 'finance.store'}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module 'finance' has no attribute %r" % name)
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
@@ -0,0 +1,8 @@
+# -*- encoding: utf-8 -*-
+# python -m finance 命令行入口
+
+import sys
+
+from finance.cli import main
+
+sys.exit(main())
@@ -12,27 +12,30 @@
 # 发电类工程项目财务评价：基础模块
 
 import numpy as np
-import numpy_financial as npf
 import math
 
-# 各省燃煤发电标杆上网电价
-# Price = {'Beijing':0.3598,'Tianjin':0.3655,
-#          'Jibei':0.372,'Jinan':0.3644,
-#          'Shanxi':0.332,'Shandong':0.3949,
-#          'Shanghai':0.4155,'Jiangsu':0.391,
-#          'Zhejiang':0.4153,'Anhui':0.3844,
-#          'Fujian':0.3932,'Jiangxi':0.4143,
-#          'Hubei':0.4161,'Hunan':0.45,
-#          'Henan':0.3779,'Sichuan':0.4012,
-#          'Chongqing':0.3964,'Heilongjiang':0.374,
-#          'Liaoning':0.3749,'Jilin':0.3731,
-#          'Mengdong':0.3035,'Mengxi':0.2829,
-#          'Shanxi':0.3545,'Gansu':0.3078,
-#          'Ningxia':0.2595,'Qinghai':0.3247,
-#          'Xinjiang':0.25,'Xizang':0.4993,
-#          'Guangxi':0.4207,'Yunnan':0.3358,
-#          'Guizhou':0.3515,'Hainan':0.4298,
-#          'Guangdong':0.4530}
+from finance import degradation, profiler
+from finance.profiler import profiled
+
+# 各省燃煤发电标杆上网电价（元/kWh）
+BENCHMARK = {'Beijing':0.3598,'Tianjin':0.3655,
+             'Jibei':0.372,'Jinan':0.3644,
+             'Shanxi':0.332,'Shandong':0.3949,
+             'Shanghai':0.4155,'Jiangsu':0.391,
+             'Zhejiang':0.4153,'Anhui':0.3844,
+             'Fujian':0.3932,'Jiangxi':0.4143,
+             'Hubei':0.4161,'Hunan':0.45,
+             'Henan':0.3779,'Sichuan':0.4012,
+             'Chongqing':0.3964,'Heilongjiang':0.374,
+             'Liaoning':0.3749,'Jilin':0.3731,
+             'Mengdong':0.3035,'Mengxi':0.2829,
+             'Shaanxi':0.3545,'Gansu':0.3078,
+             'Ningxia':0.2595,'Qinghai':0.3247,
+             'Xinjiang':0.25,'Xizang':0.4993,
+             'Guangxi':0.4207,'Yunnan':0.3358,
+             'Guizhou':0.3515,'Hainan':0.4298,
+             'Guangdong':0.4530}
+# 示例脚本测算的省份及电价
 Price = {'Ningxia':0.2425}
 
 class Finance(object):
@@ -155,6 +158,18 @@ class Finance(object):
 
         residual_rate: float, default = 0.05
             残值率，默认值为 5 %
+
+        degradation: None, str, dict or sequence, default = None
+            出力衰减曲线（逐经营年相对首年上网电量的系数），可为模型名、带参数的模型或逐年系数序列，
+            详见 finance.degradation；默认值 None 为原有的曲线（第 2 年 0.98，其后每年递减 0.45 %）
+
+        price_path: None or sequence, default = None
+            逐经营年的上网电价（如补贴期电价后接平价电价），单位为“元/kWh”，长度不少于经营期；
+            给定时代替 price，见 finance.paths
+
+        aep_path: None or sequence, default = None
+            逐经营年的年发电利用小时数（如各年的风资源、光资源情景），单位为“小时”，长度不少于经营期；
+            给定时代替 aep，再乘以衰减曲线得到逐年上网电量
             
         ### 三个辅助性的流量表单
         cost_list: list<double>, default = []
@@ -181,7 +196,8 @@ class Finance(object):
                  vat_rate=0.13, vat_refund_rate=0.5, edu_surcharge_rate=0.05,workers=25, labor_cost=16.0, in_repair_rate=0.005,
                  out_repair_rate=0.015, warranty=5.0, depreciation_period=20,insurance_rate=0.0025, material_quota=10.0,
                  other_quota=30.0, working_quota=30.0, provident_rate=0.1, operate_period=20, build_period=1.0, loan_period=15, 
-                 grace_period=1, residual_rate=0.05, cost_list=[], cash_list=[], cap_list=[]):
+                 grace_period=1, residual_rate=0.05, cost_list=[], cash_list=[], cap_list=[], degradation=None,
+                 price_path=None, aep_path=None):
       """
       初始化类变量
       """
@@ -226,7 +242,11 @@ class Finance(object):
       self.cost_list = cost_list
       self.cash_list = cash_list
       self.cap_list = cap_list
+      self.degradation = degradation
+      self.price_path = price_path
+      self.aep_path = aep_path
 
+    @profiled('com_finance')
     def com_finance(self, mode=False):
       """
       计算类实例所抽象出的项目（边界）的（财务、资本金等）现金流序列。
@@ -252,6 +272,7 @@ class Finance(object):
         2. 注意临时变量的分类和初始化工作；
         3. 第一阶段默认建设期为 1 年，运营期（含建设期）为 21 年，后续再行扩充可变建设期和运营期。
       """
+      clock = profiler.clock('com_finance')  # 分阶段计时器（未开启计时时为 None）
       ################################################################################
       ## 辅助标签变量
       build_cells = math.ceil(self.build_period)  # 建设期列表长度（整年数）
@@ -330,6 +351,7 @@ class Finance(object):
       cap_netflow = np.zeros(row_cells)  # 资本金净现金流量  “万元”
       self.cap_list = np.zeros(row_cells)  # 资本金现金流量辅助流量表单  “万元”
       ################################################################################
+      if clock: clock.lap('init')  # 序列初始化
       ################################################################################
       ## 投资计划与资金筹措（暂按建设期为 1 年的标准考虑）
       build_investment[1] = self.static_investment  # 建设期（首年）投资
@@ -348,6 +370,7 @@ class Finance(object):
       working_loan[0] = np.sum(working_loan)  # 流动资金贷款总额
       debt = total_investment - capital  # 总贷款序列（含建设期和运营首年）
       finance = capital + debt  # 总筹款序列（含建设期和运营首年）
+      if clock: clock.lap('investment')  # 投资计划与资金筹措
       ################################################################################
       ################################################################################
       ## 临时辅助性变量
@@ -384,6 +407,7 @@ class Finance(object):
       amortization[0] = np.sum(amortization)  # 总摊销费
       var_cost = material  # 可变成本序列
       operate_cost = maintenance + wage + insurance + material + other_expense + self.cost_list  # 运营成本序列
+      if clock: clock.lap('cost')  # 总成本费用估算
       ################################################################################
       ################################################################################
       ## 借款还本付息计划
@@ -404,14 +428,26 @@ class Finance(object):
       total_return = long_return + working_return  # 当期还本付息总计序列
       total_cost = depreciation + operate_cost + amortization + interest  # 总成本费用序列
       fix_cost = total_cost - var_cost  # 固定成本序列
+      if clock: clock.lap('loan')  # 借款还本付息计划
       ################################################################################
       ################################################################################
       ## 利润和利润分配
-      power[build_cells + 1] = self.capacity * self.aep / 0.93112
-      power[build_cells + 2] = power[build_cells + 1]*0.98
-      for i in range(self.operate_period-2):
-        power[build_cells + 3 + i] = power[build_cells + 2] * (0.9755-i * 0.0045)  # 发电量序列
-      income[build_cells + 1:] = power[build_cells+1:] * self.price / (1 + self.vat_rate)  # 运营期营业收入序列
+      aep, price = self.aep, self.price
+      if self.aep_path is not None or self.price_path is not None:  # 给定逐年发电小时数、电价
+        from finance.paths import annual
+        if self.aep_path is not None:
+          aep = annual(self.aep_path, self.operate_period, 'aep_path')
+        if self.price_path is not None:
+          price = annual(self.price_path, self.operate_period, 'price_path')
+      if self.degradation is None and self.aep_path is None:
+        power[build_cells + 1] = self.capacity * self.aep / 0.93112
+        power[build_cells + 2] = power[build_cells + 1]*0.98
+        for i in range(self.operate_period-2):
+          power[build_cells + 3 + i] = power[build_cells + 2] * (0.9755-i * 0.0045)  # 发电量序列
+      else:  # 给定衰减曲线或逐年发电小时数
+        factors = degradation.curve(self.degradation, self.operate_period)
+        power[build_cells + 1:] = self.capacity * aep / 0.93112 * factors  # 发电量序列
+      income[build_cells + 1:] = power[build_cells+1:] * price / (1 + self.vat_rate)  # 运营期营业收入序列
       income[0] = np.sum(income)  # 运营期营业收入总计
       vat[build_cells+1:] = income[build_cells + 1:] * self.vat_rate/(1+self.vat_rate)  # 增值税序列
       vat[0] = np.sum(vat)  # 增值税总计
@@ -459,6 +495,7 @@ class Finance(object):
       provident = net_profit * self.provident_rate  # 法定盈余公积金序列
       distribute_profit = net_profit - provident  # 可供投资者分配的利润序列
       ebit = profit + interest  # 息税前利润序列
+      if clock: clock.lap('profit')  # 利润和利润分配（含税金）
       ################################################################################
       ################################################################################
       ## 项目投资现金流量
@@ -477,6 +514,7 @@ class Finance(object):
       cap_inflow = income + subside + recover_asset + recover_cap_working  # 现金流入序列（资本金）
       cap_outflow = capital + long_principal + interest + operate_cost + operate_tax + income_tax # 现金流出序列（资本金）
       cap_netflow = cap_inflow - cap_outflow + self.cap_list  # 净现金流量（资本金）
+      if clock: clock.lap('cash_flow')  # 项目投资和资本金现金流量
       ################################################################################
       ################################################################################
       ## 处理 mode 为 TRUE 情况（即需要计算表格输出）
@@ -507,6 +545,7 @@ class Finance(object):
         
         # 合并过程结果表（项目总投资使用计划与资金筹措表，总成本费用估算表，借款还本付息计划表，利润与利润分配表，项目现金流量表，项目资本金流量表等）
         com_result = [investment_finance, cost_finance, return_finance, profit_finance, pro_flow, cap_flow]
+      if clock and mode: clock.lap('tables')  # 过程结果表
       ################################################################################
       ################################################################################
       # 返回结果数组（元组）（总计值不再列入返回的流量表）
@@ -540,6 +579,7 @@ class Finance(object):
       pass
 
     @staticmethod
+    @profiled('com_irr')
     def com_irr(cash_array):
       """
       根据输入的现金流量数组，计算对应的内部收益率。
@@ -558,8 +598,10 @@ class Finance(object):
       ----------
         1. 为扩大方法的使用范围，将方法设置为类方法；
         2. 第一阶段暂不考虑输入参数无效的检查和处理；
-        3. 注意极端情况的考虑。
+        3. 注意极端情况的考虑；
+        4. numpy_financial 在首次调用时才导入，以缩短包的导入时间。
       """
+      import numpy_financial as npf
       return npf.irr(cash_array)
 
     @staticmethod
@@ -0,0 +1,300 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   batch.py
+@Time    :   2026/10/19 16:48:10
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 分块批量计算：将现金流计算分为“投资融资”和“收入税金”两块，按扫描参数影响的计算块规划扫描顺序
+#
+# 投资融资块（投资计划、资金筹措、固定资产、总成本费用、借款还本付息、回收资产）只与投资、融资和运维
+# 参数有关；收入税金块（发电量、营业收入、增值税及附加、所得税和三条净现金流）另与电价、发电量和税率有关。
+# 批量计算时投资融资块按不同的参数组合只算一次，收入税金块对全部情景按年份向量化计算，
+# 扫描时只影响收入税金块的参数置于内层，使同一批次的情景尽可能共享投资融资块。
+
+import numpy as np
+
+from finance import kernel
+from finance.profiler import profiled
+
+# 只影响收入税金块的参数（另有衰减曲线轴 degradation）
+REVENUE = ('aep', 'price', 'income_tax_rate', 'build_tax_rate', 'edu_surcharge_rate', 'vat_refund_rate')
+# 不参与现金流计算的参数
+UNUSED = ('provident_rate', 'grace_period')
+# 影响投资融资块的参数（装机容量、增值税率同时影响收入税金块）
+FINANCING = tuple(name for name in kernel.FIELDS if name not in REVENUE and name not in UNUSED)
+_COLUMNS = [kernel.INDEX[name] for name in FINANCING]
+
+
+def block(name):
+    """
+    参数影响的（最靠前的）计算块：'financing'、'revenue'，不影响现金流时为 None。
+    unit_investment 等派生参数按其换算后的参数计。
+    """
+    from finance.sweep import DEGRADATION, UNIT_AXES
+    name = UNIT_AXES.get(name, name)
+    if name in REVENUE or name == DEGRADATION:
+        return 'revenue'
+    if name in UNUSED:
+        return None
+    return 'financing'
+
+
+def plan(names):
+    """
+    规划扫描轴的计算顺序：不影响现金流的参数在最外层，影响投资融资块的参数在其次，
+    只影响收入税金块的参数在最内层，同类参数保持原有顺序。
+
+    输入参数：
+    ----------
+        names: list<str>
+            扫描轴的参数名（按原有顺序）
+
+    返回结果：
+    ----------
+        order: list<int>
+            计算顺序下各扫描轴的原序号
+    """
+    rank = {None: 0, 'financing': 1, 'revenue': 2}
+    return sorted(range(len(names)), key=lambda k: rank[block(names[k])])
+
+
+def _column(params, name):
+    return params[:, kernel.INDEX[name]]
+
+
+@profiled('batch.financing')
+def financing(params):
+    """
+    批量计算投资融资块。
+
+    输入参数：
+    ----------
+        params: np.array<float>
+            参数矩阵，形状为（情景数, len(FIELDS)），各情景的现金流长度须一致
+
+    返回结果：
+    ----------
+        block: dict<str, np.array<float>>
+            'vat_deduction'、'fix_assets'（情景数,）及逐年的 'total_cost'、'pro_outflow'、'cap_outflow'
+            （不含税金）、'recover_asset'、'recover_pro_working'、'recover_cap_working'（情景数, 年份数）
+    """
+    p = lambda name: _column(params, name)[:, None]
+    cells = kernel.flow_cells(params)
+    build_cells = np.ceil(p('build_period'))
+    t = np.arange(cells)[None, :] - build_cells  # 运营期内的年序号（建设期为负）
+    operating = t >= 0
+    last = np.arange(cells)[None, :] == cells - 1
+
+    ## 投资计划与资金筹措
+    static_investment = p('static_investment')
+    build_interest = static_investment * p('loan_rate') * p('rate_discount') / 2
+    working = p('capacity') * p('working_quota')
+    joint = build_cells == 0  # 无建设期时建设投资与流动资金同在首年
+    total_first = np.where(joint, static_investment + build_interest + working, 0.0 + working)
+    total_build = np.where(joint, total_first, static_investment + build_interest + 0.0)
+    capital_first = total_first * p('working_ratio')
+    capital_build = np.where(joint, capital_first, total_build * p('capital_ratio'))
+    long_loan = total_build - capital_build
+    working_loan = total_first - capital_first
+    build_investment = np.where(np.arange(cells)[None, :] == 0, static_investment, 0.0)
+    working_capital = np.where(t == 0, working, 0.0)
+    capital = np.where(t == 0, capital_first, 0.0)
+    capital = np.where(np.arange(cells)[None, :] == 0, capital_build, capital)
+
+    ## 固定资产与增值税进项税
+    equipment_cost = np.where(p('equipment_ratio') != 0.0, static_investment * p('equipment_ratio'),
+                              p('equipment_cost'))
+    install_cost = np.where(p('install_ratio') != 0.0, static_investment * p('install_ratio'), p('install_cost'))
+    build_cost = np.where(p('build_ratio') != 0.0, static_investment * p('build_ratio'), p('build_cost'))
+    other_cost = np.where(p('other_ratio') != 0.0, static_investment * p('other_ratio'), p('other_cost'))
+    vat_rate = p('vat_rate')
+    vat_deduction = equipment_cost / (1 + vat_rate) * vat_rate + (
+        build_cost + install_cost) / (1 + 0.09) * 0.09 + other_cost / (1 + 0.06) * 0.06
+    fix_assets = total_build - vat_deduction
+
+    ## 总成本费用与借款还本付息
+    material = p('capacity') * p('material_quota')
+    wage = p('workers') * p('labor_cost')
+    maintenance = np.where(t < p('warranty'), fix_assets * p('in_repair_rate'), fix_assets * p('out_repair_rate'))
+    insurance = fix_assets * p('insurance_rate')
+    other_expense = p('capacity') * p('other_quota')
+    depreciation = np.where(t < p('depreciation_period'),
+                            fix_assets * (1 - p('residual_rate')) / p('depreciation_period'), 0.0)
+    operate_cost = np.where(operating, maintenance + wage + insurance + material + other_expense + 0.0, 0.0)
+    long_principal = long_loan / p('loan_period')
+    repaying = operating & (t < p('loan_period'))
+    principal = np.where(repaying, long_principal, 0.0)
+    long_interest = np.where(repaying, (long_loan - t * long_principal) * p('loan_rate') * p('rate_discount'), 0.0)
+    interest = np.where(operating, long_interest + working_loan * p('working_rate'), 0.0)
+    total_cost = np.where(operating, depreciation + operate_cost + 0.0 + interest, 0.0)
+
+    return {'vat_deduction': vat_deduction[:, 0], 'fix_assets': fix_assets[:, 0], 'total_cost': total_cost,
+            'pro_outflow': build_investment + working_capital + operate_cost,
+            'cap_outflow': capital + principal + interest + operate_cost,
+            'recover_asset': np.where(last & operating, fix_assets * p('residual_rate'), 0.0),
+            'recover_pro_working': np.where(last & operating, working, 0.0),
+            'recover_cap_working': np.where(last & operating, working * p('working_ratio'), 0.0)}
+
+
+def degraded_power(params, factors, aep=None):
+    """
+    逐经营年的上网电量矩阵（情景数, 经营年数）：各情景首年上网电量（capacity * aep / 0.93112）乘以其衰减系数。
+
+    输入参数：
+    ----------
+        params: np.array<float>
+            参数矩阵，形状为（情景数, len(FIELDS)）
+
+        factors: np.array<float>
+            衰减系数矩阵，形状为（情景数或 1, 经营年数），见 finance.degradation
+
+        aep: np.array<float>, default = None
+            逐经营年的年发电利用小时数，形状为（情景数或 1, 经营年数），为 None 时各年均取参数矩阵中的 aep
+            （见 finance.paths）
+    """
+    params = np.atleast_2d(params)
+    if aep is not None:
+        return _column(params, 'capacity')[:, None] * np.atleast_2d(aep) / 0.93112 * np.atleast_2d(factors)
+    first = _column(params, 'capacity') * _column(params, 'aep') / 0.93112
+    return first[:, None] * np.atleast_2d(factors)
+
+
+def legacy_power(params, years):
+    """
+    按原有衰减曲线逐经营年的上网电量矩阵（情景数, years），与 revenue 中 power 为 None 时的计算逐位相同。
+    """
+    params = np.atleast_2d(params)
+    t = np.arange(years)[None, :]
+    power_first = _column(params, 'capacity')[:, None] * _column(params, 'aep')[:, None] / 0.93112
+    power_second = power_first * 0.98
+    return np.where(t == 0, power_first, np.where(t == 1, power_second, power_second * (0.9755 - (t - 2) * 0.0045)))
+
+
+def _operating(series, t):
+    """
+    将逐经营年的序列（情景数或 1, 经营年数）按各情景的经营期首年对齐到现金流年份上，建设期为 0。
+    """
+    series = np.asarray(series, dtype=np.float64)
+    series = np.broadcast_to(np.atleast_2d(series), (t.shape[0], series.shape[-1]))
+    if series.shape[-1] < t.max() + 1:
+        raise ValueError('逐年序列的年数（%d）少于经营期（%d）' % (series.shape[-1], t.max() + 1))
+    index = np.clip(t, 0, None).astype(np.int64)
+    return np.where(t >= 0, np.take_along_axis(series, index, axis=1), 0.0)
+
+
+@profiled('batch.revenue')
+def revenue(params, fin, group=None, power=None, sales=None):
+    """
+    批量计算收入税金块，得到三条净现金流。
+
+    输入参数：
+    ----------
+        params: np.array<float>
+            参数矩阵，形状为（情景数, len(FIELDS)）
+
+        fin: dict<str, np.array<float>>
+            投资融资块（financing 的结果）
+
+        group: np.array<int>, default = None
+            各情景对应的投资融资块行号，为 None 时与情景一一对应
+
+        power: np.array<float>, default = None
+            逐经营年的上网电量，单位为“万千瓦时”，形状为（情景数或 1, 经营年数）；
+            为 None 时按年发电小时数 aep 和固定衰减计算
+
+        sales: np.array<float>, default = None
+            逐经营年的售电收入（含税），单位为“万元”，形状同 power；为 None 时为上网电量乘以电价
+
+    返回结果：
+    ----------
+        flows: np.array<float>
+            形状为（情景数, 3, 年份数）的现金流数组，与 kernel.com_flows 相同
+    """
+    if group is not None:
+        fin = {name: value[group] for name, value in fin.items()}
+    p = lambda name: _column(params, name)[:, None]
+    n, cells = fin['total_cost'].shape
+    t = np.arange(cells)[None, :] - np.ceil(p('build_period'))
+    operating = t >= 0
+
+    ## 上网电量与营业收入
+    if power is None:
+        power_first = p('capacity') * p('aep') / 0.93112
+        power_second = power_first * 0.98
+        power = np.where(t == 0, power_first,
+                         np.where(t == 1, power_second, power_second * (0.9755 - (t - 2) * 0.0045)))
+    else:
+        power = _operating(power, t)
+    vat_rate = p('vat_rate')
+    if sales is None:
+        income = np.where(operating, power * p('price') / (1 + vat_rate), 0.0)
+    else:
+        income = np.where(operating, _operating(sales, t) / (1 + vat_rate), 0.0)
+    vat = np.where(operating, income * vat_rate / (1 + vat_rate), 0.0)
+    balance = np.zeros((n, cells))  # 增值税进项税抵扣余额（逐年递推）
+    for k in range(cells):
+        previous = balance[:, k - 1] - vat[:, k - 1] if k > 0 else 0.0
+        balance[:, k] = np.where(t[:, k] == 0, fin['vat_deduction'], previous)
+
+    ## 税金及附加、增值税返还
+    build_tax_rate = p('build_tax_rate')
+    edu_surcharge_rate = p('edu_surcharge_rate')
+    paying = balance <= 0
+    partial = (balance > 0) & (balance - vat <= 0)
+    build_tax = np.where(paying, vat * build_tax_rate, np.where(partial, (vat - balance) * build_tax_rate, 0.0))
+    edu_surcharge = np.where(paying, vat * edu_surcharge_rate,
+                             np.where(partial, (vat - balance) * edu_surcharge_rate, 0.0))
+    build_tax = np.where(operating, build_tax, 0.0)
+    operate_tax = np.where(operating, build_tax + edu_surcharge, 0.0)
+    vat_return = np.where(operating, build_tax * p('vat_refund_rate') / build_tax_rate, 0.0)
+    turning = operating & (np.arange(1, cells + 1)[None, :] < p('operate_period'))
+    vat_turn = np.where(turning, np.where(balance < 0, 0.0, np.where(balance >= vat, vat, balance)), 0.0)
+
+    ## 所得税（三免三减半）
+    tax_income = income - operate_tax - fin['total_cost'] + vat_return - 0.0
+    income_tax_rate = p('income_tax_rate')
+    income_tax = np.where((t < 3) | (tax_income <= 0), 0.0,
+                          np.where(t < 6, tax_income * income_tax_rate / 2, tax_income * income_tax_rate))
+    income_tax = np.where(operating, income_tax, 0.0)
+
+    ## 净现金流
+    subside = vat_return + vat_turn
+    flows = np.empty((n, 3, cells))
+    pro_inflow = income + subside + fin['recover_asset'] + fin['recover_pro_working']
+    flows[:, 0] = pro_inflow - (fin['pro_outflow'] + operate_tax) + 0.0
+    flows[:, 1] = flows[:, 0] - income_tax
+    cap_inflow = income + subside + fin['recover_asset'] + fin['recover_cap_working']
+    flows[:, 2] = cap_inflow - (fin['cap_outflow'] + operate_tax + income_tax) + 0.0
+    return flows
+
+
+@profiled('batch.com_flows')
+def com_flows(params, power=None, sales=None):
+    """
+    分块批量计算多个情景的三条净现金流，结果与 kernel.com_flows 逐位相同。
+    投资融资参数相同的相邻情景只计算一次投资融资块（扫描时由 plan 安排扫描轴的顺序使其相邻）。
+
+    输入参数：
+    ----------
+        params: np.array<float>
+            参数矩阵，形状为（情景数, len(FIELDS)），各情景的现金流长度须一致
+
+        power, sales: np.array<float>, default = None
+            逐经营年的上网电量和售电收入（含税），见 revenue
+
+    返回结果：
+    ----------
+        flows: np.array<float>
+            形状为（情景数, 3, 年份数）的现金流数组
+    """
+    params = np.atleast_2d(np.asarray(params, dtype=np.float64))
+    columns = params[:, _COLUMNS]
+    change = np.ones(params.shape[0], dtype=bool)
+    change[1:] = np.any(columns[1:] != columns[:-1], axis=1)
+    fin = financing(params[change])
+    return revenue(params, fin, np.cumsum(change) - 1, power, sales)
@@ -0,0 +1,233 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   cache.py
+@Time    :   2026/10/19 16:12:05
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 测算结果的持久缓存：以全部边界参数及测算选项的哈希为键，跨次运行复用已算过的情景
+#
+# 用法：
+#     cache = Cache('~/.cache/finance/cache.sqlite', limit=2 ** 30)
+#     sweep(finance, axes, target='price', cache=cache)   # 仅计算缓存中没有的单元
+#     cal_price(finance, cache=cache)
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import numpy as np
+
+from finance import degradation, kernel
+
+_MODEL = None  # 测算模型源码的摘要，模型修改后旧缓存自动失效
+# 测算路径上的模块：现金流（base、kernel、batch）、衰减曲线与逐年路径（degradation、paths）、临界值与批量计算（calculate、sweep）
+MODULES = ('base.py', 'kernel.py', 'batch.py', 'degradation.py', 'paths.py', 'calculate.py', 'sweep.py')
+
+
+def model_digest():
+    """
+    测算模型源码（MODULES）的摘要，作为所有缓存键的一部分。
+    """
+    global _MODEL
+    if _MODEL is None:
+        digest = hashlib.blake2b(json.dumps(kernel.FIELDS).encode('utf-8'), digest_size=16)
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in MODULES:
+            with open(os.path.join(here, name), 'rb') as f:
+                digest.update(f.read())
+        _MODEL = digest.digest()
+    return _MODEL
+
+
+class Cache(object):
+    """ 内容寻址的测算结果缓存
+    以 SQLite 文件存储，键为参数向量（kernel.pack）与测算目标、选项的哈希，值为 float64 数组；
+    超出容量上限时按最近使用时间淘汰（LRU）。可在多个进程间共享同一缓存文件。
+
+    成员变量：
+    ----------
+        path: str
+            缓存文件路径
+
+        limit: integer, default = 2 ** 30
+            缓存容量上限（按结果数据的字节数计），单位为“字节”
+
+        hits, misses: integer
+            本对象的命中、未命中次数
+
+    备注：
+    ----------
+        容量检查需统计整个缓存文件，每写入约 limit 的 1% 才检查一次，缓存可短暂超出上限约 1%。
+    """
+
+    def __init__(self, path, limit=2 ** 30):
+        self.path = os.path.expanduser(path)
+        self.limit = limit
+        self.hits = 0
+        self.misses = 0
+        self._written = 0  # 上次容量检查以来写入的字节数
+        self._connection = None
+
+    def __getstate__(self):  # 传给工作进程时只传路径和容量，由工作进程自行连接
+        return {'path': self.path, 'limit': self.limit}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['limit'])
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=60)
+            self._connection.execute('CREATE TABLE IF NOT EXISTS entries '
+                                     '(key BLOB PRIMARY KEY, value BLOB, size INTEGER, used REAL)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS entries_used ON entries (used)')
+            self._connection.commit()
+        return self._connection
+
+    @staticmethod
+    def keys(params, kind, **options):
+        """
+        计算缓存键。
+
+        输入参数：
+        ----------
+            params: np.array<float> or list<np.array<float>>
+                参数向量（kernel.pack）、参数矩阵（每行一个情景），或各情景的参数向量列表（可不等长，如附加衰减系数）
+
+            kind: str
+                结果类别（如 'irr'、'flows'、'cal_price'）
+
+            options: dict
+                影响结果的测算选项（收益率标准、模式、求解方法、步长等）
+
+        返回结果：
+        ----------
+            keys: list<bytes>
+                各情景的缓存键
+        """
+        if not isinstance(params, list):
+            params = np.atleast_2d(np.asarray(params, dtype=np.float64))
+        suffix = model_digest() + json.dumps([kind, sorted(options.items())]).encode('utf-8')
+        return [hashlib.blake2b((np.asarray(row, dtype=np.float64) + 0.0).tobytes() + suffix,  # + 0.0 统一 -0.0 与 0.0
+                                digest_size=20).digest() for row in params]
+
+    def get_many(self, keys):
+        """
+        批量查询，返回 键 -> float64 数组（仅含命中的键），并更新其最近使用时间。
+        """
+        found = {}
+        connection = self.connection
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            marks = ','.join('?' * len(part))
+            for key, value in connection.execute('SELECT key, value FROM entries WHERE key IN (%s)' % marks, part):
+                found[key] = np.frombuffer(value, dtype=np.float64)
+        if found:
+            now = time.time()
+            connection.executemany('UPDATE entries SET used = ? WHERE key = ?', [(now, key) for key in found])
+            connection.commit()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """
+        批量写入 键 -> 数组，写入后超出容量上限时淘汰最久未使用的结果。
+        """
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            data = np.ascontiguousarray(value, dtype=np.float64).tobytes()
+            rows.append((key, data, len(data), now))
+        connection = self.connection
+        connection.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)', rows)
+        connection.commit()
+        self._written += sum(row[2] for row in rows)
+        if self._written >= max(self.limit // 100, 1):
+            self.evict()
+
+    def get(self, key):
+        """
+        查询单个键，未命中时返回 None。
+        """
+        return self.get_many([key]).get(key)
+
+    def put(self, key, value):
+        """
+        写入单个键。
+        """
+        self.put_many({key: value})
+
+    @property
+    def size(self):
+        """
+        缓存的结果数据字节数。
+        """
+        return self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def evict(self):
+        """
+        超出容量上限时，按最近使用时间从旧到新删除，直至占用降到上限的 90%。
+        """
+        self._written = 0
+        excess = self.size - self.limit
+        if excess <= 0:
+            return
+        excess += self.limit // 10
+        connection = self.connection
+        victims = []
+        for key, size in connection.execute('SELECT key, size FROM entries ORDER BY used'):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany('DELETE FROM entries WHERE key = ?', victims)
+        connection.commit()
+
+    def clear(self):
+        """
+        清空缓存。
+        """
+        self.connection.execute('DELETE FROM entries')
+        self.connection.commit()
+        self.connection.execute('VACUUM')
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def cached(cache, finance, kind, compute, **options):
+    """
+    以缓存包装单个项目边界的测算：命中时直接返回缓存结果，否则调用 compute() 计算并写入缓存。
+    compute 返回数值或数组，结果以一维 float64 数组返回；缓存键在计算前（项目边界被修改前）生成。
+    """
+    params = kernel.pack(finance)
+    if getattr(finance, 'degradation', None) is not None:  # 衰减系数并入缓存键
+        params = np.concatenate([params, degradation.curve(finance.degradation, int(finance.operate_period))])
+    for marker, name in ((-1.0, 'price_path'), (-2.0, 'aep_path')):  # 逐年路径并入缓存键，以负数标记区分
+        if getattr(finance, name, None) is not None:
+            path = np.asarray(getattr(finance, name), dtype=np.float64)[:int(finance.operate_period)]
+            params = np.concatenate([params, [marker], path])
+    key = cache.keys(params, kind, **options)[0]
+    value = cache.get(key)
+    if value is not None:
+        return value
+    value = np.atleast_1d(np.asarray(compute(), dtype=np.float64))
+    cache.put(key, value)
+    return value
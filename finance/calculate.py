@@ -12,15 +12,123 @@
 # 计算各项财务边界面
 
 # 导入工具包
-import os, sys
 import numpy as np
-# 加载模块路径
-sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 # 导入自己的包
 from finance.base import Finance
+from finance import kernel
+from finance.cache import cached
+from finance.profiler import profiled
 
 
-def cal_price(finance, pro_irr=0.06, cap_irr=0.08, mode=0):
+def _com_flow(finance, jit=False, info=None):
+    """
+    计算现金流元组（项目税前净现金流，项目税后净现金流，资本金现金流），jit 为 True 时使用编译内核；
+    info 不为 None 时累计现金流计算次数 info['evaluations']。
+    """
+    if info is not None:
+        info['evaluations'] = info.get('evaluations', 0) + 1
+    if jit:
+        return kernel.com_finance(finance)
+    return finance.com_finance()
+
+
+def _com_irr(flow, jit=False):
+    """
+    计算现金流对应的内部收益率，jit 为 True 时使用编译内核。
+    """
+    if jit:
+        return float(kernel.com_irr(flow))
+    return Finance.com_irr(flow)
+
+
+def _constant(finance, name):
+    """
+    临界电价（发电量）的求解要求该参数各年相同：给定逐年路径（price_path、aep_path，见 finance.paths）时抛出 ValueError。
+    """
+    if getattr(finance, name + '_path', None) is not None:
+        raise ValueError('给定逐年路径 %s_path 时无法求解临界 %s，请用 finance.paths.simulate 测算' % (name, name))
+
+
+def solve_root(npv, x0):
+    """
+    求解单调增函数 npv 的零点（割线法与二分法结合，见 _solve_exact 的备注），x0 为起算点。
+    npv(x) 返回（函数值，收敛判据的量级）；本函数不保存任何状态，可在多个线程中同时调用。
+    """
+    g0, scale = npv(x0)
+    x1 = x0 * 1.001 if x0 != 0 else 1.0
+    g1, _ = npv(x1)
+    low, high = -np.inf, np.inf  # 函数值为负 / 为正的已知参数值
+    for x, g in ((x0, g0), (x1, g1)):
+        if g < 0:
+            low = max(low, x)
+        else:
+            high = min(high, x)
+    for _ in range(100):
+        if g1 != g0:
+            x2 = x1 - g1 * (x1 - x0) / (g1 - g0)  # 割线（分段内为精确解）
+        else:
+            x2 = np.nan
+        if not low < x2 < high:
+            if np.isfinite(low) and np.isfinite(high):
+                x2 = (low + high) / 2
+            elif np.isfinite(low):
+                x2 = low + 2 * abs(x1 - x0) + abs(low)
+            else:
+                x2 = high - 2 * abs(x1 - x0) - abs(high)
+        g2, scale = npv(x2)
+        if g2 < 0:
+            low = max(low, x2)
+        else:
+            high = min(high, x2)
+        if abs(g2) <= 1e-12 * scale or high - low < np.inf and high - low <= 4 * np.finfo(float).eps * abs(high):
+            return x2
+        x0, g0, x1, g1 = x1, g1, x2, g2
+    return x2
+
+
+def _solve_exact(finance, name, index, rate, jit=False, info=None, sign=1.0):
+    """
+    精确求解使第 index 条现金流在折现率 rate 下净现值为零（即 IRR 恰为 rate）的参数 name（'price' 或 'aep'；
+    'static_investment' 时 sign 为 -1，净现值随静态投资减少）。
+
+    备注：
+    ----------
+        1. 营业收入与电价、发电量成正比，给定折现率下现金流的净现值是电价（发电量）的分段线性函数，
+           仅在所得税“三免三减半”、亏损和增值税进项税抵扣余额等分段处改变斜率；
+        2. 用割线法迭代：两点在同一分段内时一步即得精确解，跨越分段时新点落入新的分段，下一步即在新分段内求得精确解；
+           同时记录净现值异号的区间，割线点落在区间外时改用二分法，保证收敛；
+        3. 一般 2~4 次现金流计算即收敛到机器精度；
+        4. 静态投资同样以分段线性的方式进入投资、贷款、折旧和进项税抵扣，可用同一方法求解。
+    """
+    def npv(x):
+        setattr(finance, name, x)
+        flow = _com_flow(finance, jit, info)[index]
+        return sign * np.dot(flow, (1.0 + rate) ** -np.arange(len(flow))), np.sum(np.abs(flow))
+
+    return solve_root(npv, getattr(finance, name))
+
+
+def _cal_exact(finance, name, pro_irr, cap_irr, mode, jit=False, info=None, sign=1.0):
+    """
+    按测算模式精确求解临界值（见 _solve_exact），模式 2 取两个标准临界值中较严格者
+    （电价、发电量取较大者，sign 为 -1 的静态投资取较小者）。
+    """
+    if info is not None:
+        info['evaluations'] = 0
+    start = getattr(finance, name)
+    result = []
+    if mode != 1:
+        result.append(_solve_exact(finance, name, 2, cap_irr, jit, info, sign))
+        setattr(finance, name, start)
+    if mode != 0:
+        result.append(_solve_exact(finance, name, 0, pro_irr, jit, info, sign))
+    setattr(finance, name, max(result) if sign > 0 else min(result))
+    return getattr(finance, name)
+
+
+@profiled('cal_price')
+def cal_price(finance, pro_irr=0.06, cap_irr=0.08, mode=0, jit=False, info=None, method='step',
+              cache=None):
     """
     计算满足特定收益条件下的电价（含税）临界面。
 
@@ -40,6 +148,19 @@ def cal_price(finance, pro_irr=0.06, cap_irr=0.08, mode=0):
                 0：资本金 IRR >= cap_irr 
                 1：项目 IRR >= pro_irr 
                 2：资本金 IRR >= cap_irr and 项目 IRR >= pro_irr
+
+        jit: bool, default = False
+            是否使用编译内核（finance.kernel）计算现金流和 IRR，未安装 numba 时自动退回 numpy 实现
+
+        info: dict, default = None
+            测算过程信息，不为 None 时写入现金流计算次数 info['evaluations']
+
+        method: str, default = 'step'
+            求解方法，'step'：由当前值按固定步长逐步搜索；
+            'exact'：利用净现值对电价（发电量）的分段线性精确求解，一般 2~4 次计算即得到机器精度的临界值
+
+        cache: Cache, default = None
+            测算结果缓存（finance.cache.Cache），相同边界和测算选项的结果直接取自缓存
     
     返回结果：
     ----------
@@ -52,9 +173,22 @@ def cal_price(finance, pro_irr=0.06, cap_irr=0.08, mode=0):
         2. 第一阶段暂时不考虑输入数据格式和范围有效性检查，默认其格式和范围都是合理的。
     
     """
-    flow = finance.com_finance()  # 现金流元组（项目税前净现金流，项目税后净现金流，资本金现金流）
-    com_pro_irr = Finance.com_irr(flow[0])  # 计算所得项目税前 IRR
-    com_cap_irr = Finance.com_irr(flow[2])  # 计算所得资本金 IRR（税后）
+    _constant(finance, 'price')
+    if cache is not None:
+        if info is not None:
+            info['evaluations'] = 0
+        value = cached(cache, finance, 'cal_price',
+                       lambda: cal_price(finance, pro_irr, cap_irr, mode, jit, info, method),
+                       pro_irr=pro_irr, cap_irr=cap_irr, mode=mode, method=method)
+        finance.price = float(value[0])
+        return finance.price
+    if method == 'exact':
+        return _cal_exact(finance, 'price', pro_irr, cap_irr, mode, jit, info)
+    if info is not None:
+        info['evaluations'] = 0
+    flow = _com_flow(finance, jit, info)  # 现金流元组（项目税前净现金流，项目税后净现金流，资本金现金流）
+    com_pro_irr = _com_irr(flow[0], jit)  # 计算所得项目税前 IRR
+    com_cap_irr = _com_irr(flow[2], jit)  # 计算所得资本金 IRR（税后）
     delta_price = 0.0  # 电价递增幅度，单位为“元”，将根据具体模式和具体计算结果确定增长方向
 
     if mode == 0:  # 要求资本金 IRR 达标
@@ -68,8 +202,8 @@ def cal_price(finance, pro_irr=0.06, cap_irr=0.08, mode=0):
         while temp * (com_cap_irr - cap_irr) > 0:
             temp = com_cap_irr - cap_irr  # 保存上一个差值
             finance.price += delta_price
-            flow = finance.com_finance()
-            com_cap_irr = Finance.com_irr(flow[2])
+            flow = _com_flow(finance, jit, info)
+            com_cap_irr = _com_irr(flow[2], jit)
     elif mode == 1:  # 要求项目投资 IRR 达标
         if com_pro_irr < pro_irr:  # 低于标准 IRR
             delta_price = 0.0001 
@@ -81,8 +215,8 @@ def cal_price(finance, pro_irr=0.06, cap_irr=0.08, mode=0):
         while temp * (com_pro_irr - pro_irr) > 0:
             temp = com_pro_irr - pro_irr  # 保存上一个差值
             finance.price += delta_price
-            flow = finance.com_finance()
-            com_pro_irr = Finance.com_irr(flow[0])
+            flow = _com_flow(finance, jit, info)
+            com_pro_irr = _com_irr(flow[0], jit)
     else:  # 要求项目投资 IRR 和资本金 IRR 均达标
         if com_pro_irr < pro_irr or com_cap_irr < cap_irr:  # 低于标准 IRR
             delta_price = 0.0001 
@@ -94,40 +228,145 @@ def cal_price(finance, pro_irr=0.06, cap_irr=0.08, mode=0):
             flag = (com_cap_irr - cap_irr) * (com_pro_irr - pro_irr) > 0
             while flag:
                 finance.price += delta_price
-                flow = finance.com_finance()
-                com_pro_irr = Finance.com_irr(flow[0])
-                com_cap_irr = Finance.com_irr(flow[2])
+                flow = _com_flow(finance, jit, info)
+                com_pro_irr = _com_irr(flow[0], jit)
+                com_cap_irr = _com_irr(flow[2], jit)
                 flag = (com_cap_irr - cap_irr) * (com_pro_irr - pro_irr) > 0
         elif com_cap_irr >= cap_irr and com_pro_irr <= pro_irr:
             flag = com_pro_irr < pro_irr
             while flag:
                 finance.price += delta_price
-                flow = finance.com_finance()
-                com_pro_irr = Finance.com_irr(flow[0])
-                com_cap_irr = Finance.com_irr(flow[2])
+                flow = _com_flow(finance, jit, info)
+                com_pro_irr = _com_irr(flow[0], jit)
+                com_cap_irr = _com_irr(flow[2], jit)
                 flag = com_pro_irr < pro_irr
         elif com_cap_irr <= cap_irr and com_pro_irr >= pro_irr:
             flag = com_cap_irr < cap_irr
             while flag:
                 finance.price += delta_price
-                flow = finance.com_finance()
-                com_pro_irr = Finance.com_irr(flow[0])
-                com_cap_irr = Finance.com_irr(flow[2])
+                flow = _com_flow(finance, jit, info)
+                com_pro_irr = _com_irr(flow[0], jit)
+                com_cap_irr = _com_irr(flow[2], jit)
                 flag = com_cap_irr < cap_irr
         else:
             flag = com_cap_irr < cap_irr or com_pro_irr < pro_irr
             while flag:
                 finance.price += delta_price
-                flow = finance.com_finance()
-                com_pro_irr = Finance.com_irr(flow[0])
-                com_cap_irr = Finance.com_irr(flow[2])
+                flow = _com_flow(finance, jit, info)
+                com_pro_irr = _com_irr(flow[0], jit)
+                com_cap_irr = _com_irr(flow[2], jit)
                 flag = com_cap_irr < cap_irr or com_pro_irr < pro_irr
     # 返回结果
     return finance.price
-    
 
 
-def cal_investment(finance, pro_irr=0.06, cap_irr=0.08, mode=0):
+@profiled('cal_prices')
+def cal_prices(finance, pro_irr=0.06, cap_irr=0.08, after_irr=None, step=0.0001, jit=False, info=None,
+               cache=None):
+    """
+    一次求解同时给出各收益标准下的临界电价（含税）：资本金 IRR、项目投资 IRR（税前）、
+    项目投资 IRR（税后）以及资本金和项目投资 IRR（税前）均达标的临界电价。
+
+    输入参数：
+    ----------
+        finance: Finance
+            与财务评价相关的项目各项边界，finance.price 为搜索起点
+
+        pro_irr: float, default = 0.06
+            项目投资内部收益率（税前）标准，默认值为 6 %
+
+        cap_irr: float, default = 0.08
+            项目资本金内部收益率（税后）标准，默认值为 8 %
+
+        after_irr: float, default = None
+            项目投资内部收益率（税后）标准，为 None 时取 pro_irr
+
+        step: float, default = 0.0001
+            电价精度，单位为“元/度”，临界电价取满足标准的最低电价（向上取整到 step 的整数倍）
+
+        jit: bool, default = False
+            是否使用编译内核计算现金流和 IRR
+
+        info: dict, default = None
+            测算过程信息，不为 None 时写入现金流计算次数 info['evaluations']
+
+        cache: Cache, default = None
+            测算结果缓存，见 cal_price
+
+    返回结果：
+    ----------
+        prices: dict<str, float>
+            'cap'：资本金 IRR >= cap_irr 的临界电价（对应 cal_price 的 mode 0）
+            'pro'：项目 IRR（税前）>= pro_irr 的临界电价（对应 mode 1）
+            'after'：项目 IRR（税后）>= after_irr 的临界电价
+            'both'：两者均达标的临界电价（对应 mode 2）
+
+    备注：
+    ----------
+        1. 先以倍增步长向两侧扩展，使各标准的临界电价都落入已计算的区间，再以二分法逐步收窄；
+           每次计算的三个 IRR 同时用于收窄所有标准的区间，总计算次数一般为 20 次左右；
+        2. 假定各 IRR 随电价单调增加，IRR 无解（nan）视为未达标；
+        3. 计算结束后 finance.price 恢复为起点电价；
+        4. cal_price 向下逐步搜索时返回的是刚好不达标的电价，本函数始终返回刚好达标的电价，两者可能相差一个 step。
+    """
+    _constant(finance, 'price')
+    if after_irr is None:
+        after_irr = pro_irr
+    if cache is not None:
+        if info is not None:
+            info['evaluations'] = 0
+        names = ('cap', 'pro', 'after', 'both')
+
+        def compute():
+            prices = cal_prices(finance, pro_irr, cap_irr, after_irr, step, jit, info)
+            return [prices[name] for name in names]
+        value = cached(cache, finance, 'cal_prices', compute,
+                       pro_irr=pro_irr, cap_irr=cap_irr, after_irr=after_irr, step=step)
+        return {name: float(v) for name, v in zip(names, value)}
+    targets = {'pro': (0, pro_irr), 'after': (1, after_irr), 'cap': (2, cap_irr)}  # 标准 ->（现金流序号，IRR 标准）
+    start = finance.price
+    if info is not None:
+        info['evaluations'] = 0
+    low, high = {}, {}  # 标准 -> 已知未达标的最高电价格点 / 已达标的最低电价格点
+    evaluated = set()
+
+    def update(k):  # 计算电价格点 k（电价 = k * step）并收窄各标准的区间
+        evaluated.add(k)
+        finance.price = k * step
+        flow = _com_flow(finance, jit, info)
+        for name, (index, target) in targets.items():
+            if _com_irr(flow[index], jit) >= target:
+                high[name] = min(high.get(name, k), k)
+            else:
+                low[name] = max(low.get(name, k), k)
+
+    update(int(round(start / step)))
+    span = 64
+    while len(high) < len(targets):  # 向上扩展，直至各标准均已达标
+        update(max(evaluated) + span)
+        span *= 2
+    span = 64
+    while len(low) < len(targets):  # 向下扩展，直至各标准均有未达标的格点（电价不低于 0）
+        k = min(evaluated)
+        if k == 0:
+            for name in targets:
+                low.setdefault(name, -1)
+            break
+        update(max(k - span, 0))
+        span *= 2
+    while True:  # 二分收窄区间最宽的标准
+        name = max(targets, key=lambda item: high[item] - low[item])
+        if high[name] - low[name] <= 1:
+            break
+        update((high[name] + low[name]) // 2)
+    finance.price = start
+    prices = {name: round(high[name] * step, 10) for name in targets}
+    prices['both'] = max(prices['pro'], prices['cap'])
+    return prices
+
+
+@profiled('cal_investment')
+def cal_investment(finance, pro_irr=0.06, cap_irr=0.08, mode=0, jit=False, info=None, cache=None):
     """
     计算满足给定收益水平下的项目造价临界面。
 
@@ -137,7 +376,7 @@ def cal_investment(finance, pro_irr=0.06, cap_irr=0.08, mode=0):
             与财务评价相关的项目各项边界，具体边界条目和默认值参见 Finance 类定义
         
         pro_irr: float, default = 0.06
-            项目投资内部收益率（税后），默认值为 6 %
+            项目投资内部收益率（税前），默认值为 6 %
         
         cap_irr: float, default = 0.08
             项目资本金内部收益率（税后），默认值为 8 %
@@ -147,22 +386,44 @@ def cal_investment(finance, pro_irr=0.06, cap_irr=0.08, mode=0):
                 0：资本金 IRR >= cap_irr
                 1：项目 IRR >= pro_irr
                 2：资本金 IRR >= cap_irr and 项目 IRR >= pro_irr
+
+        jit: bool, default = False
+            是否使用编译内核（finance.kernel）计算现金流和 IRR，未安装 numba 时自动退回 numpy 实现
+
+        info: dict, default = None
+            测算过程信息，不为 None 时写入现金流计算次数 info['evaluations']
+
+        cache: Cache, default = None
+            测算结果缓存（finance.cache.Cache），相同边界和测算选项的结果直接取自缓存
     
     返回结果：
     ----------
         investment: float
-            对应项目边界和给定收益情况下的临界静态投资，单位为“元/kW”
+            对应项目边界和给定收益情况下的临界静态投资，单位为“元/kW”（静态投资 / 装机容量，
+            与扫描参数 unit_investment 一致），finance.static_investment 同时设为临界值
     
     备注：
     ----------
         1. 暂时用 mode 这种比较蹩脚的方式区分测算模式，比较好的方式是根据输入变量进行区分；
-        2. 第一阶段暂时不考虑输入数据格式和范围有效性检查，默认其格式和范围都是合理的。
+        2. 第一阶段暂时不考虑输入数据格式和范围有效性检查，默认其格式和范围都是合理的；
+        3. 按净现值对静态投资的分段线性精确求解（见 _solve_exact），不设逐步搜索的方式。
 
     """
-    pass
+    if cache is not None:
+        if info is not None:
+            info['evaluations'] = 0
+        value = cached(cache, finance, 'cal_investment',
+                       lambda: cal_investment(finance, pro_irr, cap_irr, mode, jit, info),
+                       pro_irr=pro_irr, cap_irr=cap_irr, mode=mode)
+        finance.static_investment = float(value[0]) * finance.capacity
+        return float(value[0])
+    _cal_exact(finance, 'static_investment', pro_irr, cap_irr, mode, jit, info, sign=-1.0)
+    return finance.static_investment / finance.capacity
 
 
-def cal_aep(finance,pro_irr=0.06, cap_irr=0.08, mode=0):
+@profiled('cal_aep')
+def cal_aep(finance,pro_irr=0.06, cap_irr=0.08, mode=0, jit=False, info=None, method='step',
+            cache=None):
     """
     计算满足给定收益水平下的项目年发电量临界面。
 
@@ -182,6 +443,19 @@ def cal_aep(finance,pro_irr=0.06, cap_irr=0.08, mode=0):
                 0：资本金 IRR >= cap_irr
                 1：项目 IRR >= pro_irr
                 2：资本金 IRR >= cap_irr and 项目 IRR >= pro_irr
+
+        jit: bool, default = False
+            是否使用编译内核（finance.kernel）计算现金流和 IRR，未安装 numba 时自动退回 numpy 实现
+
+        info: dict, default = None
+            测算过程信息，不为 None 时写入现金流计算次数 info['evaluations']
+
+        method: str, default = 'step'
+            求解方法，'step'：由当前值按固定步长逐步搜索；
+            'exact'：利用净现值对电价（发电量）的分段线性精确求解，一般 2~4 次计算即得到机器精度的临界值
+
+        cache: Cache, default = None
+            测算结果缓存（finance.cache.Cache），相同边界和测算选项的结果直接取自缓存
     
     返回结果：
     ----------
@@ -194,9 +468,22 @@ def cal_aep(finance,pro_irr=0.06, cap_irr=0.08, mode=0):
         2. 第一阶段暂时不考虑输入数据格式和范围有效性检查，默认其格式和范围都是合理的。
 
     """
-    flow = finance.com_finance()  # 现金流元组（项目税前净现金流，项目税后净现金流，资本金现金流）
-    com_pro_irr = Finance.com_irr(flow[0])  # 计算所得项目税前 IRR
-    com_cap_irr = Finance.com_irr(flow[2])  # 计算所得资本金 IRR（税后）
+    _constant(finance, 'aep')
+    if cache is not None:
+        if info is not None:
+            info['evaluations'] = 0
+        value = cached(cache, finance, 'cal_aep',
+                       lambda: cal_aep(finance, pro_irr, cap_irr, mode, jit, info, method),
+                       pro_irr=pro_irr, cap_irr=cap_irr, mode=mode, method=method)
+        finance.aep = float(value[0])
+        return finance.aep
+    if method == 'exact':
+        return _cal_exact(finance, 'aep', pro_irr, cap_irr, mode, jit, info)
+    if info is not None:
+        info['evaluations'] = 0
+    flow = _com_flow(finance, jit, info)  # 现金流元组（项目税前净现金流，项目税后净现金流，资本金现金流）
+    com_pro_irr = _com_irr(flow[0], jit)  # 计算所得项目税前 IRR
+    com_cap_irr = _com_irr(flow[2], jit)  # 计算所得资本金 IRR（税后）
     delta_aep = 1 # 电价递增幅度，单位为“小时”，将根据具体模式和具体计算结果确定增长方向
 
     if mode == 0:  # 要求资本金 IRR 达标
@@ -210,8 +497,8 @@ def cal_aep(finance,pro_irr=0.06, cap_irr=0.08, mode=0):
         while temp * (com_cap_irr - cap_irr) > 0:
             temp = com_cap_irr - cap_irr  # 保存上一个差值
             finance.aep += delta_aep
-            flow = finance.com_finance()
-            com_cap_irr = Finance.com_irr(flow[2])
+            flow = _com_flow(finance, jit, info)
+            com_cap_irr = _com_irr(flow[2], jit)
     elif mode == 1:  # 要求项目投资 IRR 达标
         if com_pro_irr < pro_irr:  # 低于标准 IRR
             delta_aep = 1 
@@ -223,8 +510,8 @@ def cal_aep(finance,pro_irr=0.06, cap_irr=0.08, mode=0):
         while temp * (com_pro_irr - pro_irr) > 0:
             temp = com_pro_irr - pro_irr  # 保存上一个差值
             finance.aep += delta_aep
-            flow = finance.com_finance()
-            com_pro_irr = Finance.com_irr(flow[0])
+            flow = _com_flow(finance, jit, info)
+            com_pro_irr = _com_irr(flow[0], jit)
     else:  # 要求项目投资 IRR 和资本金 IRR 均达标
         if com_pro_irr < pro_irr or com_cap_irr < cap_irr:  # 低于标准 IRR
             delta_aep = 1 
@@ -236,38 +523,39 @@ def cal_aep(finance,pro_irr=0.06, cap_irr=0.08, mode=0):
             flag = (com_cap_irr - cap_irr) * (com_pro_irr - pro_irr) > 0
             while flag:
                 finance.aep += delta_aep
-                flow = finance.com_finance()
-                com_pro_irr = Finance.com_irr(flow[0])
-                com_cap_irr = Finance.com_irr(flow[2])
+                flow = _com_flow(finance, jit, info)
+                com_pro_irr = _com_irr(flow[0], jit)
+                com_cap_irr = _com_irr(flow[2], jit)
                 flag = (com_cap_irr - cap_irr) * (com_pro_irr - pro_irr) > 0
         elif com_cap_irr >= cap_irr and com_pro_irr <= pro_irr:
             flag = com_pro_irr < pro_irr
             while flag:
                 finance.aep += delta_aep
-                flow = finance.com_finance()
-                com_pro_irr = Finance.com_irr(flow[0])
-                com_cap_irr = Finance.com_irr(flow[2])
+                flow = _com_flow(finance, jit, info)
+                com_pro_irr = _com_irr(flow[0], jit)
+                com_cap_irr = _com_irr(flow[2], jit)
                 flag = com_pro_irr < pro_irr
         elif com_cap_irr <= cap_irr and com_pro_irr >= pro_irr:
             flag = com_cap_irr < cap_irr
             while flag:
                 finance.aep += delta_aep
-                flow = finance.com_finance()
-                com_pro_irr = Finance.com_irr(flow[0])
-                com_cap_irr = Finance.com_irr(flow[2])
+                flow = _com_flow(finance, jit, info)
+                com_pro_irr = _com_irr(flow[0], jit)
+                com_cap_irr = _com_irr(flow[2], jit)
                 flag = com_cap_irr < cap_irr
         else:
             flag = com_cap_irr < cap_irr or com_pro_irr < pro_irr
             while flag:
                 finance.aep += delta_aep
-                flow = finance.com_finance()
-                com_pro_irr = Finance.com_irr(flow[0])
-                com_cap_irr = Finance.com_irr(flow[2])
+                flow = _com_flow(finance, jit, info)
+                com_pro_irr = _com_irr(flow[0], jit)
+                com_cap_irr = _com_irr(flow[2], jit)
                 flag = com_cap_irr < cap_irr or com_pro_irr < pro_irr
     # 返回结果
     return finance.aep
 
 
+@profiled('cal_capacity')
 def cal_capacity(parameter_list):
     """
     计算满足给定收益水平下的项目装机规模临界面。
@@ -0,0 +1,230 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   cli.py
+@Time    :   2026/10/19 11:40:05
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 命令行入口：按声明式测算方案（JSON/YAML）执行参数扫描并输出结果
+#
+# 测算方案示例（JSON）：
+# {
+#     "base": {"capacity": 100.0, "loan_rate": 0.035, "vat_refund_rate": 0.5},
+#     "axes": {"aep": {"linspace": [1500, 4000, 251]},
+#              "unit_investment": {"linspace": [4000, 8500, 91]}},
+#     "target": "price",
+#     "pro_irr": 0.07, "cap_irr": 0.01, "mode": 2,
+#     "output": {"file": "风电上网电价-项目-7%-3.5%.xlsx"}
+# }
+
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+
+from finance import memory, profiler
+from finance.base import Finance
+from finance.progress import Progress
+from finance.store import write_blocks
+from finance.sweep import sweep, stream, DEGRADATION, UNIT_AXES
+
+FORMATS = ('xlsx', 'csv', 'npz')  # 支持的输出格式
+CACHE = '~/.cache/finance/cache.sqlite'  # 缺省的缓存文件
+
+
+def load_spec(file):
+    """
+    读取测算方案文件（.json，或安装了 PyYAML 时的 .yaml/.yml）。
+    """
+    with open(file, encoding='utf-8') as f:
+        if os.path.splitext(file)[1].lower() in ('.yaml', '.yml'):
+            import yaml
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def build_finance(base):
+    """
+    由测算方案的 base 段生成基准项目边界，派生参数（如 unit_investment）在装机容量确定后换算。
+    """
+    finance = Finance()
+    for name, value in base.items():
+        if name in UNIT_AXES:
+            continue
+        if not hasattr(finance, name):
+            raise ValueError('未知的项目边界参数：%s' % name)
+        setattr(finance, name, value)
+    for name, value in base.items():
+        if name in UNIT_AXES:
+            setattr(finance, UNIT_AXES[name], value * finance.capacity)
+    return finance
+
+
+def build_axis(values):
+    """
+    解析扫描轴取值：列表，或 {"linspace": [起点, 终点, 个数]}、{"arange": [起点, 终点, 步长]}。
+    """
+    if isinstance(values, dict):
+        if 'linspace' in values:
+            start, stop, num = values['linspace']
+            return np.linspace(start, stop, int(num))
+        if 'arange' in values:
+            return np.arange(*values['arange'])
+        raise ValueError('无法解析的扫描轴：%s' % values)
+    return np.atleast_1d(np.asarray(values, dtype=np.float64))
+
+
+def run(spec, workers=None, progress=None, cache=None):
+    """
+    执行测算方案并按其 output 段输出结果。
+
+    输入参数：
+    ----------
+        spec: dict
+            测算方案，包括 base（基准边界）、axes（扫描轴）、target（'irr'/'price'/'prices'/'aep'/'investment'）、
+            pro_irr、cap_irr、after_irr、mode（临界值测算的收益率标准和模式）、method（求解方法）、engine（计算引擎）、workers、jit、
+            memory（内存预算，如 "2GB"）和 output 等项
+
+        workers: integer, default = None
+            并行进程数，为 None 时取方案中的 workers，方案中也未给出时取 CPU 核数
+
+        progress: callable, default = None
+            运行监测回调，见 sweep
+
+        cache: Cache, default = None
+            测算结果缓存，见 sweep
+
+    返回结果：
+    ----------
+        result: SweepResult
+            扫描结果
+    """
+    finance, axes, options = build_sweep(spec)
+    if workers is None:
+        workers = spec.get('workers', os.cpu_count() or 1)
+    result = sweep(finance, axes, workers=workers, progress=progress, cache=cache, **options)
+    write_result(result, spec.get('output', {}))
+    return result
+
+
+def run_stream(spec, workers=None, progress=None, cache=None):
+    """
+    以流式扫描执行测算方案，结果逐块写入 output 段的文件，不在内存中保留结果网格，返回计算的单元数。
+    参数含义同 run。
+    """
+    finance, axes, options = build_sweep(spec)
+    if workers is None:
+        workers = spec.get('workers', os.cpu_count() or 1)
+    output = spec.get('output', {})
+    if not output.get('file'):
+        raise ValueError('流式扫描须给出输出文件（output.file 或 -o）')
+    compact = options.pop('compact')
+    blocks = stream(finance, axes, workers=workers, progress=progress, cache=cache, **options)
+    fmt = output.get('format') or os.path.splitext(output['file'])[1].lstrip('.').lower()
+    return write_blocks(blocks, output['file'], fmt, **({'compact': compact} if fmt == 'npz' else {}))
+
+
+def build_sweep(spec):
+    """
+    由测算方案生成基准项目边界、扫描轴和 sweep 的测算选项（不含 workers 等运行选项）。
+    """
+    finance = build_finance(spec.get('base', {}))
+    axes = spec.get('axes', {})
+    if isinstance(axes, dict):
+        axes = list(axes.items())
+    axes = [(name, list(values) if name == DEGRADATION else build_axis(values)) for name, values in axes]
+    output = spec.get('output', {})
+    options = {'target': spec.get('target', 'irr'), 'pro_irr': spec.get('pro_irr', 0.06),
+               'cap_irr': spec.get('cap_irr', 0.08), 'mode': spec.get('mode', 0), 'after_irr': spec.get('after_irr'),
+               'method': spec.get('method', 'step'), 'engine': spec.get('engine'), 'jit': spec.get('jit', True),
+               'flows': output.get('flows', False), 'compact': output.get('compact', False),
+               'memory': spec.get('memory')}
+    return finance, axes, options
+
+
+def write_result(result, output):
+    """
+    按测算方案的 output 段（file、format）输出扫描结果，未给出 file 时不输出。
+    """
+    file = output.get('file')
+    if file:
+        fmt = output.get('format') or os.path.splitext(file)[1].lstrip('.').lower()
+        if fmt not in FORMATS:
+            raise ValueError('不支持的输出格式：%s' % fmt)
+        if fmt == 'xlsx':
+            result.to_excel(file)
+        elif fmt == 'csv':
+            result.to_csv(file)
+        else:
+            result.save(file)
+
+
+def main(argv=None):
+    """
+    命令行入口：finance SPEC [-o OUTPUT] [-w WORKERS] [--compact] [--stream] [--memory BUDGET] [--profile [FILE]]
+                        [--progress [LOG]] [--cache [FILE]]
+    """
+    parser = argparse.ArgumentParser(prog='finance', description='按测算方案（JSON/YAML）执行新能源项目财务参数扫描')
+    parser.add_argument('spec', help='测算方案文件（.json/.yaml）')
+    parser.add_argument('-o', '--output', help='输出文件（.xlsx/.csv/.npz），覆盖方案中的 output.file')
+    parser.add_argument('-w', '--workers', type=int, help='并行进程数，覆盖方案中的 workers')
+    parser.add_argument('--compact', action='store_true', help='紧凑存储模式（float32/定点整数）')
+    parser.add_argument('--stream', action='store_true', help='流式扫描：结果逐块写入输出文件，内存占用与网格大小无关')
+    parser.add_argument('--memory', metavar='BUDGET',
+                        help='内存预算（如 512MB、2GB），按预算自动确定批次大小，覆盖方案中的 memory')
+    parser.add_argument('--profile', metavar='FILE', nargs='?', const='',
+                        help='输出分阶段计时报表（可导出为 .json/.csv）；计时仅在主进程内进行，启用时串行计算')
+    parser.add_argument('--progress', metavar='LOG', nargs='?', const='',
+                        help='显示进度、吞吐率和剩余时间，并可将进度事件写入 JSON 行日志')
+    parser.add_argument('--cache', metavar='FILE', nargs='?', const=CACHE,
+                        help='使用测算结果缓存（缺省为 %s），仅计算缓存中没有的单元' % CACHE)
+    args = parser.parse_args(argv)
+
+    spec = load_spec(args.spec)
+    output = spec.setdefault('output', {})
+    if args.output:
+        output['file'] = args.output
+        output.pop('format', None)
+    if args.compact:
+        output['compact'] = True
+    if args.memory:
+        spec['memory'] = args.memory
+    workers = args.workers
+    if args.profile is not None:
+        profiler.reset()
+        profiler.enable()
+        workers = 1
+    start = time.perf_counter()
+    progress = None
+    if args.progress is not None:
+        progress = Progress(log=args.progress or None)
+    cache = None
+    if args.cache:
+        from finance.cache import Cache
+        cache = Cache(args.cache)
+    if args.stream:
+        size = run_stream(spec, workers=workers, progress=progress, cache=cache)
+        usage = {'chunk': None, 'peak': memory.peak(), 'worker_peak': None}  # 结果块的 attrs 不回传，只报告主进程
+    else:
+        result = run(spec, workers=workers, progress=progress, cache=cache)
+        size, usage = result.size, result.attrs['memory']
+    print('%d 个单元，用时 %.2f 秒，结果：%s' % (size, time.perf_counter() - start, output.get('file', '（未输出）')))
+    if spec.get('memory'):
+        print('内存预算 %s，批次 %s 个单元，峰值常驻内存 %s（工作进程 %s）' % (
+            memory.size(memory.parse(spec['memory'])), usage['chunk'] or '-', memory.size(usage['peak']),
+            memory.size(usage['worker_peak'])))
+    if args.profile is not None:
+        print(profiler.report())
+        if args.profile:
+            profiler.export(args.profile)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   degradation.py
+@Time    :   2026/10/19 17:58:12
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 出力衰减曲线：逐经营年的出力系数（相对首年上网电量 capacity * aep / 0.93112）
+#
+# 衰减曲线可以是：
+#     None 或 'legacy'：测算模型原有的曲线，第 2 年 0.98，其后按 0.98 × (0.9755 - 0.0045 × (t - 2)) 衰减；
+#     'linear'：逐年线性衰减，1 - annual × t；
+#     'first_year'：首年后一次性衰减 first，其后逐年线性衰减 annual（光伏组件常用的质保曲线）；
+#     'geometric'：逐年按比例衰减，(1 - annual) ** t；
+#     {'model': 名称, 参数: 取值}：带参数的上述模型，如 {'model': 'first_year', 'first': 0.01, 'annual': 0.004}；
+#     逐年系数序列：直接给出各经营年的系数。
+
+import numpy as np
+
+
+def legacy(years):
+    """
+    测算模型原有的衰减曲线。
+    """
+    t = np.arange(years)
+    return np.where(t == 0, 1.0, np.where(t == 1, 0.98, 0.98 * (0.9755 - (t - 2) * 0.0045)))
+
+
+def linear(years, annual=0.005):
+    """
+    逐年线性衰减：第 t 年（首年 t = 0）系数为 1 - annual × t。
+    """
+    return 1.0 - annual * np.arange(years)
+
+
+def first_year(years, first=0.02, annual=0.0045):
+    """
+    首年后一次性衰减 first，其后逐年线性衰减 annual：系数依次为 1、1 - first、1 - first - annual、……
+    """
+    t = np.arange(years)
+    return np.where(t == 0, 1.0, 1.0 - first - annual * (t - 1))
+
+
+def geometric(years, annual=0.005):
+    """
+    逐年按比例衰减：第 t 年系数为 (1 - annual) ** t。
+    """
+    return (1.0 - annual) ** np.arange(years)
+
+
+MODELS = {'legacy': legacy, 'linear': linear, 'first_year': first_year, 'geometric': geometric}
+
+
+def curve(spec, years):
+    """
+    将衰减曲线的描述转换为逐年系数。
+
+    输入参数：
+    ----------
+        spec: None, str, dict or sequence
+            衰减曲线，见模块说明
+
+        years: integer
+            经营年数
+
+    返回结果：
+    ----------
+        factors: np.array<float>
+            长度为 years 的逐年出力系数
+    """
+    if spec is None:
+        return legacy(years)
+    if isinstance(spec, str):
+        spec = {'model': spec}
+    if isinstance(spec, dict):
+        options = dict(spec)
+        name = options.pop('model', 'legacy')
+        if name not in MODELS:
+            raise ValueError('未知的衰减模型：%s' % name)
+        return MODELS[name](years, **options)
+    factors = np.asarray(spec, dtype=np.float64)
+    if factors.ndim != 1 or len(factors) < years:
+        raise ValueError('衰减系数序列的长度（%d）少于经营期（%d）' % (factors.size, years))
+    return factors[:years]
+
+
+def matrix(specs, years):
+    """
+    多条衰减曲线的逐年系数矩阵，形状为（曲线数, years）。
+    """
+    return np.array([curve(spec, years) for spec in specs]).reshape(len(specs), years)
+
+
+def label(spec):
+    """
+    衰减曲线的简短文字描述（用于结果说明）。
+    """
+    if spec is None or isinstance(spec, str):
+        return spec or 'legacy'
+    if isinstance(spec, dict):
+        options = dict(spec)
+        name = options.pop('model', 'legacy')
+        return name + ''.join('-%s=%g' % item for item in sorted(options.items()))
+    return 'custom'
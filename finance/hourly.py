@@ -0,0 +1,197 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   hourly.py
+@Time    :   2026/10/19 17:25:40
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 逐小时出力与分时电价：按经营年分块汇总为逐年上网电量和售电收入，再计算现金流和 IRR
+#
+# 出力和电价曲线可以是内存映射文件（.npy 或原始二进制），汇总时每次只读入一年（一批项目）的数据，
+# 不必将整条曲线载入内存。
+#
+# 用法：
+#     generation = open_profile('wind_8760x25.npy')          # 逐小时上网电量（kWh），可为 项目数 × 小时数
+#     price = tou_price([0.25] * 8 + [0.45] * 4 + [0.35] * 12)  # 24 时段分时电价（元/kWh）
+#     result = evaluate(finance, generation, price)
+#     result['cap_irr']
+
+import os
+import numpy as np
+
+from finance import batch, degradation, kernel
+from finance.profiler import profiled
+
+HOURS = 8760  # 每年小时数
+MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def open_profile(file, dtype=np.float64, shape=None):
+    """
+    以只读内存映射方式打开逐小时曲线：.npy 文件按其自身的类型和形状，其它文件按原始二进制读取。
+
+    输入参数：
+    ----------
+        file: str
+            曲线文件路径
+
+        dtype: np.dtype, default = np.float64
+            原始二进制文件的数据类型
+
+        shape: tuple<int>, default = None
+            原始二进制文件的形状，如（项目数, 小时数），为 None 时视为一维
+    """
+    if os.path.splitext(file)[1].lower() == '.npy':
+        return np.load(file, mmap_mode='r')
+    return np.memmap(file, dtype=dtype, mode='r', shape=shape)
+
+
+def tou_price(table, hours=HOURS):
+    """
+    由分时电价表生成典型年的逐小时电价。
+
+    输入参数：
+    ----------
+        table: sequence
+            24 个时段的电价，或 12 × 24 的逐月分时电价（元/kWh）
+
+        hours: integer, default = 8760
+            每年小时数
+
+    返回结果：
+    ----------
+        price: np.array<float>
+            长度为 hours 的逐小时电价
+    """
+    table = np.asarray(table, dtype=np.float64)
+    hour = np.arange(hours) % 24
+    if table.ndim == 1:
+        return table[hour]
+    month = np.repeat(np.arange(12), np.array(MONTH_DAYS) * 24)
+    month = np.concatenate([month, np.full(max(hours - len(month), 0), 11)])[:hours]
+    return table[month, hour]
+
+
+@profiled('hourly.aggregate')
+def aggregate(generation, price, years=None, hours=HOURS, unit=1e-4, rows=1024, curve=None):
+    """
+    按经营年分块汇总逐小时出力和电价，得到逐年上网电量和售电收入（含税）。
+
+    输入参数：
+    ----------
+        generation: np.array<float>
+            逐小时上网电量（kWh），形状为（小时数,）或（项目数, 小时数），可为内存映射数组；
+            只有一年（hours 个小时）时视为典型年，各年按衰减曲线 curve 外推
+
+        price: float or np.array<float>
+            电价（元/kWh）：常数；典型年逐小时电价（长度为 hours，各年相同）；与出力等长的逐小时电价；
+            或各项目的逐小时电价（项目数, 小时数）
+
+        years: integer, default = None
+            汇总年数（一般为经营期），为 None 时取出力曲线所含的年数
+
+        hours: integer, default = 8760
+            每年小时数
+
+        unit: float, default = 1e-4
+            电量和收入的换算系数，默认将 kWh、元换算为测算模型的“万千瓦时”、“万元”
+
+        rows: integer, default = 1024
+            每次读入的项目数
+
+        curve: None, str, dict or sequence, default = None
+            典型年外推所用的衰减曲线，见 finance.degradation
+
+    返回结果：
+    ----------
+        power: np.array<float>
+            逐年上网电量（万千瓦时），形状为（项目数, 年数），一维输入时为（年数,）
+
+        sales: np.array<float>
+            逐年售电收入（含税，万元），形状同 power
+    """
+    single = np.ndim(generation) == 1
+    generation = generation.reshape(1, -1) if single else generation
+    price = price if np.ndim(price) == 0 else (price.reshape(1, -1) if np.ndim(price) == 1 else price)
+    total = generation.shape[1] // hours
+    if total == 0:
+        raise ValueError('出力曲线不足一年（%d 小时）' % hours)
+    typical = total == 1
+    if years is None:
+        years = total
+    if not typical and total < years:
+        raise ValueError('出力曲线只有 %d 年，少于汇总年数 %d' % (total, years))
+    count = 1 if typical else years
+    n = generation.shape[0]
+    power = np.empty((n, count))
+    sales = np.empty((n, count))
+    for y in range(count):
+        span = slice(y * hours, (y + 1) * hours)
+        for start in range(0, n, rows):
+            stop = min(start + rows, n)
+            g = np.asarray(generation[start:stop, span], dtype=np.float64)
+            power[start:stop, y] = g.sum(axis=1) * unit
+            if np.ndim(price) == 0:
+                sales[start:stop, y] = power[start:stop, y] * price
+                continue
+            p = price[0 if price.shape[0] == 1 else slice(start, stop)]
+            p = np.asarray(p[..., :hours] if p.shape[-1] == hours else p[..., span], dtype=np.float64)
+            sales[start:stop, y] = (g * p).sum(axis=1) * unit
+    if typical:
+        factor = degradation.curve(curve, years)
+        power, sales = power * factor, sales * factor
+    if single:
+        return power[0], sales[0]
+    return power, sales
+
+
+def evaluate(finance, generation, price, hours=HOURS, unit=1e-4, flows=False):
+    """
+    由逐小时出力和电价计算项目（组合）的三个 IRR。
+
+    输入参数：
+    ----------
+        finance: Finance or list<Finance>
+            项目边界（各项目共用），或与出力曲线各行一一对应的项目边界列表；aep 和 price 不再使用，
+            典型年出力按 finance.degradation（各项目须相同）外推
+
+        generation, price, hours, unit:
+            逐小时上网电量和电价，见 aggregate
+
+        flows: bool, default = False
+            是否同时返回逐年净现金流
+
+    返回结果：
+    ----------
+        result: dict<str, np.array<float>>
+            'pre_pro_irr'、'after_pro_irr'、'cap_irr' 及逐年的 'power'、'sales'，flows 为 True 时另含 'flows'；
+            出力为一维时各项为标量（逐年序列为一维）
+    """
+    projects = finance if isinstance(finance, (list, tuple)) else [finance]
+    params = np.array([kernel.pack(item) for item in projects])
+    operate = params[:, kernel.INDEX['operate_period']]
+    if np.any(operate != operate[0]):
+        raise ValueError('项目组合内各项目的经营期须一致')
+    single = np.ndim(generation) == 1
+    power, sales = aggregate(generation, price, years=int(operate[0]), hours=hours, unit=unit,
+                             curve=projects[0].degradation)
+    power, sales = np.atleast_2d(power), np.atleast_2d(sales)
+    if len(params) == 1:
+        params = np.repeat(params, power.shape[0], axis=0)
+    cells = np.ceil(params[:, kernel.INDEX['build_period']]) + operate
+    flow = np.zeros((len(params), 3, int(cells.max())))
+    for length in np.unique(cells):  # 不同建设期的项目分组计算
+        rows = np.flatnonzero(cells == length)
+        flow[rows, :, :int(length)] = batch.com_flows(params[rows], power[rows], sales[rows])
+    irr = kernel.com_irr(flow)
+    result = {'pre_pro_irr': irr[:, 0], 'after_pro_irr': irr[:, 1], 'cap_irr': irr[:, 2],
+              'power': power, 'sales': sales}
+    if flows:
+        result['flows'] = flow
+    if single:
+        result = {name: value[0] for name, value in result.items()}
+    return result
@@ -0,0 +1,372 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   kernel.py
+@Time    :   2026/10/19 09:12:30
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 财务现金流计算的编译内核（可选 Numba 加速，不可用时自动退回 numpy 实现）
+
+import importlib.util
+import math
+import threading
+import numpy as np
+
+from finance.base import Finance
+from finance.profiler import profiled
+
+# numba 仅在首次计算时导入并编译（未安装时退回 finance.batch 的 numpy 实现）
+HAVE_NUMBA = importlib.util.find_spec('numba') is not None
+_COMPILED = {}  # 内核函数名 -> 编译结果
+_LOCK = threading.Lock()  # 多个线程同时首次调用时只编译一次
+
+# 内核参数向量的字段顺序（与 Finance 的标量成员变量一一对应）
+FIELDS = ('capacity', 'aep', 'static_investment', 'price', 'capital_ratio', 'working_ratio',
+          'equipment_cost', 'equipment_ratio', 'install_cost', 'install_ratio', 'build_cost',
+          'build_ratio', 'other_cost', 'other_ratio', 'loan_rate', 'working_rate', 'rate_discount',
+          'income_tax_rate', 'build_tax_rate', 'vat_rate', 'vat_refund_rate', 'edu_surcharge_rate',
+          'workers', 'labor_cost', 'in_repair_rate', 'out_repair_rate', 'warranty',
+          'depreciation_period', 'insurance_rate', 'material_quota', 'other_quota', 'working_quota',
+          'provident_rate', 'operate_period', 'build_period', 'loan_period', 'grace_period',
+          'residual_rate')
+INDEX = {name: k for k, name in enumerate(FIELDS)}  # 字段名 -> 列号
+
+
+def pack(finance):
+    """
+    将 Finance 实例的标量边界打包为内核参数向量。
+
+    输入参数：
+    ----------
+        finance: Finance
+            项目边界实例
+
+    返回结果：
+    ----------
+        params: np.array<float>
+            一维参数向量，字段顺序见 FIELDS
+    """
+    return np.array([float(getattr(finance, name)) for name in FIELDS])
+
+
+def unpack(params):
+    """
+    由内核参数向量还原 Finance 实例（pack 的逆过程）。
+    """
+    finance = Finance()
+    for name, value in zip(FIELDS, params):
+        setattr(finance, name, value)
+    for name in ('warranty', 'depreciation_period', 'operate_period', 'loan_period'):
+        setattr(finance, name, int(getattr(finance, name)))
+    return finance
+
+
+def flow_cells(params):
+    """
+    参数矩阵对应的现金流序列长度（建设期整年数 + 经营期），要求各情景一致。
+    """
+    params = np.atleast_2d(params)
+    cells = np.ceil(params[:, INDEX['build_period']]) + params[:, INDEX['operate_period']]
+    if cells.size and np.any(cells != cells[0]):
+        raise ValueError('批量计算要求各情景的建设期和经营期一致')
+    return int(cells[0]) if cells.size else 0
+
+
+def _flows_loop(params, out):
+    """
+    逐情景、逐年份计算三条净现金流（税前项目、税后项目、资本金），结果写入 out。
+
+    计算逻辑与 Finance.com_finance 逐项对应（包括运算顺序），只是略去了不影响现金流的总计列。
+    """
+    for s in range(params.shape[0]):
+        p = params[s]
+        capacity = p[0]; aep = p[1]; static_investment = p[2]; price = p[3]
+        capital_ratio = p[4]; working_ratio = p[5]
+        equipment_cost = p[6]; equipment_ratio = p[7]; install_cost = p[8]; install_ratio = p[9]
+        build_cost = p[10]; build_ratio = p[11]; other_cost = p[12]; other_ratio = p[13]
+        loan_rate = p[14]; working_rate = p[15]; rate_discount = p[16]
+        income_tax_rate = p[17]; build_tax_rate = p[18]; vat_rate = p[19]
+        vat_refund_rate = p[20]; edu_surcharge_rate = p[21]
+        workers = p[22]; labor_cost = p[23]; in_repair_rate = p[24]; out_repair_rate = p[25]
+        warranty = int(p[26]); depreciation_period = int(p[27]); insurance_rate = p[28]
+        material_quota = p[29]; other_quota = p[30]; working_quota = p[31]
+        operate_period = int(p[33]); build_period = p[34]; loan_period = int(p[35])
+        residual_rate = p[37]
+
+        build_cells = int(math.ceil(build_period))
+        row_cells = operate_period + build_cells + 1
+        first = build_cells + 1  # 运营期首年下标
+
+        ## 投资计划与资金筹措
+        build_investment = np.zeros(row_cells)
+        working_capital = np.zeros(row_cells)
+        total_investment = np.zeros(row_cells)
+        capital = np.zeros(row_cells)
+        build_investment[1] = static_investment
+        build_interest = build_investment[1] * loan_rate * rate_discount / 2
+        working_capital[first] = capacity * working_quota
+        for k in range(1, row_cells):
+            total_investment[k] = build_investment[k] + working_capital[k]
+        total_investment[1] = build_investment[1] + build_interest + working_capital[1]
+        capital[1] = total_investment[1] * capital_ratio
+        capital[first] = total_investment[first] * working_ratio
+        long_loan = total_investment[1] - capital[1]
+        working_loan = total_investment[first] - capital[first]
+
+        ## 临时辅助性变量
+        if equipment_ratio != 0.0:
+            equipment_cost = static_investment * equipment_ratio
+        if install_ratio != 0.0:
+            install_cost = static_investment * install_ratio
+        if build_ratio != 0.0:
+            build_cost = static_investment * build_ratio
+        if other_ratio != 0.0:
+            other_cost = static_investment * other_ratio
+        vat_deduction = equipment_cost / (1 + vat_rate) * vat_rate + (
+            build_cost + install_cost) / (1 + 0.09) * 0.09 + other_cost / (1 + 0.06) * 0.06
+        fix_assets = total_investment[1] - vat_deduction
+
+        ## 借款还本付息与增值税抵扣（逐年）
+        long_principal = long_loan / loan_period
+        power_first = capacity * aep / 0.93112
+        power_second = power_first * 0.98
+        intax_balance = np.zeros(row_cells)
+        vat = np.zeros(row_cells)
+        income = np.zeros(row_cells)
+        for k in range(first, row_cells):
+            t = k - first
+            if t == 0:
+                power = power_first
+            elif t == 1:
+                power = power_second
+            else:
+                power = power_second * (0.9755 - (t - 2) * 0.0045)
+            income[k] = power * price / (1 + vat_rate)
+            vat[k] = income[k] * vat_rate / (1 + vat_rate)
+            if t == 0:
+                intax_balance[k] = vat_deduction
+            else:
+                intax_balance[k] = intax_balance[k - 1] - vat[k - 1]
+
+        for k in range(1, row_cells):
+            t = k - first
+            operate_cost = 0.0
+            operate_tax = 0.0
+            interest = 0.0
+            principal = 0.0
+            vat_return = 0.0
+            vat_turn = 0.0
+            income_tax = 0.0
+            total_cost = 0.0
+            recover_asset = 0.0
+            recover_pro_working = 0.0
+            recover_cap_working = 0.0
+            if t >= 0:
+                # 总成本费用
+                material = capacity * material_quota
+                wage = workers * labor_cost
+                if t < warranty:
+                    maintenance = fix_assets * in_repair_rate
+                else:
+                    maintenance = fix_assets * out_repair_rate
+                insurance = fix_assets * insurance_rate
+                other_expense = capacity * other_quota
+                depreciation = 0.0
+                if t < depreciation_period:
+                    depreciation = fix_assets * (1 - residual_rate) / depreciation_period
+                operate_cost = maintenance + wage + insurance + material + other_expense + 0.0
+                # 借款还本付息
+                long_interest = 0.0
+                if t < loan_period:
+                    principal = long_principal
+                    long_opening = long_loan - t * long_principal
+                    long_interest = long_opening * loan_rate * rate_discount
+                interest = long_interest + working_loan * working_rate
+                total_cost = depreciation + operate_cost + 0.0 + interest
+                # 税金及附加
+                balance = intax_balance[k]
+                if balance <= 0:
+                    build_tax = vat[k] * build_tax_rate
+                    edu_surcharge = vat[k] * edu_surcharge_rate
+                elif balance > 0 and balance - vat[k] <= 0:
+                    build_tax = (vat[k] - balance) * build_tax_rate
+                    edu_surcharge = (vat[k] - balance) * edu_surcharge_rate
+                else:
+                    build_tax = 0.0
+                    edu_surcharge = 0.0
+                operate_tax = build_tax + edu_surcharge
+                vat_return = build_tax * vat_refund_rate / build_tax_rate
+                if k < operate_period:  # 与 Finance.com_finance 中销项税序列的计算范围保持一致
+                    if balance < 0:
+                        vat_turn = 0.0
+                    elif balance >= vat[k]:
+                        vat_turn = vat[k]
+                    else:
+                        vat_turn = balance
+                # 所得税
+                tax_income = income[k] - operate_tax - total_cost + vat_return - 0.0
+                if t < 3 or tax_income <= 0:
+                    income_tax = 0.0
+                elif t < 6:
+                    income_tax = tax_income * income_tax_rate / 2
+                else:
+                    income_tax = tax_income * income_tax_rate
+                if k == row_cells - 1:
+                    recover_asset = fix_assets * residual_rate
+                    recover_pro_working = working_capital[first]
+                    recover_cap_working = working_capital[first] * working_ratio
+            subside = vat_return + vat_turn
+            pro_inflow = income[k] + subside + recover_asset + recover_pro_working
+            pro_outflow = build_investment[k] + working_capital[k] + operate_cost + operate_tax
+            pre_pro_netflow = pro_inflow - pro_outflow + 0.0
+            out[s, 0, k - 1] = pre_pro_netflow
+            out[s, 1, k - 1] = pre_pro_netflow - income_tax
+            cap_inflow = income[k] + subside + recover_asset + recover_cap_working
+            cap_outflow = capital[k] + principal + interest + operate_cost + operate_tax + income_tax
+            out[s, 2, k - 1] = cap_inflow - cap_outflow + 0.0
+    return out
+
+
+def _irr_loop(flows, out):
+    """
+    牛顿法逐条计算内部收益率，未收敛者记为 nan（由调用方退回 npf.irr）。
+    """
+    n = flows.shape[0]
+    cells = flows.shape[1]
+    for s in range(n):
+        rate = 0.1
+        out[s] = np.nan
+        for _ in range(50):
+            npv = 0.0
+            d_npv = 0.0
+            factor = 1.0
+            for k in range(cells):
+                npv += flows[s, k] * factor
+                d_npv -= k * flows[s, k] * factor / (1 + rate)
+                factor /= 1 + rate
+            if d_npv == 0.0:
+                break
+            step = npv / d_npv
+            rate -= step
+            if rate <= -1.0:
+                break
+            if abs(step) < 1e-14:
+                out[s] = rate
+                break
+    return out
+
+
+def _compiled(function):
+    """
+    返回编译后的内核函数（首次调用时导入 numba 并编译），numba 不可用时返回 None。
+    """
+    global HAVE_NUMBA
+    compiled = _COMPILED.get(function.__name__)  # 已编译时不加锁，多线程计算不在此串行
+    if compiled is not None or not HAVE_NUMBA:
+        return compiled
+    with _LOCK:
+        if function.__name__ not in _COMPILED:
+            try:
+                from numba import njit
+            except ImportError:
+                HAVE_NUMBA = False
+                return None
+            _COMPILED[function.__name__] = njit(cache=True, nogil=True)(function)  # 计算时释放 GIL，可多线程并行
+    return _COMPILED[function.__name__]
+
+
+@profiled('kernel.com_flows')
+def com_flows(params):
+    """
+    批量计算多个情景的三条净现金流。
+
+    输入参数：
+    ----------
+        params: np.array<float>
+            参数矩阵，形状为（情景数, len(FIELDS)），可由 pack 打包得到；一维时视为单个情景
+
+    返回结果：
+    ----------
+        flows: np.array<float>
+            形状为（情景数, 3, 年份数）的现金流数组，第二维依次为税前项目、税后项目和资本金净现金流
+
+    备注：
+    ----------
+        1. 安装 numba 时使用编译内核，否则使用 numpy 分块批量计算（finance.batch，结果逐位相同）；
+        2. 同一批次内各情景的建设期和经营期须一致。
+    """
+    params = np.atleast_2d(np.asarray(params, dtype=np.float64))
+    out = np.empty((params.shape[0], 3, flow_cells(params)))
+    loop = _compiled(_flows_loop)
+    if loop is not None:
+        return loop(np.ascontiguousarray(params), out)
+    from finance import batch
+    return batch.com_flows(params)
+
+
+@profiled('kernel.com_irr')
+def com_irr(flows):
+    """
+    按最后一维批量计算内部收益率。
+
+    输入参数：
+    ----------
+        flows: np.array<float>
+            现金流数组，最后一维为年份
+
+    返回结果：
+    ----------
+        irr: np.array<float>
+            去掉最后一维后的内部收益率数组
+
+    备注：
+    ----------
+        1. 编译内核用牛顿法求解，与 npf.irr 的结果在 1e-12 量级内一致；
+        2. 牛顿法不收敛或现金流多次变号（可能存在多个根）时退回 Finance.com_irr。
+    """
+    flows = np.asarray(flows, dtype=np.float64)
+    rows = flows.reshape(-1, flows.shape[-1])
+    irr = np.full(rows.shape[0], np.nan)
+    loop = _compiled(_irr_loop)
+    if loop is not None:
+        loop(np.ascontiguousarray(rows), irr)
+    signs = np.sign(rows)
+    changes = np.sum(signs[:, 1:] * signs[:, :-1] < 0, axis=1)
+    for s in np.flatnonzero(np.isnan(irr) | (changes != 1)):
+        irr[s] = Finance.com_irr(rows[s])
+    return irr.reshape(flows.shape[:-1])
+
+
+def com_finance(finance):
+    """
+    以编译内核计算单个 Finance 实例的三条净现金流，返回值与 Finance.com_finance() 相同。
+
+    备注：
+    ----------
+        1. 与 Finance.com_finance 不同，本函数不回写实例的 equipment_cost 等成员变量；
+        2. 给定衰减曲线（finance.degradation）时改用 finance.batch 按逐年上网电量计算，
+           给定逐年电价、发电小时数（finance.price_path、aep_path）时改用 finance.paths 计算。
+    """
+    params = pack(finance)
+    if getattr(finance, 'price_path', None) is not None or getattr(finance, 'aep_path', None) is not None:
+        from finance import paths
+        flows = paths.com_flows(finance)[0]
+    elif getattr(finance, 'degradation', None) is None:
+        flows = com_flows(params)[0]
+    else:
+        from finance import batch, degradation
+        factors = degradation.curve(finance.degradation, int(finance.operate_period))
+        flows = batch.com_flows(params, power=batch.degraded_power(params, factors))[0]
+    return flows[0], flows[1], flows[2]
+
+
+def evaluate(finance):
+    """
+    以编译内核计算单个 Finance 实例的（税前项目 IRR，税后项目 IRR，资本金 IRR）。
+    """
+    irr = com_irr(np.array(com_finance(finance)))
+    return irr[0], irr[1], irr[2]
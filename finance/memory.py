@@ -0,0 +1,190 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   memory.py
+@Time    :   2026/10/19 21:36:12
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 内存预算：按经营期和结果项估算每个情景的工作集，在给定的内存预算内自动确定扫描的批次大小，并读取进程的峰值内存
+#
+# 用法：
+#     sweep(finance, axes, memory='2GB', workers=8)      # 批次大小由内存预算确定
+#     result.attrs['memory']                             # 预算、批次大小、估算用量、扫描前常驻内存和实际峰值（字节）
+#     chunk_size('512MB', cells=21, engine='batch')      # 单独估算批次大小
+
+import re
+import sys
+
+# 批量计算时同时存在的逐年中间序列数（每个情景每年 8 字节），由 tracemalloc 实测的峰值折算并留有余量：
+# 编译内核只保留现金流和少量中间量，numpy 分块批量计算（及按逐年上网电量矩阵计算）同时保留各计算块的中间序列
+SERIES = {'kernel': 14, 'batch': 36}
+# 与年份数无关的每情景字节数：参数行（38 × 8）、网格下标和计算次数等
+SCENARIO = 512
+# 内存预算的单位
+UNITS = {'': 1, 'b': 1, 'k': 1024, 'kb': 1024, 'm': 1024 ** 2, 'mb': 1024 ** 2, 'g': 1024 ** 3, 'gb': 1024 ** 3,
+         't': 1024 ** 4, 'tb': 1024 ** 4}
+
+
+def parse(budget):
+    """
+    解析内存预算：字节数，或带单位的字符串（如 '512MB'、'2g'、'1.5 GB'，按 1024 进位）。
+    """
+    if isinstance(budget, (int, float)):
+        return int(budget)
+    match = re.fullmatch(r'\s*([0-9.]+)\s*([a-zA-Z]*)\s*', str(budget))
+    if not match or match.group(2).lower() not in UNITS:
+        raise ValueError('无法解析的内存预算：%s' % budget)
+    return int(float(match.group(1)) * UNITS[match.group(2).lower()])
+
+
+def scenario_bytes(cells, target='irr', engine='kernel', flows=False, degraded=False, names=3, axes=0):
+    """
+    估算每个情景的内存用量。
+
+    输入参数：
+    ----------
+        cells: integer
+            现金流序列长度（建设期整年数 + 经营期）
+
+        target: str, default = 'irr'
+            扫描目标，临界值目标逐情景求解，工作集与年份数无关
+
+        engine: str, default = 'kernel'
+            现金流计算引擎（'kernel' 或 'batch'）
+
+        flows: bool, default = False
+            结果是否含逐年净现金流
+
+        degraded: bool, default = False
+            是否给定衰减曲线（按逐年上网电量矩阵计算，工作集同 'batch'）
+
+        names: integer, default = 3
+            结果项数
+
+        axes: integer, default = 0
+            扫描轴数（流式扫描的结果块按轴保存各单元的参数坐标）
+
+    返回结果：
+    ----------
+        work: integer
+            计算一个情景所需的中间量字节数
+
+        output: integer
+            一个情景的结果（含现金流、坐标）字节数
+    """
+    work = SCENARIO
+    if target == 'irr':
+        work += 8 * cells * SERIES['batch' if degraded or engine == 'batch' else 'kernel']
+    output = 8 * (names + 1 + axes) + (24 * cells if flows and target == 'irr' else 0)
+    return work, output
+
+
+def estimate(chunk, cells, target='irr', engine='kernel', flows=False, degraded=False, names=3, axes=0, workers=1,
+             pending=1, reserved=0):
+    """
+    估算以 chunk 为批次大小扫描时的内存用量（字节），参数含义见 chunk_size。
+    """
+    work, output = scenario_bytes(cells, target, engine, flows, degraded, names, axes)
+    return reserved + chunk * (workers * (work + output) + max(pending - workers, 0) * output)
+
+
+def chunk_size(budget, cells, target='irr', engine='kernel', flows=False, degraded=False, names=3, axes=0, workers=1,
+               pending=1, reserved=0):
+    """
+    在内存预算内确定批次大小（每批单元数）。
+
+    输入参数：
+    ----------
+        budget: integer or str
+            内存预算，见 parse
+
+        cells, target, engine, flows, degraded, names, axes:
+            见 scenario_bytes
+
+        workers: integer, default = 1
+            同时计算的进程数，各进程各持有一个批次的中间量
+
+        pending: integer, default = 1
+            主进程同时持有的批次结果数（流式扫描为在算的批次数）
+
+        reserved: integer, default = 0
+            预算中已占用的字节数（如结果网格）
+
+    返回结果：
+    ----------
+        chunk: integer
+            批次大小，预算不足一个单元时抛出 ValueError
+
+    备注：
+    ----------
+        预算只计入测算数据（numpy 数组），不含 Python 解释器和 numpy、numba 等库本身约 100 MB 的常驻内存。
+    """
+    budget = parse(budget)
+    unit = estimate(1, cells, target, engine, flows, degraded, names, axes, workers, pending)
+    chunk = (budget - reserved) // unit
+    if chunk < 1:
+        raise ValueError('内存预算 %s 不足：已占用 %s，每批至少需要 %s' % (size(budget), size(reserved), size(unit)))
+    return int(chunk)
+
+
+def size(nbytes):
+    """
+    将字节数格式化为易读的字符串（如 '1.5 GB'）。
+    """
+    if nbytes is None:
+        return '-'
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(nbytes) < 1024:
+            return '%.1f %s' % (nbytes, unit) if unit != 'B' else '%d B' % nbytes
+        nbytes /= 1024.0
+    return '%.1f TB' % nbytes
+
+
+def reset():
+    """
+    重置本进程的峰值内存记录（Linux 下写 /proc/self/clear_refs），不支持时返回 False，此后 peak 为进程启动以来的峰值。
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _status(field):
+    """
+    读取 /proc/self/status 中的内存项（字节），非 Linux 系统返回 None。
+    """
+    try:
+        with open('/proc/self/status') as f:
+            match = re.search(r'%s:\s+(\d+)\s*kB' % field, f.read())
+        return int(match.group(1)) * 1024 if match else None
+    except OSError:
+        return None
+
+
+def current():
+    """
+    本进程当前的常驻内存（字节），无法读取时返回 None。
+    """
+    return _status('VmRSS')
+
+
+def peak():
+    """
+    本进程自上次 reset 以来的峰值常驻内存（字节），无法读取时返回 None。
+    """
+    value = _status('VmHWM')
+    if value is not None:
+        return value
+    try:
+        import resource  # Windows 下不可用
+        value = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return value if sys.platform == 'darwin' else value * 1024
+    except (ImportError, AttributeError):
+        return None
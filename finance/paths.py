@@ -0,0 +1,234 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   paths.py
+@Time    :   2026/10/19 22:05:27
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 逐年电价与发电量路径：补贴期电价后接平价电价、市场电价情景、逐年资源波动等路径的生成，
+# 以及同一项目大量模拟路径的批量测算（情景 × 年份矩阵一次计算），给出 IRR 的分布
+#
+# 用法：
+#     finance.price_path = subsidy(0.35, 0.25, years=20, subsidy_years=12)   # 单一路径直接用 com_finance
+#     prices = market(0.28, years=20, paths=50000, volatility=0.08, reversion=0.3)
+#     aeps = resource(2500, years=20, paths=50000, sigma=0.06, uncertainty=0.05)
+#     result = simulate(finance, prices=prices, aeps=aeps, memory='512MB')
+#     summary(result['cap_irr'], threshold=0.08)        # 均值、分位数及低于 8 % 的概率
+
+import numpy as np
+
+from finance import batch, degradation, kernel, memory as budget
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)  # summary 缺省的分位点
+
+
+def annual(values, years, name='path'):
+    """
+    检查并截取逐经营年的序列：一维，长度不少于 years，返回前 years 年的 float64 数组。
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 1 or len(values) < years:
+        raise ValueError('%s 的长度（%d）少于经营期（%d）' % (name, values.size, years))
+    return values[:years]
+
+
+def subsidy(subsidized, parity, years, subsidy_years):
+    """
+    补贴电价路径：前 subsidy_years 年为补贴电价 subsidized，其后为平价电价 parity（元/kWh）。
+    """
+    return np.where(np.arange(years) < subsidy_years, float(subsidized), float(parity))
+
+
+def market(price, years, paths=10000, volatility=0.1, reversion=0.0, growth=0.0, seed=0):
+    """
+    模拟市场电价路径：对数电价围绕 log(price) + t × log(1 + growth) 均值回复（回复速度为 reversion，
+    为 0 时即随机游走），逐年扰动的标准差为 volatility，首年电价为 price。
+
+    输入参数：
+    ----------
+        price: float
+            首年电价，单位为“元/kWh”
+
+        years: integer
+            经营年数
+
+        paths: integer, default = 10000
+            路径数
+
+        volatility: float, default = 0.1
+            对数电价逐年扰动的标准差
+
+        reversion: float, default = 0.0
+            均值回复速度（0 ~ 1），每年消除偏离长期均值部分的比例
+
+        growth: float, default = 0.0
+            长期均值的年增长率
+
+        seed: integer, default = 0
+            随机数种子
+
+    返回结果：
+    ----------
+        prices: np.array<float>
+            电价路径矩阵（路径数, years）
+    """
+    rng = np.random.default_rng(seed)
+    mean = np.log(price) + np.arange(years) * np.log1p(growth)
+    shocks = rng.standard_normal((paths, years)) * volatility
+    log_price = np.empty((paths, years))
+    log_price[:, 0] = mean[0]
+    for t in range(1, years):
+        previous = log_price[:, t - 1]
+        log_price[:, t] = previous + (mean[t] - mean[t - 1]) + reversion * (mean[t - 1] - previous) + shocks[:, t]
+    return np.exp(log_price)
+
+
+def resource(aep, years, paths=10000, sigma=0.06, uncertainty=0.0, seed=0):
+    """
+    模拟逐年发电利用小时数路径：aep × (1 + uncertainty × 路径偏差) × (1 + sigma × 年际波动)，
+    路径偏差（长期资源评估的不确定性）各路径一个，年际波动逐年独立，均为标准正态分布，结果不小于 0。
+
+    返回结果：
+    ----------
+        aeps: np.array<float>
+            年发电利用小时数路径矩阵（路径数, years）
+    """
+    rng = np.random.default_rng(seed)
+    bias = 1.0 + uncertainty * rng.standard_normal((paths, 1))
+    variation = 1.0 + sigma * rng.standard_normal((paths, years))
+    return np.clip(aep * bias * variation, 0.0, None)
+
+
+def _matrix(values, years, name):
+    """
+    整理路径：None；一维（各路径共用）或二维（路径数, 年数）的序列，截取前 years 年。
+    """
+    if values is None:
+        return None
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    if values.ndim != 2 or values.shape[1] < years:
+        raise ValueError('%s 的年数（%d）少于经营期（%d）' % (name, values.shape[-1], years))
+    return values[:, :years]
+
+
+def com_flows(finance, prices=None, aeps=None):
+    """
+    按逐年电价、发电小时数路径批量计算项目的三条净现金流。
+
+    输入参数：
+    ----------
+        finance: Finance
+            项目边界，衰减曲线取 finance.degradation
+
+        prices, aeps: np.array<float>, default = None
+            电价（元/kWh）、年发电利用小时数的路径，一维（单一路径）或二维（路径数, 年数）；
+            为 None 时取 finance.price_path（finance.aep_path），两者均未给出时取常数 price（aep）
+
+    返回结果：
+    ----------
+        flows: np.array<float>
+            形状为（路径数, 3, 年份数）的现金流数组，单一路径的结果与 Finance.com_finance 逐位相同
+    """
+    years = int(finance.operate_period)
+    prices = _matrix(finance.price_path if prices is None else prices, years, 'price_path')
+    aeps = _matrix(finance.aep_path if aeps is None else aeps, years, 'aep_path')
+    count = max(1 if prices is None else prices.shape[0], 1 if aeps is None else aeps.shape[0])
+    for values, name in ((prices, 'price_path'), (aeps, 'aep_path')):
+        if values is not None and values.shape[0] not in (1, count):
+            raise ValueError('%s 的路径数（%d）与其它路径（%d）不一致' % (name, values.shape[0], count))
+    params = np.broadcast_to(kernel.pack(finance), (count, len(kernel.FIELDS)))
+    if aeps is None and finance.degradation is None:  # 原有衰减曲线，与 Finance.com_finance 的递推逐位相同
+        power = batch.legacy_power(params[:1], years)
+    else:
+        power = batch.degraded_power(params[:1], degradation.curve(finance.degradation, years), aeps)
+    power = np.broadcast_to(power, (count, years))
+    sales = None if prices is None else power * prices
+    return batch.com_flows(params, power=power, sales=sales)
+
+
+def simulate(finance, prices=None, aeps=None, chunk=None, memory=None, flows=False):
+    """
+    批量测算同一项目的大量模拟路径，投资融资块只计算一次，收入税金块按（路径数, 年数）矩阵分批计算。
+
+    输入参数：
+    ----------
+        finance: Finance
+            项目边界
+
+        prices, aeps: np.array<float>, default = None
+            电价、年发电利用小时数路径，见 com_flows；两者的路径数须相同，或其中之一为单一路径
+
+        chunk: integer, default = None
+            每批计算的路径数，为 None 时由内存预算确定，未给出预算时取 8192
+
+        memory: integer or str, default = None
+            内存预算，见 finance.memory
+
+        flows: bool, default = False
+            是否同时返回各路径的逐年净现金流
+
+    返回结果：
+    ----------
+        result: dict<str, np.array<float>>
+            'pre_pro_irr'、'after_pro_irr'、'cap_irr'（各路径的 IRR，不存在时为 nan），flows 为 True 时另含 'flows'
+    """
+    years = int(finance.operate_period)
+    prices = _matrix(finance.price_path if prices is None else prices, years, 'price_path')
+    aeps = _matrix(finance.aep_path if aeps is None else aeps, years, 'aep_path')
+    count = max(1 if prices is None else prices.shape[0], 1 if aeps is None else aeps.shape[0])
+    if memory is not None:
+        cells = years + int(np.ceil(finance.build_period))
+        auto = budget.chunk_size(memory, cells, engine='batch', flows=flows, degraded=True)
+        chunk = auto if chunk is None else min(chunk, auto)
+    chunk = int(chunk or 8192)
+    pick = lambda values, start, stop: values if values is None or values.shape[0] == 1 else values[start:stop]
+    irr, parts = [], []
+    for start in range(0, count, chunk):
+        stop = min(start + chunk, count)
+        part = com_flows(finance, pick(prices, start, stop), pick(aeps, start, stop))
+        irr.append(kernel.com_irr(part))
+        if flows:
+            parts.append(part)
+    irr = np.concatenate(irr)
+    result = {'pre_pro_irr': irr[:, 0], 'after_pro_irr': irr[:, 1], 'cap_irr': irr[:, 2]}
+    if flows:
+        result['flows'] = np.concatenate(parts)
+    return result
+
+
+def summary(values, quantiles=QUANTILES, threshold=None):
+    """
+    IRR 分布的统计量。
+
+    输入参数：
+    ----------
+        values: np.array<float>
+            各路径的 IRR（nan 表示 IRR 不存在）
+
+        quantiles: sequence<float>, default = QUANTILES
+            分位点
+
+        threshold: float, default = None
+            收益率标准，给定时另计 IRR 低于该标准（含 IRR 不存在）的概率
+
+    返回结果：
+    ----------
+        stats: dict<str, float>
+            'paths'（路径数）、'missing'（IRR 不存在的路径数）、'mean'、'std'、'min'、'max'、
+            各分位点 'p5'、'p50' 等，以及 'below'（给定 threshold 时）
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = values[~np.isnan(values)]
+    stats = {'paths': int(values.size), 'missing': int(values.size - valid.size)}
+    if valid.size:
+        stats.update({'mean': float(valid.mean()), 'std': float(valid.std()), 'min': float(valid.min()),
+                      'max': float(valid.max())})
+        for q, value in zip(quantiles, np.quantile(valid, quantiles)):
+            stats['p%g' % (q * 100)] = float(value)
+    if threshold is not None:
+        stats['below'] = float(np.mean(np.isnan(values) | (values < threshold))) if values.size else np.nan
+    return stats
@@ -0,0 +1,185 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   profiler.py
+@Time    :   2026/10/19 13:20:41
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 分阶段计时：记录 com_finance 各计算阶段、com_irr 及各 cal_* 函数的调用次数和用时
+#
+# 用法：
+#     from finance import profiler
+#     with profiler.profile():
+#         cal_price(finance)
+#     print(profiler.report())
+
+import csv
+import functools
+import json
+import os
+import threading
+import time
+
+ENABLED = os.environ.get('FINANCE_PROFILE', '') not in ('', '0')  # 全局开关，也可由环境变量开启
+_STATS = {}  # 名称 -> [调用次数, 总用时, 自身用时]（秒）
+_LOCAL = threading.local()  # 各线程正在计时的函数的子调用用时累计 _LOCAL.stack（用于计算自身用时）
+_LOCK = threading.Lock()  # 多线程同时计时时保护 _STATS
+
+
+def record(name, seconds, own=None):
+    """
+    累计一条计时记录，own 为扣除子调用后的自身用时（缺省与 seconds 相同）。
+    """
+    with _LOCK:
+        entry = _STATS.get(name)
+        if entry is None:
+            entry = _STATS[name] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += seconds if own is None else own
+
+
+def _stack():
+    """
+    当前线程的计时栈。
+    """
+    stack = getattr(_LOCAL, 'stack', None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    return stack
+
+
+def profiled(name):
+    """
+    函数计时装饰器：启用时记录调用次数、总用时和自身用时，未启用时仅多一次开关判断。
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return function(*args, **kwargs)
+            stack = _stack()
+            start = time.perf_counter()
+            stack.append(0.0)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                child = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                record(name, elapsed, elapsed - child)
+        return wrapper
+    return decorator
+
+
+class Clock(object):
+    """ 分阶段计时器
+    在函数内部按阶段依次打点，每段用时记为“函数名.阶段名”。
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.last = time.perf_counter()
+
+    def lap(self, stage):
+        """
+        结束当前阶段（自上次打点起）的计时。
+        """
+        now = time.perf_counter()
+        record(self.name + '.' + stage, now - self.last)
+        self.last = now
+
+
+def clock(name):
+    """
+    返回分阶段计时器，未启用时返回 None（调用方以 `if clock:` 判断后打点）。
+    """
+    if not ENABLED:
+        return None
+    return Clock(name)
+
+
+def enable():
+    """
+    开启计时。
+    """
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    """
+    关闭计时。
+    """
+    global ENABLED
+    ENABLED = False
+
+
+def reset():
+    """
+    清空已有的计时记录。
+    """
+    _STATS.clear()
+    del _stack()[:]
+
+
+def stats():
+    """
+    返回计时记录：名称 -> {'calls': 次数, 'total': 总用时, 'self': 自身用时}（秒）。
+    """
+    return {name: {'calls': calls, 'total': total, 'self': own} for name, (calls, total, own) in _STATS.items()}
+
+
+class profile(object):
+    """ 计时上下文
+    进入时（默认清空已有记录并）开启计时，退出时恢复原开关状态。
+    """
+
+    def __init__(self, reset=True):
+        self.reset = reset
+        self.previous = ENABLED
+
+    def __enter__(self):
+        self.previous = ENABLED
+        if self.reset:
+            reset()
+        enable()
+        return self
+
+    def __exit__(self, *exc):
+        if not self.previous:
+            disable()
+        return False
+
+    def report(self):
+        return report()
+
+
+def report():
+    """
+    生成按总用时降序排列的计时报表（文本）。
+    """
+    lines = ['%-36s %10s %12s %12s %12s' % ('名称', '调用次数', '总用时(s)', '自身用时(s)', '单次(us)')]
+    for name, (calls, total, own) in sorted(_STATS.items(), key=lambda item: -item[1][1]):
+        lines.append('%-36s %10d %12.4f %12.4f %12.2f' % (name, calls, total, own, total / calls * 1e6))
+    return '\n'.join(lines)
+
+
+def export(file):
+    """
+    导出计时记录，按后缀写为 .json 或 .csv 文件。
+    """
+    if os.path.splitext(file)[1].lower() == '.csv':
+        with open(file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['name', 'calls', 'total', 'self'])
+            for name, (calls, total, own) in _STATS.items():
+                writer.writerow([name, calls, total, own])
+    else:
+        with open(file, 'w', encoding='utf-8') as f:
+            json.dump(stats(), f, ensure_ascii=False, indent=2)
@@ -0,0 +1,116 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   progress.py
+@Time    :   2026/10/19 14:02:16
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 参数扫描的运行监测：进度、吞吐率、求解次数与剩余时间
+#
+# sweep 每完成一个批次即以一个事件（dict）调用 progress 回调，事件各项为：
+#     cells: 已完成单元数            total: 单元总数
+#     elapsed: 已用时间（秒）        rate: 吞吐率（单元/秒）        eta: 预计剩余时间（秒）
+#     evaluations: 累计现金流计算次数（临界值测算时为求解器的迭代次数）
+#     chunk: 本批次信息 {'start', 'stop', 'evaluations', 'max_evaluations', 'worst'}，
+#            worst 为本批次中计算次数最多的单元的参数取值 {参数名: 取值}
+
+import json
+import math
+import sys
+import time
+
+
+def make_event(cells, total, elapsed, evaluations, chunk):
+    """
+    生成进度事件，尚无法估计剩余时间时 eta 为 None。
+    """
+    rate = cells / elapsed if elapsed > 0 else 0.0
+    eta = (total - cells) / rate if rate > 0 else None
+    return {'cells': cells, 'total': total, 'elapsed': elapsed, 'rate': rate, 'eta': eta,
+            'evaluations': evaluations, 'chunk': chunk}
+
+
+class Progress(object):
+    """ 内置进度报告器
+    按时间间隔在终端输出一行进度，并可将每个事件以 JSON 行的形式写入日志文件，便于比较不同次运行、
+    定位求解器迭代次数异常多的参数区域。
+
+    成员变量：
+    ----------
+        stream: file, default = sys.stderr
+            进度行的输出流，为 None 时不输出
+
+        log: str, default = None
+            JSON 行日志文件路径，为 None 时不写日志
+
+        interval: float, default = 1.0
+            进度行的最小输出间隔，单位为“秒”
+
+        slow: integer, default = 1000
+            单个单元的计算次数超过该值时，在进度行和日志中标记为异常区域
+    """
+
+    def __init__(self, stream=sys.stderr, log=None, interval=1.0, slow=1000):
+        self.stream = stream
+        self.log = open(log, 'a', encoding='utf-8') if log else None
+        self.interval = interval
+        self.slow = slow
+        self.last = 0.0
+        self.events = 0
+
+    def __call__(self, event):
+        self.events += 1
+        chunk = event['chunk']
+        slow = chunk['max_evaluations'] > self.slow
+        if self.log is not None:
+            record = dict(event, time=time.time(), slow=slow)
+            self.log.write(json.dumps(_plain(record), ensure_ascii=False, allow_nan=False) + '\n')
+            self.log.flush()
+        done = event['cells'] >= event['total']
+        now = time.perf_counter()
+        if self.stream is not None and (done or slow or now - self.last >= self.interval):
+            self.last = now
+            line = '\r%d/%d 单元（%.1f%%），%.1f 单元/秒，平均 %.1f 次计算/单元，剩余 %s' % (
+                event['cells'], event['total'], 100.0 * event['cells'] / max(event['total'], 1), event['rate'],
+                event['evaluations'] / max(event['cells'], 1), _format_time(event['eta']))
+            if slow:
+                line += '\n  计算次数异常：%d 次，参数 %s\n' % (chunk['max_evaluations'], chunk['worst'])
+            self.stream.write(line + ('\n' if done else ''))
+            self.stream.flush()
+        if done:
+            self.close()
+
+    def close(self):
+        """
+        关闭日志文件。
+        """
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+
+def _plain(value):
+    """
+    将日志记录中的 nan、inf 替换为 None（JSON 的 null），使日志为严格的 JSON。
+    """
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _format_time(seconds):
+    """
+    将秒数格式化为 时:分:秒，未知（None 或 nan）时为 --:--:--。
+    """
+    if seconds is None or seconds != seconds:
+        return '--:--:--'
+    seconds = int(round(seconds))
+    return '%d:%02d:%02d' % (seconds // 3600, seconds % 3600 // 60, seconds % 60)
@@ -0,0 +1,114 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   province.py
+@Time    :   2026/10/19 18:34:50
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 分省测算：以各省燃煤发电标杆上网电价为扫描轴，一次计算项目（或项目网格）在各省的 IRR 和临界投资
+#
+# 用法：
+#     result = evaluate(finance)                                  # 全部省份
+#     result = evaluate(finance, [('aep', [2000, 2500, 3000])], provinces=['Gansu', 'Ningxia'])
+#     by_province(result, 'cap_irr')                             # 省份 -> 资本金 IRR
+
+import numpy as np
+
+from finance.base import BENCHMARK
+from finance.sweep import TARGETS, sweep
+
+PROVINCE = 'price'  # 省份轴即电价轴，取值为各省标杆电价
+INVESTMENT = ('static_investment', 'unit_investment')  # 投资轴，临界投资与之无关
+
+
+def table(provinces=None):
+    """
+    生成参与测算的省份及电价。
+
+    输入参数：
+    ----------
+        provinces: None, list<str> or dict<str, float>, default = None
+            None：全部省份（BENCHMARK）；省份名列表：BENCHMARK 中的部分省份；
+            省份名 -> 电价（元/kWh）：自定义电价表（如含补贴或市场化交易电价）
+
+    返回结果：
+    ----------
+        names: list<str>
+            省份名
+
+        prices: np.array<float>
+            对应的电价
+    """
+    if provinces is None:
+        provinces = BENCHMARK
+    if not isinstance(provinces, dict):
+        unknown = [name for name in provinces if name not in BENCHMARK]
+        if unknown:
+            raise ValueError('未知的省份：%s' % ', '.join(unknown))
+        provinces = {name: BENCHMARK[name] for name in provinces}
+    return list(provinces), np.array(list(provinces.values()), dtype=np.float64)
+
+
+def evaluate(finance, axes=None, provinces=None, pro_irr=0.06, cap_irr=0.08, mode=0, jit=True, workers=1,
+             chunk=None, cache=None, progress=None, engine=None, memory=None):
+    """
+    计算项目（或项目网格）在各省标杆电价下的三个 IRR 和临界单位千瓦静态投资。
+
+    输入参数：
+    ----------
+        finance: Finance
+            基准项目边界，电价取各省电价，其余未扫描的参数取其值
+
+        axes: list<(str, sequence)> or dict, default = None
+            其它扫描轴（见 sweep），为 None 时只计算基准项目
+
+        provinces: None, list<str> or dict<str, float>, default = None
+            参与测算的省份，见 table
+
+        pro_irr, cap_irr, mode:
+            临界投资的收益率标准和测算模式，含义同 cal_investment
+
+        jit, workers, chunk, cache, progress, engine, memory:
+            计算选项，见 sweep
+
+    返回结果：
+    ----------
+        result: SweepResult
+            首个扫描轴为省份（取值为各省电价，省份名记入 attrs['provinces']），其后为 axes；
+            结果项为 'pre_pro_irr'、'after_pro_irr'、'cap_irr' 和 'investment'（元/kW）
+
+    备注：
+    ----------
+        1. IRR 以批量内核按整个网格一次计算，临界投资逐单元精确求解（一般 4~5 次现金流计算）；
+        2. 临界投资与 axes 中的投资参数（INVESTMENT）无关，只在其余各轴的网格上求解一次，沿投资轴广播。
+    """
+    names, prices = table(provinces)
+    if isinstance(axes, dict):
+        axes = list(axes.items())
+    axes = [(PROVINCE, prices)] + list(axes or [])
+    if any(name == PROVINCE for name, _ in axes[1:]):
+        raise ValueError('分省测算的电价由省份确定，不能再扫描电价')
+    options = {'pro_irr': pro_irr, 'cap_irr': cap_irr, 'mode': mode, 'jit': jit, 'workers': workers,
+               'chunk': chunk, 'cache': cache, 'progress': progress, 'memory': memory}
+    result = sweep(finance, axes, target='irr', engine=engine, **options)
+    # 临界投资与投资轴无关：只在其余各轴构成的网格上求解，再沿投资轴广播
+    fixed = [k for k, (name, _) in enumerate(axes) if name in INVESTMENT]
+    investment = sweep(finance, [axis for k, axis in enumerate(axes) if k not in fixed], target='investment',
+                       **options)
+    for name in TARGETS['investment']:
+        values = np.expand_dims(investment.data[name], tuple(fixed)) if fixed else investment.data[name]
+        result.data[name] = np.array(np.broadcast_to(values, result.shape))
+    result.attrs.update({'target': 'province', 'provinces': names})
+    return result
+
+
+def by_province(result, name):
+    """
+    将分省测算结果的一项按省份拆分：省份名 -> 该省的结果（标量或其它扫描轴构成的网格）。
+    """
+    values = result[name]
+    return {province: values[k] for k, province in enumerate(result.attrs['provinces'])}
@@ -0,0 +1,225 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   pure.py
+@Time    :   2026/10/19 20:17:33
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 无状态测算接口：以只读的参数向量（矩阵）为输入，返回新分配的结果数组，不修改输入、不读写任何共享状态，
+# 可在线程池（编译内核和 numpy 计算时释放 GIL）或无 GIL 的 Python 中并发调用，无需加锁或复制 Finance 实例
+#
+# 用法：
+#     params = freeze(finance, aep=2200)               # 只读参数向量（kernel.FIELDS 顺序）
+#     irr(params)                                      # （税前项目 IRR，税后项目 IRR，资本金 IRR）
+#     critical(grid, 'price', mode=2)                  # 参数矩阵各行的临界电价
+#     parallel(irr, grid, workers=8)                   # 按行分块在线程池中计算
+
+import concurrent.futures
+import numpy as np
+
+from finance import batch, degradation, kernel
+from finance.base import Finance
+from finance.calculate import solve_root
+from finance.sweep import UNIT_AXES, evaluate
+
+# 临界值目标 -> （参数名，净现值随参数变化的方向）
+CRITICAL = {'price': ('price', 1.0), 'aep': ('aep', 1.0), 'investment': ('static_investment', -1.0)}
+
+
+def freeze(finance=None, **values):
+    """
+    生成只读的参数向量。
+
+    输入参数：
+    ----------
+        finance: Finance, default = None
+            项目边界，为 None 时取 Finance 的默认边界
+
+        values: dict
+            覆盖的参数（kernel.FIELDS 中的字段或 UNIT_AXES 中的派生参数，如 unit_investment）
+
+    返回结果：
+    ----------
+        params: np.array<float>
+            只读（writeable 为 False）的一维参数向量
+
+    备注：
+    ----------
+        参数向量只含标量参数：finance 给定衰减曲线时抛出 ValueError（衰减曲线以 curves 参数传入 irr、flows、critical），
+        给定逐年电价、发电小时数路径时也抛出 ValueError（路径测算见 finance.paths）。
+    """
+    finance = finance if finance is not None else Finance()
+    if getattr(finance, 'price_path', None) is not None or getattr(finance, 'aep_path', None) is not None:
+        raise ValueError('参数向量不含逐年电价、发电小时数路径，请用 finance.paths 测算')
+    if getattr(finance, 'degradation', None) is not None:
+        raise ValueError('参数向量不含衰减曲线，请以 degradation 为 None 的边界生成参数向量，并将曲线作为 curves 传入')
+    params = kernel.pack(finance)
+    for name, value in values.items():
+        if name not in kernel.INDEX and name not in UNIT_AXES:
+            raise ValueError('未知的项目边界参数：%s' % name)
+        if name in kernel.INDEX:
+            params[kernel.INDEX[name]] = value
+    for name, value in values.items():  # 派生参数在装机容量确定后换算
+        if name in UNIT_AXES:
+            params[kernel.INDEX[UNIT_AXES[name]]] = value * params[kernel.INDEX['capacity']]
+    params.flags.writeable = False
+    return params
+
+
+def _rows(params):
+    """
+    参数矩阵视图（不复制，本模块内只读）。
+    """
+    return np.atleast_2d(np.asarray(params, dtype=np.float64))
+
+
+def _curves(rows, curves):
+    """
+    整理衰减曲线：None；各行的逐年系数矩阵（行数, 年数）；或各行共用的一条曲线（见 finance.degradation）。
+    """
+    if curves is None or np.ndim(curves) == 2 and not isinstance(curves, (dict, str)):
+        return curves
+    years = int(rows[:, kernel.INDEX['operate_period']].max())
+    return np.broadcast_to(degradation.curve(curves, years), (rows.shape[0], years))
+
+
+def flows(params, curves=None):
+    """
+    计算净现金流。
+
+    输入参数：
+    ----------
+        params: np.array<float>
+            参数向量或参数矩阵（每行一个情景）
+
+        curves: None, np.array<float> or spec, default = None
+            衰减曲线，见 _curves
+
+    返回结果：
+    ----------
+        flows: np.array<float>
+            形状为（情景数, 3, 年份数）的现金流，一维输入时为（3, 年份数）；经营期不同的情景尾部补零
+    """
+    rows = _rows(params)
+    values = evaluate(rows, target='irr', flows=True, degradation=_curves(rows, curves))['flows']
+    return values[0] if np.ndim(params) == 1 else values
+
+
+def irr(params, curves=None):
+    """
+    计算（税前项目 IRR，税后项目 IRR，资本金 IRR），形状为（情景数, 3），一维输入时为（3,）。
+    """
+    rows = _rows(params)
+    values = evaluate(rows, target='irr', degradation=_curves(rows, curves))
+    result = np.column_stack([values[name] for name in ('pre_pro_irr', 'after_pro_irr', 'cap_irr')])
+    return result[0] if np.ndim(params) == 1 else result
+
+
+def _flow(row, curve):
+    """
+    单个情景的三条净现金流。
+    """
+    if curve is None:
+        return kernel.com_flows(row)[0]
+    return batch.com_flows(row[None, :], power=batch.degraded_power(row[None, :], curve))[0]
+
+
+def _solve(row, curve, target, index, rate):
+    """
+    单个情景、单个收益率标准的临界值（见 calculate._solve_exact），在参数向量的副本上迭代。
+    """
+    column, sign = CRITICAL[target]
+    column = kernel.INDEX[column]
+    discount = None
+
+    def npv(x):
+        nonlocal discount
+        trial = row.copy()
+        trial[column] = x
+        flow = _flow(trial, curve)[index]
+        if discount is None:
+            discount = (1.0 + rate) ** -np.arange(len(flow))
+        return sign * np.dot(flow, discount), np.sum(np.abs(flow))
+
+    return solve_root(npv, row[column])
+
+
+def critical(params, target='price', pro_irr=0.06, cap_irr=0.08, mode=0, curves=None):
+    """
+    精确求解临界值（与 cal_price 等的 method='exact' 结果相同，但不修改任何 Finance 实例）。
+
+    输入参数：
+    ----------
+        params: np.array<float>
+            参数向量或参数矩阵（每行一个情景），各行由自身的电价（发电量、投资）起算
+
+        target: str, default = 'price'
+            'price'：临界电价；'aep'：临界发电量；'investment'：临界单位千瓦静态投资（元/kW）
+
+        pro_irr, cap_irr, mode:
+            收益率标准和测算模式，含义同 cal_price
+
+        curves: None, np.array<float> or spec, default = None
+            衰减曲线，见 _curves
+
+    返回结果：
+    ----------
+        values: np.array<float> or float
+            各情景的临界值，一维输入时为标量
+    """
+    if target not in CRITICAL:
+        raise ValueError('未知的临界值目标：%s' % target)
+    rows = _rows(params)
+    curves = _curves(rows, curves)
+    values = np.empty(rows.shape[0])
+    for s in range(rows.shape[0]):
+        curve = None if curves is None else curves[s]
+        result = []
+        if mode != 1:
+            result.append(_solve(rows[s], curve, target, 2, cap_irr))
+        if mode != 0:
+            result.append(_solve(rows[s], curve, target, 0, pro_irr))
+        values[s] = max(result) if CRITICAL[target][1] > 0 else min(result)
+        if target == 'investment':
+            values[s] /= rows[s, kernel.INDEX['capacity']]
+    return float(values[0]) if np.ndim(params) == 1 else values
+
+
+def parallel(function, params, workers=None, chunk=1024, curves=None, **options):
+    """
+    将参数矩阵按行分块，在线程池中以 function（flows、irr 或 critical）并发计算并按原顺序合并。
+
+    输入参数：
+    ----------
+        function: callable
+            本模块的无状态测算函数
+
+        params: np.array<float>
+            参数矩阵
+
+        workers: integer, default = None
+            线程数，为 None 时由 ThreadPoolExecutor 决定
+
+        chunk: integer, default = 1024
+            每块的行数
+
+        curves, options:
+            衰减曲线及 function 的其它参数
+    """
+    rows = _rows(params)
+    curves = _curves(rows, curves)
+    spans = [(start, min(start + chunk, rows.shape[0])) for start in range(0, rows.shape[0], chunk)]
+
+    def task(span):
+        start, stop = span
+        return function(rows[start:stop], curves=None if curves is None else curves[start:stop], **options)
+    with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+        parts = list(pool.map(task, spans))
+    if parts and np.ndim(parts[0]) == 3:  # 现金流按最长的年份数补零
+        cells = max(part.shape[-1] for part in parts)
+        parts = [np.pad(part, ((0, 0), (0, 0), (0, cells - part.shape[-1]))) for part in parts]
+    return np.concatenate(parts)
@@ -0,0 +1,301 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   register.py
+@Time    :   2026/10/19 20:52:14
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 项目清单批量测算：读取项目清单（csv 或 xlsx，每行一个项目，列名同 Finance 的成员变量），
+# 一次计算全部项目的 IRR、净现值、临界电价和临界发电量，结果连同逐行的错误信息写回清单
+#
+# 用法：
+#     finance-register projects.xlsx -o results.xlsx --mode 2 -w 8
+#     rows = evaluate(load('projects.csv')); save(rows, 'results.csv')
+#
+# 清单中未给出（或留空）的参数取 Finance 的默认值；可用 unit_investment（元/kW）代替 static_investment，
+# degradation 列为衰减模型名或 JSON（见 finance.degradation）；其它列（如项目名称）原样写回。
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import numpy as np
+
+from finance import degradation, kernel, pure, sweep
+from finance.base import Finance
+from finance.sweep import DEGRADATION, UNIT_AXES
+
+# 参数的有效范围（闭区间），超出范围的行不参与计算并报告错误
+LIMITS = {'capacity': (1e-9, np.inf), 'aep': (1e-9, 8760.0), 'static_investment': (1e-9, np.inf),
+          'price': (0.0, np.inf), 'capital_ratio': (0.0, 1.0), 'working_ratio': (0.0, 1.0),
+          'equipment_ratio': (0.0, 1.0), 'install_ratio': (0.0, 1.0), 'build_ratio': (0.0, 1.0),
+          'other_ratio': (0.0, 1.0), 'loan_rate': (0.0, 1.0), 'working_rate': (0.0, 1.0),
+          'income_tax_rate': (0.0, 1.0), 'vat_rate': (0.0, 1.0), 'vat_refund_rate': (0.0, 1.0),
+          'operate_period': (1.0, 100.0), 'build_period': (0.0, 10.0), 'loan_period': (1.0, 100.0),
+          'depreciation_period': (1.0, 100.0), 'residual_rate': (0.0, 1.0), 'warranty': (0.0, 100.0)}
+# 须为整数的参数
+INTEGERS = ('warranty', 'depreciation_period', 'operate_period', 'loan_period')
+# 结果列
+RESULTS = ('pre_pro_irr', 'after_pro_irr', 'cap_irr', 'pro_npv', 'cap_npv', 'critical_price', 'critical_aep',
+           'error')
+
+
+def load(file):
+    """
+    读取项目清单：csv（utf-8，可带 BOM）或 xlsx（首个表单，需安装 openpyxl），首行为列名。
+
+    返回结果：
+    ----------
+        rows: list<dict>
+            各项目的 列名 -> 单元格取值（csv 为字符串，xlsx 为单元格的值）
+    """
+    if os.path.splitext(file)[1].lower() in ('.xlsx', '.xlsm'):
+        try:
+            import openpyxl  # 仅在读取 excel 时导入
+        except ImportError:
+            raise ImportError('读取 xlsx 项目清单需要安装 openpyxl（pip install finance[xlsx]）')
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        lines = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(name).strip() for name in next(lines)]
+        rows = [dict(zip(header, line)) for line in lines if any(v not in (None, '') for v in line)]
+        workbook.close()
+        return rows
+    with open(file, encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        reader.fieldnames = [name.strip() for name in reader.fieldnames]
+        return [row for row in reader if any((v or '').strip() for v in row.values())]
+
+
+def _number(value):
+    """
+    解析数值单元格：数字、数字字符串或百分数（如 '8%'），空单元格返回 None。
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace(',', '')
+    if not text:
+        return None
+    if text.endswith('%'):
+        return float(text[:-1]) / 100.0
+    return float(text)
+
+
+def _curve(value):
+    """
+    解析衰减曲线单元格：模型名或 JSON（带参数的模型、逐年系数序列），空单元格返回 None。
+    """
+    if value is None or str(value).strip() == '':
+        return None
+    text = str(value).strip()
+    if text[0] in '{[':
+        return json.loads(text)
+    return text
+
+
+def validate(values):
+    """
+    检查一个项目的参数向量（kernel.pack），返回错误信息列表（无错误时为空列表）：
+    非有限值、超出有效范围（LIMITS）、整数参数不是整数，以及借款期长于经营期。
+    """
+    problems = []
+    for name, k in kernel.INDEX.items():
+        if not np.isfinite(values[k]):
+            problems.append('%s 不是有限数值：%g' % (name, values[k]))
+    for name, (low, high) in LIMITS.items():
+        value = values[kernel.INDEX[name]]
+        if np.isfinite(value) and not low <= value <= high:
+            problems.append('%s 超出有效范围 [%g, %g]：%g' % (name, low, high, value))
+    for name in INTEGERS:
+        value = values[kernel.INDEX[name]]
+        if np.isfinite(value) and value != int(value):
+            problems.append('%s 须为整数：%g' % (name, value))
+    if values[kernel.INDEX['loan_period']] > values[kernel.INDEX['operate_period']]:
+        problems.append('借款期长于经营期')
+    return problems
+
+
+def parse(rows):
+    """
+    将项目清单解析为参数矩阵。
+
+    返回结果：
+    ----------
+        params: np.array<float>
+            参数矩阵（项目数, len(kernel.FIELDS)），出错的行为默认边界
+
+        specs: list
+            各项目的衰减曲线（None 为原有曲线）
+
+        errors: dict<int, list<str>>
+            行号（从 0 起）-> 错误信息列表
+    """
+    base = kernel.pack(Finance())
+    params = np.tile(base, (len(rows), 1))
+    specs = [None] * len(rows)
+    errors = {}
+    for r, row in enumerate(rows):
+        problems = []
+        unit = None
+        for name, value in row.items():
+            if name in kernel.INDEX or name in UNIT_AXES:
+                try:
+                    number = _number(value)
+                except ValueError:
+                    problems.append('%s 不是数值：%r' % (name, value))
+                    continue
+                if number is None:
+                    continue
+                if name in UNIT_AXES:
+                    unit = (name, number)
+                else:
+                    params[r, kernel.INDEX[name]] = number
+            elif name == DEGRADATION:
+                try:
+                    specs[r] = _curve(value)
+                except ValueError:
+                    problems.append('degradation 无法解析：%r' % (value,))
+        if unit is not None:
+            params[r, kernel.INDEX[UNIT_AXES[unit[0]]]] = unit[1] * params[r, kernel.INDEX['capacity']]
+        problems.extend(validate(params[r]))
+        if specs[r] is not None and not problems:
+            try:
+                degradation.curve(specs[r], int(params[r, kernel.INDEX['operate_period']]))
+            except (ValueError, TypeError) as error:
+                problems.append('degradation 无效：%s' % error)
+        if problems:
+            errors[r] = problems
+    return params, specs, errors
+
+
+def _compute(params, curves, pro_irr, cap_irr, mode, workers):
+    """
+    计算一组（有效）项目的各结果列。
+    """
+    values = sweep.evaluate(params, target='irr', flows=True, degradation=curves)  # 现金流只算一次，IRR 随之给出
+    flows = values['flows']
+    t = np.arange(flows.shape[-1])
+    result = {name: values[name] for name in ('pre_pro_irr', 'after_pro_irr', 'cap_irr')}
+    result.update({'pro_npv': flows[:, 0] @ (1.0 + pro_irr) ** -t, 'cap_npv': flows[:, 2] @ (1.0 + cap_irr) ** -t})
+    options = {'pro_irr': pro_irr, 'cap_irr': cap_irr, 'mode': mode}
+    result['critical_price'] = pure.parallel(pure.critical, params, workers, 64, curves, target='price', **options)
+    result['critical_aep'] = pure.parallel(pure.critical, params, workers, 64, curves, target='aep', **options)
+    return result
+
+
+def evaluate(rows, pro_irr=0.06, cap_irr=0.08, mode=0, workers=None):
+    """
+    批量测算项目清单。
+
+    输入参数：
+    ----------
+        rows: list<dict>
+            项目清单（load 的返回值）
+
+        pro_irr, cap_irr, mode:
+            净现值的折现率（项目税前现金流按 pro_irr、资本金现金流按 cap_irr）及临界值的收益率标准和测算模式，
+            含义同 cal_price
+
+        workers: integer, default = None
+            临界值计算的线程数，见 pure.parallel
+
+    返回结果：
+    ----------
+        results: list<dict>
+            各项目的原有各列及结果列 RESULTS（IRR 不存在、临界值无解时为 None；出错的行结果为 None，
+            error 列为错误信息）
+    """
+    params, specs, errors = parse(rows)
+    valid = [r for r in range(len(rows)) if r not in errors]
+    groups = [[r for r in valid if specs[r] is None], [r for r in valid if specs[r] is not None]]
+    values = {}
+    for group in groups:  # 原有衰减曲线的项目用编译内核，给定衰减曲线的项目按逐年上网电量矩阵计算
+        if not group:
+            continue
+        curves = None
+        if specs[group[0]] is not None:
+            years = int(params[group, kernel.INDEX['operate_period']].max())
+            curves = degradation.matrix([specs[r] for r in group], years)
+        try:
+            part = _compute(params[group], curves, pro_irr, cap_irr, mode, workers)
+        except Exception:  # 批量计算失败时逐行计算，定位出错的项目
+            part = {}
+            for k, r in enumerate(group):
+                try:
+                    one = _compute(params[r:r + 1], None if curves is None else curves[k:k + 1],
+                                   pro_irr, cap_irr, mode, 1)
+                except Exception as error:
+                    errors[r] = ['计算失败：%r' % error]
+                    one = {name: np.array([np.nan]) for name in RESULTS[:-1]}
+                for name, array in one.items():
+                    part.setdefault(name, []).append(array)
+            part = {name: np.concatenate(arrays) for name, arrays in part.items()}
+        for name, array in part.items():
+            values.setdefault(name, []).append(array)
+    values = {name: np.concatenate(arrays) for name, arrays in values.items()}
+    valid = groups[0] + groups[1]
+    position = {r: k for k, r in enumerate(valid)}
+    results = []
+    for r, row in enumerate(rows):
+        out = dict(row)
+        for name in RESULTS[:-1]:
+            value = np.nan if r in errors else values[name][position[r]]
+            out[name] = None if value != value else float(value)
+        out['error'] = '；'.join(errors[r]) if r in errors else None
+        results.append(out)
+    return results
+
+
+def save(results, file):
+    """
+    写出结果清单（csv 或 xlsx，按文件后缀）。
+    """
+    header = []
+    for row in results:
+        header.extend(name for name in row if name not in header)
+    if os.path.splitext(file)[1].lower() == '.xlsx':
+        import xlsxwriter as xlsw  # 仅在写入 excel 时导入
+        workbook = xlsw.Workbook(file, {'constant_memory': True})
+        sheet = workbook.add_worksheet('results')
+        sheet.write_row(0, 0, header)
+        for r, row in enumerate(results):
+            sheet.write_row(r + 1, 0, [row.get(name) for name in header])
+        workbook.close()
+        return
+    with open(file, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, header)
+        writer.writeheader()
+        for row in results:
+            writer.writerow({name: '' if value is None else value for name, value in row.items()})
+
+
+def main(argv=None):
+    """
+    命令行入口：finance-register INPUT -o OUTPUT [--pro-irr R] [--cap-irr R] [--mode M] [-w WORKERS]
+    """
+    parser = argparse.ArgumentParser(prog='finance-register', description='项目清单批量财务测算')
+    parser.add_argument('input', help='项目清单（.csv/.xlsx）')
+    parser.add_argument('-o', '--output', required=True, help='结果清单（.csv/.xlsx）')
+    parser.add_argument('--pro-irr', type=float, default=0.06, help='项目投资 IRR（税前）标准及折现率')
+    parser.add_argument('--cap-irr', type=float, default=0.08, help='资本金 IRR 标准及折现率')
+    parser.add_argument('--mode', type=int, default=0, help='临界值测算模式，含义同 cal_price')
+    parser.add_argument('-w', '--workers', type=int, help='临界值计算的线程数')
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    results = evaluate(load(args.input), args.pro_irr, args.cap_irr, args.mode, args.workers)
+    save(results, args.output)
+    failed = sum(1 for row in results if row['error'])
+    print('%d 个项目（%d 个出错），用时 %.2f 秒，结果：%s' % (len(results), failed, time.perf_counter() - start,
+                                                       args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
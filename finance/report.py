@@ -0,0 +1,382 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   report.py
+@Time    :   2026/10/19 22:41:53
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 敏感性分析报告：读取保存的扫描结果（SweepResult.save 的 .npz），无界面地批量生成标准图表
+# （临界电价等临界值曲面、IRR 等值线、龙卷风图）和汇总表，图表在多个工作进程中并行绘制，过密的网格先抽稀再绘制
+#
+# 用法：
+#     finance-report 风电上网电价.npz 风电IRR.npz -o 敏感性分析 -w 8
+#     build(['result.npz'], output='report', max_points=150)
+#
+# 绘图需要 matplotlib（pip install finance[report]），未安装时只生成汇总表。
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+import numpy as np
+
+from finance.store import SweepResult
+
+# 扫描参数的图表标签
+LABELS = {'price': '上网电价（元/kWh）', 'aep': '年发电利用小时数（h）', 'unit_investment': '单位千瓦造价（元/kW）',
+          'static_investment': '静态投资（万元）', 'capacity': '装机容量（MW）', 'capital_ratio': '资本金比例',
+          'loan_rate': '长期贷款利率', 'loan_period': '借款期（年）', 'operate_period': '经营期（年）',
+          'vat_refund_rate': '增值税返还比例', 'income_tax_rate': '所得税率', 'degradation': '衰减曲线'}
+# 结果项的图表标签
+NAMES = {'pre_pro_irr': '项目投资 IRR（税前）', 'after_pro_irr': '项目投资 IRR（税后）', 'cap_irr': '资本金 IRR',
+         'price': '临界电价（元/kWh）', 'cap_price': '资本金临界电价（元/kWh）', 'pro_price': '项目临界电价（元/kWh）',
+         'after_price': '项目税后临界电价（元/kWh）', 'aep': '临界发电小时数（h）',
+         'investment': '临界单位千瓦投资（元/kW）'}
+# IRR 结果项 -> 收益率标准（attrs 中的项），等值线图中加粗标出
+STANDARDS = {'pre_pro_irr': 'pro_irr', 'after_pro_irr': 'after_irr', 'cap_irr': 'cap_irr'}
+# 中文字体（按顺序取第一个可用的）
+FONTS = ['SimHei', 'Microsoft YaHei', 'Noto Sans CJK SC', 'WenQuanYi Micro Hei', 'Arial Unicode MS', 'DejaVu Sans']
+
+
+def have_matplotlib():
+    """
+    是否安装了 matplotlib。
+    """
+    try:
+        import matplotlib  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def downsample(values, max_points):
+    """
+    抽稀网格轴：等间隔取不超过约 max_points 个序号（含首尾），保持原有的网格取值。
+    """
+    count = len(values)
+    if max_points is None or count <= max_points:
+        return np.arange(count)
+    step = int(np.ceil(count / max_points))
+    return np.unique(np.append(np.arange(0, count, step), count - 1))
+
+
+def _label(name):
+    return LABELS.get(name, name)
+
+
+def _center(result):
+    """
+    基准单元：各扫描轴按取值大小居中的取值的序号（扫描轴可不按大小排列，如分省测算的省份轴）。
+    """
+    return [int(np.argsort(values, kind='stable')[len(values) // 2]) for _, values in result.axes]
+
+
+def _fixed(result, skip):
+    """
+    固定在基准单元的其它扫描轴的说明，如 '单位千瓦造价（元/kW）= 5300'。
+    """
+    center = _center(result)
+    parts = ['%s = %g' % (_label(name), values[center[k]]) for k, (name, values) in enumerate(result.axes)
+             if k not in skip and len(values) > 1]
+    return '，'.join(parts)
+
+
+def plan(result, stem, output, names=None, max_points=200):
+    """
+    生成一个扫描结果的绘图任务：每个结果项在每两个扫描轴构成的平面上（其它轴取基准单元）一幅图
+    （IRR 为等值线图，临界值为曲面图），另加一幅龙卷风图。
+
+    返回结果：
+    ----------
+        tasks: list<dict>
+            绘图任务，含图表类型 'kind'、所属结果 'stem'、输出文件 'file' 及绘图数据（已抽稀），可在工作进程中独立绘制
+    """
+    names = [name for name in (names or result.data) if name in result.data]
+    axes = [k for k, (_, values) in enumerate(result.axes) if len(values) > 1]
+    center = _center(result)
+    tasks = []
+    for name in names:
+        values = result[name]
+        for i, j in itertools.combinations(axes, 2):
+            rows, cols = downsample(result.axes[i][1], max_points), downsample(result.axes[j][1], max_points)
+            rows, cols = rows[np.argsort(result.axes[i][1][rows])], cols[np.argsort(result.axes[j][1][cols])]  # 按取值作图
+            index = list(center)
+            index[i], index[j] = slice(None), slice(None)
+            plane = values[tuple(index)][np.ix_(rows, cols)]
+            x_name, y_name = result.axes[i][0], result.axes[j][0]
+            fixed = _fixed(result, (i, j))
+            tasks.append({'kind': 'contour' if name in STANDARDS else 'surface', 'stem': stem,
+                          'file': os.path.join(output, '%s-%s-%s-%s.png' % (stem, name, x_name, y_name)),
+                          'title': NAMES.get(name, name) + ('（%s）' % fixed if fixed else ''),
+                          'x': result.axes[i][1][rows], 'y': result.axes[j][1][cols], 'z': plane,
+                          'xlabel': _label(x_name), 'ylabel': _label(y_name), 'zlabel': NAMES.get(name, name),
+                          'standard': result.attrs.get(STANDARDS.get(name))})
+        bars = tornado(result, name)
+        if bars:
+            tasks.append({'kind': 'tornado', 'stem': stem, 'file': os.path.join(output, '%s-%s-tornado.png' % (stem, name)),
+                          'title': '%s 敏感性（基准 %.4g）' % (NAMES.get(name, name), bars[0]['base']),
+                          'bars': bars, 'xlabel': NAMES.get(name, name)})
+    return tasks
+
+
+def tornado(result, name):
+    """
+    龙卷风图数据：各扫描轴分别取最小、最大值（其它轴取基准单元）时结果项的取值，按变化幅度由大到小排列。
+    """
+    values = result[name]
+    center = _center(result)
+    base = float(values[tuple(center)])
+    bars = []
+    for k, (axis, grid) in enumerate(result.axes):
+        if len(grid) < 2:
+            continue
+        lo, hi = int(np.argmin(grid)), int(np.argmax(grid))  # 扫描轴可不按大小排列
+        index = list(center)
+        index[k] = lo
+        low = float(values[tuple(index)])
+        index[k] = hi
+        high = float(values[tuple(index)])
+        spans = [abs(value - base) for value in (low, high) if value == value]
+        bars.append({'name': name, 'axis': axis, 'low': float(grid[lo]), 'high': float(grid[hi]),
+                     'base_value': float(grid[center[k]]), 'at_low': low, 'at_high': high, 'base': base,
+                     'span': max(spans) if spans else np.nan})
+    bars.sort(key=lambda bar: -np.nan_to_num(bar['span'], nan=-1.0))
+    return bars
+
+
+def summary(result, names=None):
+    """
+    汇总表：各结果项的基准值、最小值、最大值、均值、中位数及无解（nan）的单元数。
+    """
+    rows = []
+    center = tuple(_center(result))
+    for name in names or result.data:
+        if name not in result.data:
+            continue
+        values = result[name]
+        valid = values[~np.isnan(values)]
+        row = {'name': name, 'label': NAMES.get(name, name), 'cells': int(values.size),
+               'missing': int(values.size - valid.size), 'base': float(values[center])}
+        for key, function in (('min', np.min), ('max', np.max), ('mean', np.mean), ('median', np.median)):
+            row[key] = float(function(valid)) if valid.size else np.nan
+        rows.append(row)
+    return rows
+
+
+def _setup():
+    """
+    工作进程内的 matplotlib 设置：无界面后端、中文字体。
+    """
+    import warnings
+    import matplotlib
+    matplotlib.use('Agg')
+    matplotlib.rcParams['font.sans-serif'] = FONTS
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    warnings.filterwarnings('ignore', message='Glyph .* missing from')  # 缺少中文字体时不逐字告警
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def render(task, dpi=120):
+    """
+    绘制一个绘图任务并保存为 png，返回输出文件名。
+    """
+    plt = _setup()
+    if task['kind'] == 'tornado':
+        bars = task['bars'][::-1]
+        fig, ax = plt.subplots(figsize=(8, 1.2 + 0.5 * len(bars)))
+        base = bars[0]['base']
+        for k, bar in enumerate(bars):
+            for value, color, label in ((bar['at_low'], '#2c7bb6', '%g' % bar['low']),
+                                        (bar['at_high'], '#d7191c', '%g' % bar['high'])):
+                if value == value:
+                    ax.barh(k, value - base, left=base, color=color, height=0.6)
+                    ax.text(value, k, ' %s ' % label, va='center', ha='left' if value >= base else 'right',
+                            fontsize=8)
+        ax.axvline(base, color='black', linewidth=0.8)
+        ax.set_yticks(range(len(bars)))
+        ax.set_yticklabels([_label(bar['axis']) for bar in bars])
+        ax.set_xlabel(task['xlabel'])
+    elif task['kind'] == 'contour':
+        fig, ax = plt.subplots(figsize=(8, 6))
+        x, y = np.meshgrid(task['x'], task['y'], indexing='ij')
+        z = np.ma.masked_invalid(task['z'])
+        filled = ax.contourf(x, y, z, levels=16, cmap='RdYlBu_r')
+        lines = ax.contour(x, y, z, levels=filled.levels, colors='black', linewidths=0.4)
+        ax.clabel(lines, fmt='%.3g', fontsize=7)
+        standard = task.get('standard')
+        if standard is not None and np.nanmin(task['z']) < standard < np.nanmax(task['z']):
+            bold = ax.contour(x, y, z, levels=[standard], colors='black', linewidths=2.0)
+            ax.clabel(bold, fmt={standard: '%g%%' % (standard * 100)}, fontsize=9)
+        fig.colorbar(filled, ax=ax, label=task['zlabel'])
+        ax.set_xlabel(task['xlabel'])
+        ax.set_ylabel(task['ylabel'])
+    else:
+        fig = plt.figure(figsize=(8, 8))
+        ax = fig.add_subplot(projection='3d')
+        x, y = np.meshgrid(task['x'], task['y'], indexing='ij')
+        surface = ax.plot_surface(x, y, np.ma.masked_invalid(task['z']).filled(np.nan), cmap='RdYlBu_r',
+                                  linewidth=0, antialiased=False)
+        fig.colorbar(surface, ax=ax, shrink=0.6, label=task['zlabel'])
+        ax.set_xlabel(task['xlabel'])
+        ax.set_ylabel(task['ylabel'])
+        ax.set_zlabel(task['zlabel'])
+        ax.view_init(elev=25, azim=-135)
+    ax.set_title(task['title'], fontsize=11)
+    fig.savefig(task['file'], dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return task['file']
+
+
+def _render(args):
+    return render(*args)
+
+
+def write_tables(tables, file):
+    """
+    将汇总表和龙卷风图数据写入 excel 文件（表单 'summary'、'tornado'）。
+    """
+    import xlsxwriter as xlsw  # 仅在写入 excel 时导入
+    workbook = xlsw.Workbook(file, {'nan_inf_to_errors': True})
+    for sheet_name, rows in tables.items():
+        sheet = workbook.add_worksheet(sheet_name)
+        header = []
+        for row in rows:
+            header.extend(name for name in row if name not in header)
+        sheet.write_row(0, 0, header)
+        for r, row in enumerate(rows):
+            sheet.write_row(r + 1, 0, [row.get(name) for name in header])
+    workbook.close()
+    return file
+
+
+def _index(output, stems, figures, tables):
+    """
+    生成汇总页 index.html：按结果文件列出各图表，figures 为（所属结果，图片文件）列表。
+    """
+    lines = ['<!DOCTYPE html>', '<html><head><meta charset="utf-8"><title>敏感性分析报告</title></head><body>',
+             '<h1>敏感性分析报告</h1>', '<p>汇总表：<a href="%s">%s</a></p>' % ((os.path.basename(tables),) * 2)]
+    for stem in stems:
+        lines.append('<h2>%s</h2>' % stem)
+        for owner, file in figures:
+            if owner == stem:
+                lines.append('<p><img src="%s" style="max-width:800px"></p>' % os.path.basename(file))
+    lines.append('</body></html>')
+    file = os.path.join(output, 'index.html')
+    with open(file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+    return file
+
+
+def _unique(stem, used):
+    """
+    结果名称去重：与已有名称相同时（如不同目录下的同名文件）依次加后缀 _2、_3 等，避免图片互相覆盖。
+    """
+    name, k = stem, 1
+    while name in used:
+        k += 1
+        name = '%s_%d' % (stem, k)
+    used.add(name)
+    return name
+
+
+def build(results, output='report', names=None, max_points=200, workers=None, figures=None, dpi=120):
+    """
+    由保存的扫描结果生成敏感性分析报告。
+
+    输入参数：
+    ----------
+        results: list<str or SweepResult>
+            扫描结果文件（.npz）或结果对象
+
+        output: str, default = 'report'
+            输出目录，不存在时创建
+
+        names: list<str>, default = None
+            绘制的结果项，为 None 时绘制全部结果项
+
+        max_points: integer, default = 200
+            每个绘图轴最多的网格点数，更密的网格等间隔抽稀后绘制
+
+        workers: integer, default = None
+            并行绘图的进程数，为 None 时取 CPU 核数
+
+        figures: bool, default = None
+            是否绘图；为 None 时安装了 matplotlib 才绘图，为 True 时未安装则抛出 ImportError
+
+        dpi: integer, default = 120
+            图片分辨率
+
+    返回结果：
+    ----------
+        report: dict
+            'figures'（生成的图片文件）、'tables'（汇总表文件）、'index'（汇总页）、'skipped'（未绘图的原因，或 None）
+    """
+    os.makedirs(output, exist_ok=True)
+    if figures is None:
+        figures = have_matplotlib()
+        skipped = None if figures else '未安装 matplotlib，只生成汇总表'
+    elif figures and not have_matplotlib():
+        raise ImportError('绘图需要安装 matplotlib（pip install finance[report]）')
+    else:
+        skipped = None if figures else '未要求绘图'
+    stems, tasks = [], []
+    used = set()
+    tables = {'summary': [], 'tornado': []}
+    for k, item in enumerate(results):
+        if isinstance(item, SweepResult):
+            result, stem = item, '%s-%d' % (item.attrs.get('target', 'result'), k + 1)
+        else:
+            result, stem = SweepResult.load(item), os.path.splitext(os.path.basename(item))[0]
+        stem = _unique(stem, used)
+        stems.append(stem)
+        for row in summary(result, names):
+            tables['summary'].append(dict({'result': stem}, **row))
+            tables['tornado'].extend(dict({'result': stem}, **bar) for bar in tornado(result, row['name']))
+        if figures:
+            tasks.extend(plan(result, stem, output, names, max_points))
+    files = []
+    if tasks:
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        if workers > 1:
+            with multiprocessing.Pool(workers) as pool:
+                files = list(pool.imap(_render, [(task, dpi) for task in tasks]))
+        else:
+            files = [render(task, dpi) for task in tasks]
+    table = write_tables(tables, os.path.join(output, 'summary.xlsx'))
+    index = _index(output, stems, [(task['stem'], file) for task, file in zip(tasks, files)], table)
+    return {'figures': files, 'tables': table, 'index': index, 'skipped': skipped}
+
+
+def main(argv=None):
+    """
+    命令行入口：finance-report RESULT [RESULT ...] [-o DIR] [-w WORKERS] [--names NAME ...] [--max-points N]
+                        [--no-figures]
+    """
+    parser = argparse.ArgumentParser(prog='finance-report', description='由保存的扫描结果生成敏感性分析图表和汇总表')
+    parser.add_argument('results', nargs='+', help='扫描结果文件（.npz）')
+    parser.add_argument('-o', '--output', default='report', help='输出目录')
+    parser.add_argument('-w', '--workers', type=int, help='并行绘图的进程数')
+    parser.add_argument('--names', nargs='+', help='绘制的结果项')
+    parser.add_argument('--max-points', type=int, default=200, help='每个绘图轴最多的网格点数')
+    parser.add_argument('--dpi', type=int, default=120, help='图片分辨率')
+    parser.add_argument('--no-figures', action='store_true', help='只生成汇总表')
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    report = build(args.results, args.output, args.names, args.max_points, args.workers,
+                   False if args.no_figures else None, args.dpi)
+    print('%d 幅图，汇总表 %s，用时 %.2f 秒，报告：%s' % (len(report['figures']), report['tables'],
+                                                 time.perf_counter() - start, report['index']))
+    if report['skipped']:
+        print(report['skipped'])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
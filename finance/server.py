@@ -0,0 +1,371 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   server.py
+@Time    :   2026/10/19 15:36:20
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 本地测算服务：常驻进程提供 HTTP/JSON 接口，将短时间窗口内的并发请求合并为一次批量计算
+#
+# 启动：
+#     finance-server --port 8765          （或 python -m finance.server）
+# 接口：
+#     POST /evaluate/<target>   target 为 irr、price、prices、aep 或 investment，请求体为 JSON：
+#         {"params": {"aep": 2500, "price": 0.3}, "pro_irr": 0.06, "cap_irr": 0.08, "mode": 0, "method": "exact"}
+#         或以 "cases": [{...}, {...}] 一次提交多个情景；params（cases）中的参数名同 Finance 的成员变量
+#         （另可用 unit_investment、degradation，以及只用于 irr 的 price_path、aep_path），未给出的取默认值；
+#         参数有误的情景使整个请求返回 400，不影响同一批次中的其它请求
+#     GET  /metrics             请求数、批次数、平均批量及响应时间分位数（毫秒）
+#     GET  /health              存活检查
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import json
+import time
+import numpy as np
+
+from finance import degradation, kernel, paths, register
+from finance.cli import build_finance
+from finance.sweep import TARGETS, evaluate
+
+OPTIONS = ('pro_irr', 'cap_irr', 'mode', 'after_irr', 'method')  # 随请求提交的测算选项
+DEFAULTS = {'pro_irr': 0.06, 'cap_irr': 0.08, 'mode': 0, 'after_irr': None, 'method': 'step'}
+AUXILIARY = ('cost_list', 'cash_list', 'cap_list')  # Finance 的辅助流量表单，由测算生成
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class Batcher(object):
+    """ 请求合并器
+    同一目标和测算选项的情景在时间窗口内累积为一个批次，窗口结束（或批量达到上限）时
+    以一次 sweep.evaluate 计算，计算在单独的线程中进行，不阻塞事件循环接收新请求；
+    合并计算出错时改为逐个请求计算，只有引起错误的请求收到异常。
+
+    成员变量：
+    ----------
+        window: float, default = 0.005
+            合并窗口，单位为“秒”
+
+        max_batch: integer, default = 4096
+            单个批次的最大情景数
+    """
+
+    def __init__(self, window=0.005, max_batch=4096):
+        self.window = window
+        self.max_batch = max_batch
+        self.pending = {}  # (目标, 测算选项) -> 待计算批次 [(参数矩阵, future), ...]
+        self.executor = concurrent.futures.ThreadPoolExecutor(1)
+        self.batches = 0
+        self.cells = 0
+
+    async def submit(self, key, params):
+        """
+        提交一组情景（参数矩阵），等待所在批次计算完成后返回其结果。
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self.pending.get(key)
+        if batch is None:
+            batch = self.pending[key] = []
+            loop.call_later(self.window, self.flush, key, batch)
+        batch.append((params, future))
+        if sum(len(p) for p, _ in batch) >= self.max_batch:
+            self.flush(key, batch)
+        return await future
+
+    def flush(self, key, batch):
+        """
+        将批次提交计算（批次已被提前提交时忽略）。
+        """
+        if self.pending.get(key) is not batch:
+            return
+        del self.pending[key]
+        target, options = key[0], dict(zip(OPTIONS, key[1:]))
+        self.batches += 1
+        self.cells += sum(len(p) for p, _ in batch)
+        task = asyncio.get_running_loop().run_in_executor(
+            self.executor, self._compute, [p for p, _ in batch], target, options)
+        task.add_done_callback(lambda done: self._dispatch(batch, done))
+
+    async def run(self, function, *args):
+        """
+        在计算线程中执行不参与合并的计算（如给定衰减曲线、逐年路径的请求），与批次计算依次进行。
+        """
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    @staticmethod
+    def _compute(parts, target, options):
+        """
+        计算一个批次：各请求的情景合并为一次计算；合并计算出错时逐个请求单独计算，
+        使出错只影响引起错误的请求。返回各请求的结果或异常。
+        """
+        try:
+            values = evaluate(np.concatenate(parts), target=target, **options)
+        except Exception:
+            results = []
+            for params in parts:
+                try:
+                    results.append(_public(evaluate(params, target=target, **options)))
+                except Exception as error:
+                    results.append(error)
+            return results
+        results, start = [], 0
+        for params in parts:
+            stop = start + len(params)
+            results.append({name: array[start:stop] for name, array in _public(values).items()})
+            start = stop
+        return results
+
+    @staticmethod
+    def _dispatch(batch, done):
+        """
+        将批次中各请求的结果（或异常）交给对应的请求。
+        """
+        results = [done.exception()] * len(batch) if done.exception() is not None else done.result()
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+def _public(values):
+    """
+    去掉不随请求返回的结果项（逐年现金流、计算次数）。
+    """
+    return {name: array for name, array in values.items() if name not in ('flows', 'evaluations')}
+
+
+class Metrics(object):
+    """ 服务运行指标：请求数、错误数、情景数及最近若干次请求的响应时间
+    """
+
+    def __init__(self, size=10000):
+        self.start = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.cases = 0
+        self.latency = collections.deque(maxlen=size)
+
+    def record(self, seconds, cases=0, error=False):
+        self.requests += 1
+        self.cases += cases
+        self.errors += bool(error)
+        self.latency.append(seconds)
+
+    def report(self, batcher):
+        latency = np.array(self.latency) * 1000.0
+        if len(latency):
+            p50, p90, p99 = np.percentile(latency, [50, 90, 99])
+            summary = {'p50': p50, 'p90': p90, 'p99': p99, 'mean': latency.mean(), 'max': latency.max()}
+        else:
+            summary = {}
+        return {'uptime': time.time() - self.start, 'requests': self.requests, 'errors': self.errors,
+                'cases': self.cases, 'batches': batcher.batches,
+                'mean_batch': batcher.cells / batcher.batches if batcher.batches else 0.0,
+                'latency_ms': {name: float(value) for name, value in summary.items()}}
+
+
+class Service(object):
+    """ 本地测算服务
+
+    成员变量：
+    ----------
+        batcher: Batcher
+            请求合并器
+
+        metrics: Metrics
+            运行指标
+    """
+
+    def __init__(self, window=0.005, max_batch=4096):
+        self.batcher = Batcher(window, max_batch)
+        self.metrics = Metrics()
+        self.server = None
+
+    def warm(self):
+        """
+        以默认边界计算一次，预先完成编译内核的加载（编译），使首个请求不必等待。
+        """
+        evaluate(kernel.pack(build_finance({}))[None, :])
+
+    async def start(self, host='127.0.0.1', port=8765):
+        """
+        开始监听，返回 asyncio 服务对象（port 为 0 时由系统分配端口，见 self.port）。
+        """
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def handle(self, reader, writer):
+        """
+        处理一个连接（支持 HTTP/1.1 持久连接）。
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                method, path = line.decode('latin-1').split()[:2]
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                status, payload = await self.dispatch(method, path, body)
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(('HTTP/1.1 %d %s\r\nContent-Type: application/json; charset=utf-8\r\n'
+                              'Content-Length: %d\r\n\r\n' % (status, REASONS[status], len(data))).encode('latin-1')
+                             + data)
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        """
+        按请求路径分派，返回（状态码，JSON 对象）。
+        """
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/metrics':
+            return 200, self.metrics.report(self.batcher)
+        if not path.startswith('/evaluate/'):
+            return 404, {'error': '未知的接口：%s' % path}
+        if method != 'POST':
+            return 405, {'error': '请以 POST 提交测算请求'}
+        start = time.perf_counter()
+        cases = 0
+        try:
+            target = path[len('/evaluate/'):]
+            if target not in TARGETS:
+                raise ValueError('未知的测算目标：%s' % target)
+            request = json.loads(body or b'{}')
+            single = 'cases' not in request
+            rows = [request.get('params', {})] if single else request['cases']
+            cases = len(rows)
+            finances = [_build(row, target, k) for k, row in enumerate(rows)]
+            key = (target,) + tuple(request.get(name, DEFAULTS[name]) for name in OPTIONS)
+            if any(_special(finance) for finance in finances):  # 衰减曲线、逐年路径不能并入参数矩阵，单独计算
+                values = await self.batcher.run(_direct, finances, target, dict(zip(OPTIONS, key[1:])))
+            else:
+                params = np.array([kernel.pack(finance) for finance in finances]).reshape(cases, len(kernel.FIELDS))
+                values = await self.batcher.submit(key, params)
+        except (ValueError, KeyError, TypeError) as error:
+            self.metrics.record(time.perf_counter() - start, cases, error=True)
+            return 400, {'error': str(error)}
+        except Exception as error:
+            self.metrics.record(time.perf_counter() - start, cases, error=True)
+            return 500, {'error': repr(error)}
+        results = [{name: _number(array[k]) for name, array in values.items()} for k in range(cases)]
+        self.metrics.record(time.perf_counter() - start, cases)
+        return 200, results[0] if single else {'results': results}
+
+
+def _build(row, target, k):
+    """
+    由请求中的一个情景生成项目边界并检查，有误时抛出 ValueError（该请求返回 400，不进入批次）。
+    """
+    if not isinstance(row, dict):
+        raise ValueError('情景 %d 不是 JSON 对象' % k)
+    for name in AUXILIARY:
+        if name in row:
+            raise ValueError('情景 %d：%s 由测算生成，不能作为输入' % (k, name))
+    finance = build_finance(row)
+    problems = register.validate(kernel.pack(finance))
+    years = int(finance.operate_period) if not problems else 0
+    for name in ('price_path', 'aep_path'):
+        if getattr(finance, name) is not None and not problems:
+            if target != 'irr':
+                problems.append('给定 %s 时只能测算 irr' % name)
+            else:
+                try:
+                    paths.annual(getattr(finance, name), years, name)
+                except (ValueError, TypeError) as error:
+                    problems.append(str(error))
+    if finance.degradation is not None and not problems:
+        try:
+            degradation.curve(finance.degradation, years)
+        except (ValueError, TypeError) as error:
+            problems.append('degradation 无效：%s' % error)
+    if problems:
+        raise ValueError('情景 %d：%s' % (k, '；'.join(problems)))
+    return finance
+
+
+def _special(finance):
+    """
+    是否给定了衰减曲线或逐年电价、发电小时数路径。
+    """
+    return finance.degradation is not None or finance.price_path is not None or finance.aep_path is not None
+
+
+def _direct(finances, target, options):
+    """
+    计算含衰减曲线或逐年路径的请求：IRR 逐个情景按 kernel.com_finance 计算（与 Finance.com_finance 一致），
+    临界值按逐年衰减系数矩阵计算。
+    """
+    if target == 'irr':
+        irr = np.array([kernel.evaluate(finance) for finance in finances]).reshape(len(finances), 3)
+        return {name: irr[:, k] for k, name in enumerate(TARGETS['irr'])}
+    params = np.array([kernel.pack(finance) for finance in finances])
+    years = int(params[:, kernel.INDEX['operate_period']].max())
+    curves = degradation.matrix([finance.degradation for finance in finances], years)
+    return _public(evaluate(params, target=target, degradation=curves, **options))
+
+
+def _number(value):
+    """
+    转换为 JSON 数值，nan（无解）转换为 null。
+    """
+    value = float(value)
+    return None if value != value else value
+
+
+async def serve(host='127.0.0.1', port=8765, window=0.005, max_batch=4096):
+    """
+    启动服务并持续运行。
+    """
+    service = Service(window, max_batch)
+    service.warm()
+    server = await service.start(host, port)
+    print('finance 测算服务：http://%s:%d' % (host, service.port))
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    """
+    命令行入口：finance-server [--host HOST] [--port PORT] [--window SECONDS] [--max-batch N]
+    """
+    parser = argparse.ArgumentParser(prog='finance-server', description='新能源项目财务测算本地 HTTP/JSON 服务')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址，缺省仅本机访问')
+    parser.add_argument('--port', type=int, default=8765, help='监听端口')
+    parser.add_argument('--window', type=float, default=0.005, help='请求合并窗口（秒）')
+    parser.add_argument('--max-batch', type=int, default=4096, help='单个批次的最大情景数')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.window, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   shard.py
+@Time    :   2026/10/19 19:02:37
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 分片扫描：将扫描网格按固定大小切分为分片发布到工作队列，由任意台机器上的任意个工作进程领取计算，
+# 全部完成后合并为一个扫描结果
+#
+# 用法：
+#     queue = SqliteQueue('/shared/sweep.sqlite')          # 各机器可访问的同一队列文件
+#     job = submit(queue, finance, axes, target='price', method='exact', shard=65536)
+#     work(queue)                                          # 在各机器上运行（或 finance-shard work QUEUE）
+#     result = merge(queue, job)
+#
+# 同一方案重复提交得到同一作业（作业号为方案的哈希），已完成的分片不会重算；分片按租约领取，
+# 工作进程中断后租约到期的分片由其它进程重新领取，重复提交的结果只保留首份（各分片的结果是确定的）。
+
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+import numpy as np
+
+from finance.cache import model_digest
+from finance.store import SweepResult
+from finance.sweep import TARGETS, _max_cells, _plan_memory, evaluate, grid_degradation, grid_params, prepare
+
+
+class Queue(object):
+    """ 分片工作队列接口
+    其它后端（如消息队列、对象存储）实现以下方法即可用于 submit、work 和 merge。
+    """
+
+    def publish(self, job, spec, spans):
+        """
+        发布作业：方案 spec（bytes，见 dump_spec）及各分片的单元范围 spans；作业已存在时不做任何修改。
+        """
+        raise NotImplementedError
+
+    def spec(self, job):
+        """
+        作业的方案（bytes）。
+        """
+        raise NotImplementedError
+
+    def claim(self, worker, lease=3600.0, job=None):
+        """
+        领取一个待计算（或租约已到期）的分片，返回（作业号，分片序号，起始单元，结束单元），无分片可领时返回 None。
+        """
+        raise NotImplementedError
+
+    def complete(self, job, shard, payload):
+        """
+        提交分片结果（bytes），分片已完成时忽略，返回是否写入。
+        """
+        raise NotImplementedError
+
+    def fail(self, job, shard, error):
+        """
+        报告分片计算失败，未超过重试次数时分片重新变为待计算。
+        """
+        raise NotImplementedError
+
+    def status(self, job):
+        """
+        作业各状态（pending/running/done/failed）的分片数。
+        """
+        raise NotImplementedError
+
+    def results(self, job):
+        """
+        逐个返回已完成分片的（起始单元，结果 bytes）。
+        """
+        raise NotImplementedError
+
+
+class SqliteQueue(Queue):
+    """ 以 SQLite 文件实现的分片队列
+    可用于单机多进程，或多台机器共享同一文件（须为支持文件锁的共享文件系统）。
+
+    成员变量：
+    ----------
+        path: str
+            队列文件路径
+
+        retries: integer, default = 3
+            每个分片的最多领取次数，计算出错或租约到期达到该次数后标记为 failed（可用 retry 重置）
+    """
+
+    def __init__(self, path, retries=3):
+        self.path = os.path.expanduser(path)
+        self.retries = retries
+        self._connection = None
+
+    def __getstate__(self):  # 传给工作进程时只传路径，由工作进程自行连接
+        return {'path': self.path, 'retries': self.retries}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['retries'])
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            self._connection.execute('CREATE TABLE IF NOT EXISTS jobs (job TEXT PRIMARY KEY, spec BLOB, created REAL)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS shards (job TEXT, shard INTEGER, start INTEGER, '
+                                     'stop INTEGER, state TEXT, worker TEXT, leased REAL, attempts INTEGER, '
+                                     'error TEXT, result BLOB, PRIMARY KEY (job, shard))')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS shards_state ON shards (state, leased)')
+        return self._connection
+
+    def publish(self, job, spec, spans):
+        connection = self.connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute('INSERT OR IGNORE INTO jobs VALUES (?, ?, ?)', (job, spec, time.time()))
+            connection.executemany('INSERT OR IGNORE INTO shards VALUES (?, ?, ?, ?, ?, NULL, 0, 0, NULL, NULL)',
+                                   [(job, k, start, stop, 'pending') for k, (start, stop) in enumerate(spans)])
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+    def spec(self, job):
+        row = self.connection.execute('SELECT spec FROM jobs WHERE job = ?', (job,)).fetchone()
+        if row is None:
+            raise KeyError('未知的作业：%s' % job)
+        return row[0]
+
+    def claim(self, worker, lease=3600.0, job=None):
+        connection = self.connection
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')  # 加写锁，保证同一分片只被一个进程领取
+        try:
+            # 租约到期且已达最多领取次数的分片（工作进程崩溃或被终止，未能报告失败）标记为 failed，不再领取
+            connection.execute("UPDATE shards SET state = 'failed', error = COALESCE(error, ?) WHERE state = 'running' "
+                               "AND leased < ? AND attempts >= ?", ('租约到期（工作进程中断）', now - lease, self.retries))
+            query = ("SELECT job, shard, start, stop FROM shards WHERE (state = 'pending' OR "
+                     "state = 'running' AND leased < ? AND attempts < ?)")
+            args = [now - lease, self.retries]
+            if job is not None:
+                query += ' AND job = ?'
+                args.append(job)
+            row = connection.execute(query + ' ORDER BY job, shard LIMIT 1', args).fetchone()
+            if row is not None:
+                connection.execute("UPDATE shards SET state = 'running', worker = ?, leased = ?, "
+                                   "attempts = attempts + 1 WHERE job = ? AND shard = ?", (worker, now) + row[:2])
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return row
+
+    def complete(self, job, shard, payload):
+        cursor = self.connection.execute("UPDATE shards SET state = 'done', result = ?, error = NULL "
+                                         "WHERE job = ? AND shard = ? AND state != 'done'", (payload, job, shard))
+        return cursor.rowcount > 0
+
+    def fail(self, job, shard, error):
+        self.connection.execute("UPDATE shards SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                                "error = ? WHERE job = ? AND shard = ? AND state = 'running'",
+                                (self.retries, error, job, shard))
+
+    def retry(self, job):
+        """
+        将作业中失败的分片重置为待计算。
+        """
+        self.connection.execute("UPDATE shards SET state = 'pending', attempts = 0 WHERE job = ? AND state = 'failed'",
+                                (job,))
+
+    def status(self, job):
+        counts = dict.fromkeys(('pending', 'running', 'done', 'failed'), 0)
+        for state, count in self.connection.execute('SELECT state, COUNT(*) FROM shards WHERE job = ? '
+                                                    'GROUP BY state', (job,)):
+            counts[state] = count
+        return counts
+
+    def errors(self, job):
+        """
+        作业中各分片最近一次的错误信息：分片序号 -> 错误信息。
+        """
+        return dict(self.connection.execute('SELECT shard, error FROM shards WHERE job = ? AND error IS NOT NULL',
+                                            (job,)))
+
+    def results(self, job):
+        for start, payload in self.connection.execute("SELECT start, result FROM shards WHERE job = ? AND "
+                                                      "state = 'done' ORDER BY shard", (job,)):
+            yield start, payload
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def dump_spec(spec):
+    """
+    序列化作业方案：数组（基准参数、扫描轴取值、衰减系数矩阵）与 JSON 描述（轴名、测算选项等）一同存为 npz，
+    读取时不执行任何代码（不使用 pickle），队列文件可由多方写入。
+    """
+    arrays = {'base': np.asarray(spec['base'], dtype=np.float64)}
+    for k, (_, values) in enumerate(spec['axes']):
+        arrays['axis_%d' % k] = np.asarray(values, dtype=np.float64)
+    if spec['curves'] is not None:
+        arrays['curves'] = np.asarray(spec['curves'], dtype=np.float64)
+    meta = {name: value for name, value in spec.items() if name not in ('base', 'axes', 'curves')}
+    meta['axes'] = [name for name, _ in spec['axes']]
+    meta['order'] = [int(k) for k in spec['order']]
+    buffer = io.BytesIO()
+    np.savez(buffer, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+    return buffer.getvalue()
+
+
+def load_spec(payload):
+    """
+    读取 dump_spec 序列化的作业方案。
+    """
+    with np.load(io.BytesIO(payload), allow_pickle=False) as archive:
+        spec = json.loads(str(archive['meta']))
+        spec['base'] = archive['base']
+        spec['axes'] = [(name, archive['axis_%d' % k]) for k, name in enumerate(spec['axes'])]
+        spec['curves'] = archive['curves'] if 'curves' in archive.files else None
+    return spec
+
+
+def job_id(spec):
+    """
+    作业号：方案中全部参数、扫描轴、衰减曲线、测算选项与测算模型摘要的哈希（十六进制）。
+    """
+    digest = hashlib.blake2b(model_digest(), digest_size=12)
+    digest.update(np.asarray(spec['base'], dtype=np.float64).tobytes())
+    for name, values in spec['axes']:
+        digest.update(name.encode('utf-8'))
+        digest.update(np.asarray(values, dtype=np.float64).tobytes())
+    if spec['curves'] is not None:
+        digest.update(np.ascontiguousarray(spec['curves'], dtype=np.float64).tobytes())
+    digest.update(json.dumps([sorted(spec['options'].items()), spec['shard'], spec['compact']]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def submit(queue, finance, axes, target='irr', pro_irr=0.06, cap_irr=0.08, mode=0, jit=True, flows=False,
+           compact=False, after_irr=None, method='step', engine=None, shard=65536, memory=None):
+    """
+    将扫描方案切分为分片并发布到队列。
+
+    输入参数：
+    ----------
+        queue: Queue
+            工作队列
+
+        finance, axes, target, pro_irr, cap_irr, mode, jit, flows, compact, after_irr, method, engine:
+            扫描方案，见 sweep
+
+        shard: integer, default = 65536
+            每个分片的单元数（按网格展平顺序切分，切分结果只取决于网格形状和分片大小）
+
+        memory: integer or str, default = None
+            工作进程计算每个分片时的内存预算，见 sweep；只决定分片内的批次大小，不影响结果和作业号
+
+    返回结果：
+    ----------
+        job: str
+            作业号，同一方案重复提交得到同一作业号
+    """
+    base, axes, curves, order, engine, labels = prepare(finance, axes, target, engine)
+    attrs = {'target': target, 'pro_irr': pro_irr, 'cap_irr': cap_irr, 'mode': mode, 'after_irr': after_irr,
+             'method': method}
+    if labels is not None:
+        attrs['degradation'] = labels
+    options = {'target': target, 'pro_irr': pro_irr, 'cap_irr': cap_irr, 'mode': mode, 'jit': jit,
+               'flows': flows, 'after_irr': after_irr, 'method': method, 'engine': engine}
+    spec = {'base': base, 'axes': axes, 'curves': curves, 'order': order, 'attrs': attrs, 'options': options,
+            'compact': compact, 'cells': _max_cells(base, axes) if flows else 0, 'shard': int(shard),
+            'memory': memory}
+    size = int(np.prod([len(values) for _, values in axes], dtype=np.int64))
+    spans = [(start, min(start + shard, size)) for start in range(0, size, shard)]
+    job = job_id(spec)
+    attrs['job'] = job
+    queue.publish(job, dump_spec(spec), spans)
+    return job
+
+
+def run_shard(spec, start, stop, chunk=4096):
+    """
+    计算一个分片，返回结果的序列化数据（npz 格式的 bytes）；方案给出内存预算时，分片内的批次大小不超过预算所容许的大小。
+    """
+    base, axes, curves, options = spec['base'], spec['axes'], spec['curves'], spec['options']
+    if spec.get('memory') is not None:
+        chunk, _ = _plan_memory(base, axes, curves, options['target'], options['engine'], options['flows'], chunk,
+                                spec['memory'], 1, 1, 0)
+    parts = []
+    for begin in range(start, stop, chunk):
+        end = min(begin + chunk, stop)
+        parts.append(evaluate(grid_params(base, axes, begin, end),
+                              degradation=grid_degradation(axes, curves, begin, end), **options))
+    values = {name: np.concatenate([part[name] for part in parts]) for name in parts[0] if name != 'flows'}
+    if 'flows' in parts[0]:
+        flows = np.zeros((stop - start, 3, spec['cells']))
+        offset = 0
+        for part in parts:
+            flows[offset:offset + len(part['flows']), :, :part['flows'].shape[-1]] = part['flows']
+            offset += len(part['flows'])
+        values['flows'] = flows
+    buffer = io.BytesIO()
+    np.savez(buffer, **values)
+    return buffer.getvalue()
+
+
+def work(queue, job=None, worker=None, lease=3600.0, limit=None, chunk=4096):
+    """
+    工作进程主循环：反复领取并计算分片，直至队列中没有可领取的分片。
+
+    输入参数：
+    ----------
+        queue: Queue
+            工作队列
+
+        job: str, default = None
+            只计算指定作业的分片，为 None 时计算所有作业
+
+        worker: str, default = None
+            工作进程名称（记入队列便于排查），为 None 时取“主机名:进程号”
+
+        lease: float, default = 3600.0
+            分片租约，单位为“秒”，领取后超过租约仍未完成的分片可被其它进程重新领取
+
+        limit: integer, default = None
+            最多计算的分片数
+
+        chunk: integer, default = 4096
+            分片内每批计算的单元数
+
+    返回结果：
+    ----------
+        count: integer
+            本进程完成的分片数
+    """
+    worker = worker or '%s:%d' % (socket.gethostname(), os.getpid())
+    specs = {}
+    count = 0
+    while limit is None or count < limit:
+        claimed = queue.claim(worker, lease, job)
+        if claimed is None:
+            break
+        name, shard, start, stop = claimed
+        try:
+            if name not in specs:
+                specs[name] = load_spec(queue.spec(name))
+            payload = run_shard(specs[name], start, stop, chunk)
+        except Exception as error:
+            queue.fail(name, shard, repr(error))
+            continue
+        queue.complete(name, shard, payload)
+        count += 1
+    return count
+
+
+def _work(args):
+    """
+    并行工作进程入口。
+    """
+    queue, job, lease = args
+    return work(queue, job, lease=lease)
+
+
+def work_parallel(queue, job=None, workers=None, lease=3600.0):
+    """
+    在本机启动 workers 个工作进程（缺省为 CPU 核数）计算分片，返回完成的分片数。
+    """
+    workers = workers or os.cpu_count() or 1
+    with multiprocessing.Pool(workers) as pool:
+        return sum(pool.map(_work, [(queue, job, lease)] * workers))
+
+
+def merge(queue, job, flows=None):
+    """
+    将作业的全部分片结果合并为一个扫描结果。
+
+    输入参数：
+    ----------
+        queue: Queue
+            工作队列
+
+        job: str
+            作业号
+
+        flows: bool, default = None
+            是否合并逐年净现金流，为 None 时按方案
+
+    返回结果：
+    ----------
+        result: SweepResult
+            与单机 sweep 相同的扫描结果，attrs['job'] 为作业号
+    """
+    status = queue.status(job)
+    if status['pending'] or status['running'] or status['failed']:
+        raise RuntimeError('作业 %s 尚未完成：%s' % (job, status))
+    spec = load_spec(queue.spec(job))
+    options = spec['options']
+    if flows is None:
+        flows = options['flows']
+    flows = flows and options['flows'] and options['target'] == 'irr'
+    result = SweepResult(spec['axes'], TARGETS[options['target']], cells=spec['cells'], flows=flows,
+                         compact=spec['compact'], attrs=dict(spec['attrs'], job=job))
+    for start, payload in queue.results(job):
+        with np.load(io.BytesIO(payload)) as archive:
+            result.put(start, {name: archive[name] for name in archive.files})
+    order = spec['order']
+    if order != sorted(order):
+        result.transpose(np.argsort(order))
+    return result
+
+
+def main(argv=None):
+    """
+    命令行入口：
+        finance-shard submit SPEC QUEUE [--shard N]     发布测算方案，输出作业号
+        finance-shard work QUEUE [--job JOB] [-w N]     领取并计算分片
+        finance-shard status QUEUE JOB                  查看作业进度
+        finance-shard merge QUEUE JOB [-o OUTPUT]       合并结果并按方案（或 -o）输出
+    """
+    from finance.cli import build_sweep, load_spec, write_result
+
+    parser = argparse.ArgumentParser(prog='finance-shard', description='分片执行新能源项目财务参数扫描')
+    commands = parser.add_subparsers(dest='command', required=True)
+    command = commands.add_parser('submit', help='发布测算方案')
+    command.add_argument('spec', help='测算方案文件（.json/.yaml）')
+    command.add_argument('queue', help='队列文件（SQLite）')
+    command.add_argument('--shard', type=int, default=65536, help='每个分片的单元数')
+    command = commands.add_parser('work', help='领取并计算分片')
+    command.add_argument('queue', help='队列文件（SQLite）')
+    command.add_argument('--job', help='只计算指定作业')
+    command.add_argument('-w', '--workers', type=int, default=1, help='本机并行进程数')
+    command.add_argument('--lease', type=float, default=3600.0, help='分片租约（秒）')
+    command = commands.add_parser('status', help='查看作业进度')
+    command.add_argument('queue', help='队列文件（SQLite）')
+    command.add_argument('job', help='作业号')
+    command = commands.add_parser('merge', help='合并作业结果')
+    command.add_argument('queue', help='队列文件（SQLite）')
+    command.add_argument('job', help='作业号')
+    command.add_argument('-o', '--output', required=True, help='输出文件（.xlsx/.csv/.npz）')
+    args = parser.parse_args(argv)
+
+    queue = SqliteQueue(args.queue)
+    if args.command == 'submit':
+        spec = load_spec(args.spec)
+        finance, axes, options = build_sweep(spec)
+        print(submit(queue, finance, axes, shard=args.shard, **options))
+    elif args.command == 'work':
+        start = time.perf_counter()
+        if args.workers > 1:
+            count = work_parallel(queue, args.job, args.workers, args.lease)
+        else:
+            count = work(queue, args.job, lease=args.lease)
+        print('完成 %d 个分片，用时 %.2f 秒' % (count, time.perf_counter() - start))
+    elif args.command == 'status':
+        print(json.dumps(queue.status(args.job), ensure_ascii=False))
+        for shard, error in sorted(queue.errors(args.job).items()):
+            print('分片 %d：%s' % (shard, error))
+    else:
+        result = merge(queue, args.job)
+        write_result(result, {'file': args.output})
+        print('%d 个单元，结果：%s' % (result.size, args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
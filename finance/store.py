@@ -0,0 +1,497 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   store.py
+@Time    :   2026/10/19 10:05:12
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 参数扫描结果的存储：结果网格、紧凑存储模式与文件读写
+
+import json
+import os
+import numpy as np
+
+# 紧凑模式下以定点整数存储的结果及其单位（如电价以 0.0001 元为单位）
+SCALES = {'price': 1e-4, 'cap_price': 1e-4, 'pro_price': 1e-4, 'after_price': 1e-4}
+MISSING = np.iinfo(np.int32).min  # 定点整数存储时的缺失值（对应 nan）
+
+
+def storage_dtype(name, compact=False):
+    """
+    结果的存储类型：常规模式为 float64，紧凑模式为 float32 或定点 int32。
+    """
+    if not compact:
+        return np.float64
+    if name in SCALES:
+        return np.int32
+    return np.float32
+
+
+def compress(name, values, compact=False):
+    """
+    将 float64 计算结果转换为存储类型。
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not compact:
+        return values
+    if name in SCALES:
+        scaled = np.round(values / SCALES[name])
+        return np.where(np.isnan(scaled), MISSING, scaled).astype(np.int32)
+    return values.astype(np.float32)
+
+
+def blank(array):
+    """
+    以缺失值填充结果网格（浮点为 nan，定点整数为 MISSING），未写入的单元读取时为 nan 而不是 0，返回 array。
+    """
+    array.fill(MISSING if array.dtype.kind == 'i' else np.nan)
+    return array
+
+
+def expand(name, values):
+    """
+    将存储类型还原为 float64（compress 的逆过程）。
+    """
+    values = np.asarray(values)
+    if values.dtype == np.int32:
+        return np.where(values == MISSING, np.nan, values * SCALES[name])
+    return values.astype(np.float64)
+
+
+class SweepResult(object):
+    """ 参数扫描结果
+    按扫描轴组织的结果网格，每个结果项（如各 IRR、临界电价）为一个与网格同形的数组。
+
+    成员变量：
+    ----------
+        axes: list<(str, np.array<float>)>
+            扫描轴列表，每项为（参数名，取值序列），顺序与网格维度一致
+
+        shape: tuple<int>
+            网格形状
+
+        data: dict<str, np.array>
+            结果项 -> 结果网格（存储类型，读取时用 result[name] 还原为 float64）
+
+        flows: np.array or None
+            逐年净现金流，形状为 shape + (3, 年份数)，不保存时为 None
+
+        compact: bool, default = False
+            紧凑存储模式：IRR 等以 float32、电价以 0.0001 元的 int32 存储，现金流以 float32 存储
+
+        attrs: dict
+            其它描述信息（目标、收益率标准等），随结果一并保存
+
+    备注：
+    ----------
+        1. 计算始终以 float64 进行，仅在写入结果网格时转换为存储类型；
+        2. 紧凑模式下 IRR 以 float32 存储（24 位有效二进制位），相对精度约为 6e-8，电价精度为 0.0001 元，满足报表需要。
+    """
+
+    def __init__(self, axes, names, cells=0, flows=False, compact=False, attrs=None):
+        self.axes = [(name, np.asarray(values, dtype=np.float64)) for name, values in axes]
+        self.shape = tuple(len(values) for _, values in self.axes)
+        self.compact = compact
+        self.data = {}
+        for name in names:
+            self.data[name] = blank(np.empty(self.shape, dtype=storage_dtype(name, compact)))
+        self.flows = None
+        if flows:
+            self.flows = blank(np.empty(self.shape + (3, cells), dtype=np.float32 if compact else np.float64))
+        self.attrs = dict(attrs or {})
+
+    @property
+    def size(self):
+        """
+        网格单元数。
+        """
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    @property
+    def nbytes(self):
+        """
+        结果网格（含现金流）占用的字节数。
+        """
+        total = sum(array.nbytes for array in self.data.values())
+        if self.flows is not None:
+            total += self.flows.nbytes
+        return total
+
+    def __getitem__(self, name):
+        return expand(name, self.data[name])
+
+    def put(self, start, values):
+        """
+        将一段连续（按网格展平顺序）单元的 float64 结果写入结果网格。
+
+        输入参数：
+        ----------
+            start: integer
+                首个单元在展平网格中的序号
+
+            values: dict<str, np.array<float>>
+                结果项 -> 一维结果数组；可含 'flows' 项，形状为（单元数, 3, 年份数）
+        """
+        for name, array in self.data.items():
+            chunk = values[name]
+            array.reshape(-1)[start:start + len(chunk)] = compress(name, chunk, self.compact)
+        if self.flows is not None and 'flows' in values:
+            chunk = values['flows']
+            flat = self.flows.reshape((-1,) + self.flows.shape[-2:])
+            flat[start:start + len(chunk), :, :chunk.shape[-1]] = chunk
+            flat[start:start + len(chunk), :, chunk.shape[-1]:] = 0.0
+
+    def transpose(self, order):
+        """
+        按 order（原扫描轴序号列表）重新排列扫描轴，结果网格转置为视图而不复制数据。
+        须在全部结果写入（put）之后调用。
+        """
+        order = [int(k) for k in order]
+        self.axes = [self.axes[k] for k in order]
+        self.shape = tuple(len(values) for _, values in self.axes)
+        for name, array in self.data.items():
+            self.data[name] = array.transpose(order)
+        if self.flows is not None:
+            self.flows = self.flows.transpose(order + [len(order), len(order) + 1])
+        return self
+
+    def share(self, directory):
+        """
+        将结果网格转存为 directory 下的内存映射文件（.npy），以便多个进程原地写入同一份网格。
+
+        返回结果：
+        ----------
+            paths: dict<str, str>
+                结果项（含 'flows'）-> 内存映射文件路径，供工作进程 attach 使用
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = {}
+        arrays = dict(self.data)
+        if self.flows is not None:
+            arrays['flows'] = self.flows
+        for name, array in arrays.items():
+            paths[name] = os.path.join(directory, name + '.npy')
+            shared = blank(np.lib.format.open_memmap(paths[name], mode='w+', dtype=array.dtype, shape=array.shape))
+            if name == 'flows':
+                self.flows = shared
+            else:
+                self.data[name] = shared
+        return paths
+
+    @classmethod
+    def attach(cls, axes, paths, compact=False):
+        """
+        在工作进程中打开 share 生成的内存映射文件，得到可原地写入的结果网格。
+        """
+        result = cls(axes, [], compact=compact)
+        for name, path in paths.items():
+            shared = np.load(path, mmap_mode='r+')
+            if name == 'flows':
+                result.flows = shared
+            else:
+                result.data[name] = shared
+        return result
+
+    def save(self, file):
+        """
+        以 numpy 的 .npz 格式保存结果（保持存储类型，紧凑模式下文件同样紧凑）。
+        """
+        arrays = {'data_' + name: array for name, array in self.data.items()}
+        for k, (name, values) in enumerate(self.axes):
+            arrays['axis_%d' % k] = values
+        if self.flows is not None:
+            arrays['flows'] = self.flows
+        meta = {'axes': [name for name, _ in self.axes], 'names': list(self.data),
+                'compact': self.compact, 'attrs': self.attrs}
+        np.savez(file, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+
+    @classmethod
+    def load(cls, file):
+        """
+        读取 save 保存的结果文件。
+        """
+        with np.load(file) as archive:
+            meta = json.loads(str(archive['meta']))
+            axes = [(name, archive['axis_%d' % k]) for k, name in enumerate(meta['axes'])]
+            result = cls(axes, [], compact=meta['compact'], attrs=meta['attrs'])
+            for name in meta['names']:
+                result.data[name] = archive['data_' + name]
+            if 'flows' in archive.files:
+                result.flows = archive['flows']
+        return result
+
+    def to_csv(self, file='result.csv'):
+        """
+        将结果网格以“长表”形式写入 csv 文件：每行一个单元，依次为各扫描参数取值和各结果项。
+        """
+        grid = np.meshgrid(*[values for _, values in self.axes], indexing='ij')
+        columns = [axis.reshape(-1) for axis in grid] + [self[name].reshape(-1) for name in self.data]
+        header = ','.join([name for name, _ in self.axes] + list(self.data))
+        np.savetxt(file, np.column_stack(columns), delimiter=',', header=header, comments='', fmt='%.10g')
+        return 0
+
+    def to_excel(self, file='result.xlsx'):
+        """
+        将结果网格写入 excel 文件：最后两个扫描轴为表格的行和列，其余轴与结果项组合为表单。
+        """
+        from finance.tools import write_excel
+
+        tables, sheet_name = [], []
+        for name in self.data:
+            values = self[name]
+            if values.ndim == 1:
+                values = values.reshape(1, -1)
+            lead = values.shape[:-2]
+            for index in np.ndindex(*lead):
+                label = [name] + ['%g' % self.axes[k][1][i] for k, i in enumerate(index)]
+                sheet_name.append('-'.join(label)[:31])  # excel 表单名不超过 31 个字符
+                table = values[index]
+                tables.append([[None if np.isnan(v) else v for v in row] for row in table.tolist()])
+        if len(self.axes) == 1:
+            row_header = [self.axes[0][0]]
+        else:
+            row_header = [str(k) for k in self.axes[-2][1]]
+        column_header = [str(k) for k in self.axes[-1][1]]
+        return write_excel(tables, sheet_name=sheet_name, row_header=row_header,
+                           column_header=column_header, file=file)
+
+
+class Block(object):
+    """ 流式扫描的结果块
+    网格中一段连续（按展平顺序）单元的计算结果及其扫描参数坐标。
+
+    成员变量：
+    ----------
+        axes: list<(str, np.array<float>)>
+            扫描轴列表
+
+        start, stop: integer
+            单元序号范围
+
+        values: dict<str, np.array<float>>
+            结果项 -> 一维 float64 结果数组，可含 'flows'（单元数, 3, 年份数）和 'evaluations'
+
+        cells: integer
+            整个网格的现金流序列长度（不保存现金流时为 0）
+
+        attrs: dict
+            扫描的描述信息，同 SweepResult.attrs
+    """
+
+    def __init__(self, axes, start, values, cells=0, attrs=None):
+        self.axes = axes
+        self.start = start
+        self.values = values
+        self.stop = start + len(values['evaluations'])
+        self.cells = cells
+        self.attrs = attrs or {}
+
+    @property
+    def names(self):
+        """
+        结果项名称（不含 'flows'、'evaluations'）。
+        """
+        return [name for name in self.values if name not in ('flows', 'evaluations')]
+
+    @property
+    def index(self):
+        """
+        各单元在各扫描轴上的序号。
+        """
+        return np.unravel_index(np.arange(self.start, self.stop), tuple(len(values) for _, values in self.axes))
+
+    @property
+    def coords(self):
+        """
+        各单元的扫描参数取值：参数名 -> 一维数组。
+        """
+        return {name: values[i] for (name, values), i in zip(self.axes, self.index)}
+
+
+class CsvWriter(object):
+    """ 流式写入 csv 文件，格式同 SweepResult.to_csv（长表，每行一个单元）
+    """
+
+    def __init__(self, file='result.csv'):
+        self.file = file
+        self.handle = None
+
+    def write(self, block):
+        if self.handle is None:
+            self.handle = open(self.file, 'w', encoding='utf-8')
+            self.handle.write(','.join([name for name, _ in block.axes] + block.names) + '\n')
+        columns = list(block.coords.values()) + [block.values[name] for name in block.names]
+        np.savetxt(self.handle, np.column_stack(columns), delimiter=',', fmt='%.10g')
+
+    def close(self):
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ExcelWriter(object):
+    """ 流式写入 excel 文件，表单布局同 SweepResult.to_excel
+    以 xlsxwriter 的 constant_memory 模式逐行写出，内存占用与表格大小无关；
+    各表单在收到首个结果块时一次建立（表单数为结果项数与前导扫描轴网格数之积）。
+    """
+
+    def __init__(self, file='result.xlsx'):
+        self.file = file
+        self.workbook = None
+        self.sheets = None
+
+    def _open(self, block):
+        import xlsxwriter as xlsw  # 仅在写入 excel 时导入
+
+        self.workbook = xlsw.Workbook(self.file, {'constant_memory': True})
+        axes = block.axes
+        if len(axes) == 1:
+            self.rows, row_header = 1, [axes[0][0]]
+        else:
+            self.rows, row_header = len(axes[-2][1]), [str(k) for k in axes[-2][1]]
+        column_header = [str(k) for k in axes[-1][1]]
+        self.columns = len(column_header)
+        lead = axes[:-2]
+        self.sheets = {}
+        for name in block.names:
+            sheets = []
+            for index in np.ndindex(*[len(values) for _, values in lead]):
+                label = [name] + ['%g' % lead[k][1][i] for k, i in enumerate(index)]
+                sheet = self.workbook.add_worksheet('-'.join(label)[:31])  # excel 表单名不超过 31 个字符
+                sheet.write_row(0, 1, column_header)
+                sheets.append(sheet)
+            self.sheets[name] = sheets
+        self.row_header = row_header
+
+    def write(self, block):
+        if self.workbook is None:
+            self._open(block)
+        flat = np.arange(block.start, block.stop)
+        line = flat // self.columns  # 全部表单连续编号的行号
+        breaks = np.flatnonzero(np.diff(line)) + 1
+        for name in block.names:
+            values = block.values[name]
+            for segment in np.split(np.arange(len(flat)), breaks):
+                first = flat[segment[0]]
+                sheet = self.sheets[name][line[segment[0]] // self.rows]
+                row, column = line[segment[0]] % self.rows + 1, first % self.columns
+                if column == 0:
+                    sheet.write(row, 0, self.row_header[row - 1])
+                sheet.write_row(row, column + 1, [None if v != v else v for v in values[segment].tolist()])
+
+    def close(self):
+        if self.workbook is not None:
+            self.workbook.close()
+            self.workbook = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StoreWriter(object):
+    """ 流式写入二进制结果文件（SweepResult.save 的 .npz 格式）
+    结果块写入临时目录下的内存映射结果网格，关闭时打包为 .npz 并删除临时文件，内存占用与网格大小无关；
+    写入中途出错（或被中断）时不生成结果文件，只删除临时文件。
+
+    成员变量：
+    ----------
+        file: str
+            结果文件路径
+
+        compact: bool, default = False
+            紧凑存储模式，见 SweepResult
+
+        flows: bool, default = True
+            结果块含现金流时是否保存
+    """
+
+    def __init__(self, file='result.npz', compact=False, flows=True):
+        self.file = file
+        self.compact = compact
+        self.flows = flows
+        self.result = None
+        self.directory = None
+
+    def write(self, block):
+        if self.result is None:
+            import tempfile
+            self.directory = tempfile.mkdtemp(prefix='finance-stream-')
+            self.result = SweepResult(block.axes, [], compact=self.compact, attrs=block.attrs)
+            for name in block.names:
+                self.result.data[name] = blank(np.lib.format.open_memmap(
+                    os.path.join(self.directory, name + '.npy'), mode='w+',
+                    dtype=storage_dtype(name, self.compact), shape=self.result.shape))
+            if self.flows and 'flows' in block.values:
+                self.result.flows = blank(np.lib.format.open_memmap(
+                    os.path.join(self.directory, 'flows.npy'), mode='w+',
+                    dtype=np.float32 if self.compact else np.float64, shape=self.result.shape + (3, block.cells)))
+        self.result.put(block.start, block.values)
+
+    def close(self):
+        if self.result is not None:
+            self.result.save(self.file)
+            self.discard()
+
+    def discard(self):
+        """
+        放弃写入：删除临时文件，不生成结果文件。
+        """
+        import shutil
+        self.result = None
+        if self.directory is not None:
+            shutil.rmtree(self.directory, True)
+            self.directory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+WRITERS = {'csv': CsvWriter, 'xlsx': ExcelWriter, 'npz': StoreWriter}
+
+
+def write_blocks(blocks, file, format=None, **options):
+    """
+    将流式扫描的结果块依次写入文件，返回写入的单元数。
+
+    输入参数：
+    ----------
+        blocks: iterable<Block>
+            结果块（如 sweep.stream 的返回值）
+
+        file: str
+            输出文件
+
+        format: str, default = None
+            输出格式，'csv'、'xlsx' 或 'npz'，为 None 时按文件后缀
+
+        options:
+            写入器的其它参数（如 StoreWriter 的 compact）
+    """
+    format = format or os.path.splitext(file)[1].lstrip('.').lower()
+    if format not in WRITERS:
+        raise ValueError('不支持的输出格式：%s' % format)
+    count = 0
+    with WRITERS[format](file, **options) as writer:
+        for block in blocks:
+            writer.write(block)
+            count += block.stop - block.start
+    return count
@@ -0,0 +1,186 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   structure.py
+@Time    :   2026/10/19 21:08:41
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 融资方案优化：在资本金比例、借款期、利率折扣、流动资金资本金比例等融资参数的范围内搜索，
+# 使资本金 IRR 最大，或在资本金 IRR 达标的前提下使资本金投入最少；候选方案按参数矩阵批量计算，逐轮在最优方案附近加密
+#
+# 用法：
+#     result = optimize(finance, constraints={'capital_ratio': (0.25, None), 'pre_pro_irr': (0.06, None)})
+#     result = optimize(finance, objective='equity', cap_irr=0.10, space={'capital_ratio': (0.2, 0.5),
+#                                                                         'loan_period': (10, 18)})
+#     result['best']  # 最优方案的融资参数、三个 IRR 和资本金投入（万元）
+
+import itertools
+import numpy as np
+
+from finance import kernel, pure
+
+# 默认搜索范围：参数名 ->（下限，上限）；列表为离散取值
+SPACE = {'capital_ratio': (0.2, 0.4), 'loan_period': (10, 20), 'rate_discount': (0.9, 1.0),
+         'working_ratio': (0.3, 1.0)}
+# 须取整数的参数
+INTEGERS = ('loan_period',)
+# 优化目标 ->（结果项，方向：1 为最大化，-1 为最小化）
+OBJECTIVES = {'cap_irr': ('cap_irr', 1.0), 'equity': ('equity', -1.0)}
+# 结果项
+RESULTS = ('pre_pro_irr', 'after_pro_irr', 'cap_irr', 'equity')
+
+
+def equity(params):
+    """
+    计算资本金投入总额（万元）：建设投资（含建设期利息）的资本金与运营首年流动资金的资本金之和，口径同 Finance。
+
+    输入参数：
+    ----------
+        params: np.array<float>
+            参数矩阵，形状为（情景数, len(FIELDS)）
+
+    返回结果：
+    ----------
+        equity: np.array<float>
+            各情景的资本金投入（万元）
+    """
+    p = lambda name: params[:, kernel.INDEX[name]]
+    build = p('static_investment') * (1.0 + p('loan_rate') * p('rate_discount') / 2)
+    working = p('capacity') * p('working_quota')
+    joint = np.ceil(p('build_period')) == 0  # 无建设期时建设投资与流动资金同在首年，均按流动资金资本金比例
+    return np.where(joint, (build + working) * p('working_ratio'),
+                    build * p('capital_ratio') + working * p('working_ratio'))
+
+
+def _values(span, points, integer):
+    """
+    搜索范围内的候选取值：离散列表原样返回；连续参数取 points 个等分点；整数参数取范围内的全部整数
+    （多于 points 个时等间隔取 points 个并含两端）。
+    """
+    if not isinstance(span, tuple):
+        return np.asarray(span, dtype=np.float64)
+    low, high = span
+    if not integer:
+        return np.linspace(low, high, points) if high > low else np.array([float(low)])
+    values = np.arange(np.ceil(low), np.floor(high) + 1)
+    if len(values) > points:
+        values = np.unique(np.round(np.linspace(values[0], values[-1], points)))
+    return values
+
+
+def _narrow(span, values, best, integer):
+    """
+    以本轮最优取值为中心，将搜索范围收窄到相邻候选值之间（不超出原范围）。
+    """
+    if not isinstance(span, tuple) or len(values) < 2:
+        return span
+    k = int(np.argmin(np.abs(values - best)))
+    low, high = values[max(k - 1, 0)], values[min(k + 1, len(values) - 1)]
+    if integer and high - low <= 2:  # 相邻整数已全部计算过，不再收窄
+        return (best, best)
+    return (float(low), float(high))
+
+
+def optimize(finance, space=None, objective='cap_irr', cap_irr=0.08, constraints=None, points=9, rounds=3, top=10):
+    """
+    搜索最优融资方案。
+
+    输入参数：
+    ----------
+        finance: Finance
+            项目边界，未搜索的参数（含衰减曲线）取其值
+
+        space: dict<str, (float, float) or list>, default = None
+            搜索范围，参数名（kernel.FIELDS 中的字段）->（下限，上限）或离散取值列表，为 None 时取 SPACE；
+            INTEGERS 中的参数只取整数
+
+        objective: str, default = 'cap_irr'
+            'cap_irr'：资本金 IRR 最大；'equity'：资本金 IRR 不低于 cap_irr 时资本金投入最少
+
+        cap_irr: float, default = 0.08
+            资本金 IRR 标准（仅 objective 为 'equity' 时有效）
+
+        constraints: dict<str, (float, float)>, default = None
+            约束，结果项（RESULTS）或参数名 ->（下限，上限），None 表示不限，如
+            {'capital_ratio': (0.25, None), 'pre_pro_irr': (0.06, None)}
+
+        points: integer, default = 9
+            每轮每个连续参数的候选取值数
+
+        rounds: integer, default = 3
+            搜索轮数，首轮覆盖整个搜索范围，其后各轮在上一轮最优方案的相邻候选值之间加密
+
+        top: integer, default = 10
+            返回的较优方案数
+
+    返回结果：
+    ----------
+        result: dict
+            'best'：最优方案（参数名、结果项 -> 取值）；'top'：按目标排序的前 top 个可行方案；
+            'evaluations'：计算的方案数；'feasible'：其中满足约束的方案数
+
+    备注：
+    ----------
+        1. 每轮的全部候选方案组成参数矩阵，由编译内核（finance.pure）一次计算，数千个方案用时约数十毫秒；
+        2. 逐轮加密假定目标在最优方案附近单峰，搜索范围较大或约束较多时可增加 points；
+        3. 搜索范围内没有满足约束的方案时抛出 ValueError。
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError('未知的优化目标：%s' % objective)
+    if getattr(finance, 'price_path', None) is not None or getattr(finance, 'aep_path', None) is not None:
+        raise ValueError('融资方案优化不支持逐年电价、发电小时数路径')
+    space = dict(SPACE if space is None else space)
+    for name in space:
+        if name not in kernel.INDEX:
+            raise ValueError('不支持搜索的参数：%s' % name)
+    bounds = dict(constraints or {})
+    if objective == 'equity':
+        low, high = bounds.get('cap_irr', (None, None))
+        bounds['cap_irr'] = (cap_irr if low is None else max(low, cap_irr), high)
+    for name in bounds:
+        if name not in RESULTS and name not in kernel.INDEX:
+            raise ValueError('不支持的约束：%s' % name)
+    column, sign = OBJECTIVES[objective]
+    base = kernel.pack(finance)
+    names = list(space)
+    spans = dict(space)
+    seen = {}  # 方案（参数取值元组）-> 结果，跨轮去重
+    for _ in range(max(rounds, 1)):
+        grids = [_values(spans[name], points, name in INTEGERS) for name in names]
+        cells = [cell for cell in itertools.product(*grids) if cell not in seen]
+        if cells:
+            params = np.tile(base, (len(cells), 1))
+            params[:, [kernel.INDEX[name] for name in names]] = cells
+            irr = pure.irr(params, curves=finance.degradation)
+            values = {'pre_pro_irr': irr[:, 0], 'after_pro_irr': irr[:, 1], 'cap_irr': irr[:, 2],
+                      'equity': equity(params)}
+            feasible = np.ones(len(cells), dtype=bool)
+            for name, (low, high) in bounds.items():
+                value = values[name] if name in values else params[:, kernel.INDEX[name]]
+                feasible &= ~np.isnan(value)
+                if low is not None:
+                    feasible &= value >= low
+                if high is not None:
+                    feasible &= value <= high
+            score = np.where(feasible & ~np.isnan(values[column]), sign * values[column], -np.inf)
+            for k, cell in enumerate(cells):
+                seen[cell] = (score[k], {item: float(values[item][k]) for item in RESULTS})
+        ranked = sorted(seen.items(), key=lambda item: -item[1][0])
+        if not ranked or ranked[0][1][0] == -np.inf:
+            break
+        best = ranked[0][0]
+        spans = {name: _narrow(space[name], grid, best[k], name in INTEGERS)
+                 for k, (name, grid) in enumerate(zip(names, grids))}
+    ranked = [item for item in sorted(seen.items(), key=lambda item: -item[1][0]) if item[1][0] > -np.inf]
+    if not ranked:
+        raise ValueError('搜索范围内没有满足约束的融资方案')
+    plans = []
+    for cell, (_, values) in ranked[:max(top, 1)]:
+        plan = {name: int(value) if name in INTEGERS else float(value) for name, value in zip(names, cell)}
+        plan.update(values)
+        plans.append(plan)
+    return {'best': plans[0], 'top': plans, 'evaluations': len(seen), 'feasible': len(ranked)}
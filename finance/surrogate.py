@@ -0,0 +1,248 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   surrogate.py
+@Time    :   2026/10/19 14:48:33
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 代理模型：在参数区间（盒）上以切比雪夫张量插值近似 IRR 或临界值，用于快速查询
+#
+# 用法：
+#     model = Surrogate.fit(finance, {'price': (0.2, 0.4), 'aep': (2000, 3500), 'unit_investment': (4000, 6000)})
+#     print(model.max_error)  # 随机抽样验证得到的最大误差（估计值，不是误差上界）
+#     model(price=0.27, aep=2850, unit_investment=4600)['cap_irr']
+
+import json
+import numpy as np
+from numpy.polynomial import chebyshev
+
+from finance import degradation, kernel
+from finance.sweep import TARGETS, UNIT_AXES, evaluate, sweep
+
+
+class Surrogate(object):
+    """ 切比雪夫张量插值代理模型
+
+    成员变量：
+    ----------
+        base: np.array<float>
+            基准参数向量（kernel.pack 打包），盒外参数取其值
+
+        box: list<(str, float, float, int)>
+            参数盒，每项为（参数名，下限，上限，插值阶数）
+
+        coefficients: dict<str, np.array<float>>
+            结果项 -> 切比雪夫系数张量
+
+        max_error: dict<str, float>
+            结果项 -> 估计的最大绝对误差，即随机验证点上误差的最大值；只是估计，不是误差上界，
+            抽样点之间（尤其是 IRR 不光滑处附近）的误差可能更大
+
+        options: dict
+            扫描目标及临界值测算的收益率标准、模式（target, pro_irr, cap_irr, mode）
+
+        curve: np.array<float> or None
+            基准项目衰减曲线（finance.degradation）的逐年系数，精确计算时使用；为 None 时按原有曲线
+
+    备注：
+    ----------
+        1. IRR 在所得税减免期、增值税抵扣等分段处不光滑，插值误差没有可证明的上界，max_error 只是抽样估计，
+           需要更可靠的估计时可增加验证点数，需要更高精度时可提高阶数或缩小参数盒；
+        2. 参数盒内不能有 IRR 不存在（nan）的区域，否则无法拟合；
+        3. 查询点落在参数盒外时，自动改用精确计算（sweep.evaluate）；
+        4. 查询时各结果项合并为一次张量收缩，单点查询为数十微秒量级，批量查询为每点数微秒。
+    """
+
+    def __init__(self, base, box, coefficients, max_error=None, options=None, curve=None):
+        self.base = np.asarray(base, dtype=np.float64)
+        self.curve = None if curve is None else np.asarray(curve, dtype=np.float64)
+        self.box = [(name, float(low), float(high), int(degree)) for name, low, high, degree in box]
+        self.coefficients = coefficients
+        self.max_error = dict(max_error or {})
+        self.options = dict(options or {'target': 'irr'})
+        self._stacked = None
+
+    @classmethod
+    def fit(cls, finance, box, degree=8, target='irr', pro_irr=0.06, cap_irr=0.08, mode=0,
+            validate=200, seed=0, workers=1):
+        """
+        在参数盒的切比雪夫节点上计算扫描目标并拟合代理模型，再以随机抽样估计其最大误差。
+
+        输入参数：
+        ----------
+            finance: Finance
+                基准项目边界
+
+            box: dict<str, (float, float)> or list<(str, float, float)>
+                参数盒，参数名 ->（下限，上限），参数名同 sweep 的扫描轴
+
+            degree: integer or dict<str, int>, default = 8
+                插值阶数（每个参数的节点数为阶数 + 1）
+
+            target, pro_irr, cap_irr, mode:
+                扫描目标及临界值测算的收益率标准、模式，含义同 sweep
+
+            validate: integer, default = 200
+                验证抽样点数
+
+            seed: integer, default = 0
+                验证抽样的随机数种子
+
+            workers: integer, default = 1
+                节点计算的并行进程数
+
+        返回结果：
+        ----------
+            model: Surrogate
+                拟合的代理模型
+        """
+        if isinstance(box, dict):
+            box = [(name,) + tuple(bound) for name, bound in box.items()]
+        box = [(name, low, high, degree.get(name, 8) if isinstance(degree, dict) else degree)
+               for name, low, high in box]
+        axes = [(name, _nodes(low, high, n)) for name, low, high, n in box]
+        result = sweep(finance, axes, target=target, pro_irr=pro_irr, cap_irr=cap_irr, mode=mode, workers=workers)
+        coefficients = {}
+        for name in TARGETS[target]:
+            values = result[name]
+            if np.isnan(values).any():
+                raise ValueError('参数盒内存在 %s 无解（nan）的区域，请缩小参数盒' % name)
+            for k, (_, _, _, n) in enumerate(box):  # 逐维求解切比雪夫系数
+                inverse = np.linalg.inv(chebyshev.chebvander(_nodes(-1.0, 1.0, n), n))
+                values = np.moveaxis(np.tensordot(inverse, values, axes=([1], [k])), 0, k)
+            coefficients[name] = values
+        options = {'target': target, 'pro_irr': pro_irr, 'cap_irr': cap_irr, 'mode': mode}
+        curve = None
+        if finance.degradation is not None:  # 与节点计算（sweep）相同的逐年系数，供盒外精确计算和验证使用
+            years = max([finance.operate_period] + [high for name, _, high, _ in box if name == 'operate_period'])
+            curve = degradation.curve(finance.degradation, int(years))
+        model = cls(kernel.pack(finance), box, coefficients, options=options, curve=curve)
+        if validate:
+            model.validate(validate, seed)
+        return model
+
+    def validate(self, samples=200, seed=0):
+        """
+        在参数盒内随机抽样，与精确计算比较，更新并返回各结果项在抽样点上的最大绝对误差（估计值，不是误差上界）。
+        """
+        rng = np.random.default_rng(seed)
+        points = {name: rng.uniform(low, high, samples) for name, low, high, _ in self.box}
+        approx = self.interpolate(points)
+        exact = self.exact(points)
+        self.max_error = {name: float(np.nanmax(np.abs(approx[name] - exact[name]))) for name in approx}
+        return self.max_error
+
+    def _arrays(self, points):
+        """
+        按参数盒的顺序取出查询点各参数的取值，并广播为等长的一维数组。
+        """
+        return np.broadcast_arrays(*[np.atleast_1d(np.asarray(points[name], dtype=np.float64))
+                                     for name, _, _, _ in self.box])
+
+    def inside(self, points):
+        """
+        判断各查询点是否落在参数盒内。
+        """
+        mask = True
+        for x, (_, low, high, _) in zip(self._arrays(points), self.box):
+            mask = mask & (x >= low) & (x <= high)
+        return mask
+
+    def interpolate(self, points):
+        """
+        以代理模型计算各查询点（不检查是否在参数盒内）。
+
+        输入参数：
+        ----------
+            points: dict<str, float or np.array<float>>
+                参数名 -> 取值（标量或一维数组，可相互广播）
+
+        返回结果：
+        ----------
+            values: dict<str, np.array<float>>
+                结果项 -> 各查询点的近似值
+        """
+        arrays = self._arrays(points)
+        names = list(self.coefficients)
+        if self._stacked is None:  # 各结果项的系数合并为一个张量，一次收缩得到全部结果项
+            self._stacked = np.stack([self.coefficients[name] for name in names], axis=-1)
+        result = self._stacked.reshape(self._stacked.shape[0], -1)
+        for k, (x, (_, low, high, n)) in enumerate(zip(arrays, self.box)):
+            unit = np.clip((2 * x - (low + high)) / (high - low), -1.0, 1.0)
+            basis = np.cos(np.arange(n + 1) * np.arccos(unit)[:, None])  # T_j(x) = cos(j·arccos x)
+            if k == 0:
+                result = basis @ result
+            else:
+                result = (basis[:, None, :] @ result.reshape(len(unit), n + 1, -1))[:, 0, :]
+        return {name: result[:, j] for j, name in enumerate(names)}
+
+    def exact(self, points):
+        """
+        以精确计算引擎计算各查询点。
+        """
+        arrays = self._arrays(points)
+        params = np.tile(self.base, (len(arrays[0]), 1))
+        for x, (name, _, _, _) in zip(arrays, self.box):
+            if name in UNIT_AXES:
+                continue
+            params[:, kernel.INDEX[name]] = x
+        for x, (name, _, _, _) in zip(arrays, self.box):
+            if name in UNIT_AXES:
+                params[:, kernel.INDEX[UNIT_AXES[name]]] = x * params[:, kernel.INDEX['capacity']]
+        curves = None if self.curve is None else np.broadcast_to(self.curve, (len(params), len(self.curve)))
+        values = evaluate(params, degradation=curves, **self.options)
+        return {name: values[name] for name in self.coefficients}
+
+    def query(self, points):
+        """
+        查询各点的结果：参数盒内用代理模型，盒外自动改用精确计算。
+        """
+        values = self.interpolate(points)
+        outside = ~self.inside(points)
+        if outside.any():
+            arrays = self._arrays(points)
+            exact = self.exact({name: x[outside] for x, (name, _, _, _) in zip(arrays, self.box)})
+            for name in values:
+                values[name][outside] = exact[name]
+        return values
+
+    def __call__(self, **point):
+        """
+        查询单个点，返回 结果项 -> 数值。
+        """
+        return {name: float(value[0]) for name, value in self.query(point).items()}
+
+    def save(self, file):
+        """
+        以 .npz 格式保存代理模型。
+        """
+        meta = {'box': self.box, 'max_error': self.max_error, 'options': self.options,
+                'names': list(self.coefficients)}
+        arrays = {'coef_' + name: value for name, value in self.coefficients.items()}
+        if self.curve is not None:
+            arrays['curve'] = self.curve
+        np.savez(file, meta=np.array(json.dumps(meta)), base=self.base, **arrays)
+
+    @classmethod
+    def load(cls, file):
+        """
+        读取 save 保存的代理模型。
+        """
+        with np.load(file) as archive:
+            meta = json.loads(str(archive['meta']))
+            coefficients = {name: archive['coef_' + name] for name in meta['names']}
+            curve = archive['curve'] if 'curve' in archive.files else None
+            return cls(archive['base'], meta['box'], coefficients, meta['max_error'], meta['options'], curve)
+
+
+def _nodes(low, high, degree):
+    """
+    区间 [low, high] 上的 degree + 1 个切比雪夫（第一类）节点。
+    """
+    k = np.arange(degree + 1)
+    x = np.cos(np.pi * (2 * k + 1) / (2 * (degree + 1)))[::-1]
+    return (low + high) / 2 + (high - low) / 2 * x
@@ -0,0 +1,629 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   sweep.py
+@Time    :   2026/10/19 10:32:47
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 参数扫描：在多维参数网格上批量计算 IRR 或临界电价、临界发电量
+
+import collections
+import multiprocessing
+import shutil
+import tempfile
+import time
+import weakref
+import numpy as np
+
+from finance import batch, degradation, kernel, memory as budget
+from finance.calculate import cal_price, cal_prices, cal_aep, cal_investment
+from finance.profiler import profiled
+from finance.progress import Progress, make_event
+from finance.store import Block, SweepResult
+
+# 扫描目标及其结果项
+TARGETS = {'irr': ('pre_pro_irr', 'after_pro_irr', 'cap_irr'),
+           'price': ('price',),
+           'prices': ('cap_price', 'pro_price', 'after_price', 'price'),
+           'aep': ('aep',),
+           'investment': ('investment',)}
+
+# 派生扫描参数：参数名 -> 实际设置的成员变量（取值乘以装机容量），如单位千瓦静态投资（元/kW）
+UNIT_AXES = {'unit_investment': 'static_investment'}
+# 衰减曲线扫描轴：取值为衰减曲线的列表（见 finance.degradation），结果网格中以曲线序号表示
+DEGRADATION = 'degradation'
+
+
+def grid_params(base, axes, start, stop):
+    """
+    生成展平网格中第 start ~ stop-1 个单元的内核参数矩阵。
+
+    输入参数：
+    ----------
+        base: np.array<float>
+            基准参数向量（kernel.pack 打包）
+
+        axes: list<(str, np.array<float>)>
+            扫描轴列表，参数名须为 kernel.FIELDS 中的字段或 UNIT_AXES 中的派生参数
+
+        start, stop: integer
+            单元序号范围（按 C 顺序展平）
+
+    返回结果：
+    ----------
+        params: np.array<float>
+            形状为（stop - start, len(FIELDS)）的参数矩阵
+    """
+    shape = tuple(len(values) for _, values in axes)
+    params = np.tile(base, (stop - start, 1))
+    index = np.unravel_index(np.arange(start, stop), shape)
+    for k, (name, values) in enumerate(axes):
+        if name in kernel.INDEX:
+            params[:, kernel.INDEX[name]] = values[index[k]]
+    for k, (name, values) in enumerate(axes):  # 派生参数在装机容量确定后设置
+        if name in UNIT_AXES:
+            params[:, kernel.INDEX[UNIT_AXES[name]]] = values[index[k]] * params[:, kernel.INDEX['capacity']]
+    return params
+
+
+def grid_degradation(axes, curves, start, stop):
+    """
+    展平网格中第 start ~ stop-1 个单元的衰减系数矩阵。
+
+    输入参数：
+    ----------
+        axes: list<(str, np.array<float>)>
+            扫描轴列表，衰减曲线轴的取值为曲线序号
+
+        curves: np.array<float> or None
+            各衰减曲线的逐年系数矩阵（曲线数, 年数），无衰减曲线扫描轴时只有一行（基准项目的曲线）；
+            为 None 时（各单元均为原有曲线）返回 None
+    """
+    if curves is None:
+        return None
+    names = [name for name, _ in axes]
+    if DEGRADATION not in names:
+        return np.broadcast_to(curves[0], (stop - start, curves.shape[1]))
+    index = np.unravel_index(np.arange(start, stop), tuple(len(values) for _, values in axes))
+    return curves[index[names.index(DEGRADATION)]]
+
+
+@profiled('sweep.evaluate')
+def evaluate(params, target='irr', pro_irr=0.06, cap_irr=0.08, mode=0, jit=True, flows=False, after_irr=None,
+             method='step', cache=None, engine='kernel', degradation=None):
+    """
+    计算一组情景（参数矩阵的各行）的扫描目标。
+
+    输入参数：
+    ----------
+        params: np.array<float>
+            参数矩阵，形状为（情景数, len(FIELDS)）
+
+        target: str, default = 'irr'
+            扫描目标，'irr'：三个 IRR；'price'：临界电价；'aep'：临界发电量；'investment'：临界单位千瓦静态投资（元/kW）；
+            'prices'：一次求解各收益标准下的临界电价（cal_prices），结果项 'cap_price'、'pro_price'、
+            'after_price' 分别对应资本金、项目税前和项目税后 IRR 标准，'price' 对应两者均达标
+
+        pro_irr, cap_irr, mode:
+            临界值测算的收益率标准和测算模式，含义同 cal_price
+
+        jit: bool, default = True
+            是否使用编译内核
+
+        flows: bool, default = False
+            是否同时返回逐年净现金流（仅 target 为 'irr' 时有效）
+
+        after_irr: float, default = None
+            项目投资 IRR（税后）标准（仅 target 为 'prices' 时有效），为 None 时取 pro_irr
+
+        method: str, default = 'step'
+            临界电价（发电量）的求解方法（仅 target 为 'price'/'aep' 时有效），含义同 cal_price
+
+        cache: Cache, default = None
+            测算结果缓存（finance.cache.Cache），仅计算缓存中没有的情景，并将新结果写入缓存；
+            与 cal_price、cal_aep、cal_prices 共用缓存键，相互复用结果
+
+        engine: str, default = 'kernel'
+            现金流计算引擎（仅 target 为 'irr' 且 jit 为 True 时有效），'kernel'：逐情景的编译内核；
+            'batch'：numpy 分块批量计算（finance.batch），相邻情景共享投资融资块
+
+        degradation: np.array<float>, default = None
+            各情景的逐年衰减系数矩阵（情景数, 年数），为 None 时按各情景的原有曲线；
+            给定时现金流由 finance.batch 按逐年上网电量矩阵计算
+
+    返回结果：
+    ----------
+        values: dict<str, np.array<float>>
+            结果项 -> 一维 float64 数组；另含 'evaluations' 项（各单元的现金流计算次数），
+            flows 为 True 时另含 'flows' 项
+    """
+    if cache is not None:
+        return _evaluate_cached(params, cache, target, pro_irr, cap_irr, mode, jit, flows, after_irr, method, engine,
+                                degradation)
+    values = {}
+    if target == 'irr':
+        cells = np.ceil(params[:, kernel.INDEX['build_period']]) + params[:, kernel.INDEX['operate_period']]
+        irr = np.empty((params.shape[0], 3))
+        flow = np.zeros((params.shape[0], 3, int(cells.max()) if len(cells) else 0))
+        for length in np.unique(cells):  # 不同建设期、经营期的情景分组计算，现金流尾部补零
+            rows = np.flatnonzero(cells == length)
+            if not jit:
+                group = _reference_flows(params[rows], None if degradation is None else degradation[rows])
+            elif degradation is not None:
+                group = batch.com_flows(params[rows], power=batch.degraded_power(params[rows], degradation[rows]))
+            elif engine == 'batch':
+                group = batch.com_flows(params[rows])
+            else:
+                group = kernel.com_flows(params[rows])
+            irr[rows] = kernel.com_irr(group) if jit else _reference_irr(group)
+            flow[rows, :, :group.shape[-1]] = group
+        for k, name in enumerate(TARGETS['irr']):
+            values[name] = irr[:, k]
+        if flows:
+            values['flows'] = flow
+        values['evaluations'] = np.ones(params.shape[0])
+    elif target in ('price', 'aep', 'investment'):
+        solver = {'price': cal_price, 'aep': cal_aep, 'investment': cal_investment}[target]
+        options = {} if target == 'investment' else {'method': method}  # 临界投资只有精确求解一种方法
+        result = np.empty(params.shape[0])
+        evaluations = np.empty(params.shape[0])
+        info = {}
+        for s in range(params.shape[0]):  # 每个单元均由基准电价（发电量）起算，保证结果与计算顺序无关
+            result[s] = solver(_unpack(params, degradation, s), pro_irr=pro_irr, cap_irr=cap_irr, mode=mode,
+                               jit=jit, info=info, **options)
+            evaluations[s] = info['evaluations']
+        values[target] = result
+        values['evaluations'] = evaluations
+    elif target == 'prices':
+        result = np.empty((params.shape[0], 4))
+        evaluations = np.empty(params.shape[0])
+        info = {}
+        for s in range(params.shape[0]):
+            prices = cal_prices(_unpack(params, degradation, s), pro_irr=pro_irr, cap_irr=cap_irr, after_irr=after_irr,
+                                jit=jit, info=info)
+            result[s] = prices['cap'], prices['pro'], prices['after'], prices['both']
+            evaluations[s] = info['evaluations']
+        for k, name in enumerate(TARGETS['prices']):
+            values[name] = result[:, k]
+        values['evaluations'] = evaluations
+    else:
+        raise ValueError('未知的扫描目标：%s' % target)
+    return values
+
+
+def _unpack(params, degradation, s):
+    """
+    由参数矩阵的第 s 行（及其衰减系数）还原 Finance 实例。
+    """
+    finance = kernel.unpack(params[s])
+    if degradation is not None:
+        finance.degradation = degradation[s]
+    return finance
+
+
+def _evaluate_cached(params, cache, target, pro_irr, cap_irr, mode, jit, flows, after_irr, method, engine,
+                     degradation):
+    """
+    经由缓存计算（见 evaluate 的 cache 参数），缓存命中的情景计算次数记为 0。
+    """
+    if target == 'irr':
+        kind, options = 'irr', {}
+    elif target in ('price', 'aep'):
+        kind, options = 'cal_' + target, {'pro_irr': pro_irr, 'cap_irr': cap_irr, 'mode': mode, 'method': method}
+    elif target == 'investment':
+        kind, options = 'cal_investment', {'pro_irr': pro_irr, 'cap_irr': cap_irr, 'mode': mode}
+    elif target == 'prices':
+        kind = 'cal_prices'
+        options = {'pro_irr': pro_irr, 'cap_irr': cap_irr, 'after_irr': pro_irr if after_irr is None else after_irr,
+                   'step': 0.0001}
+    else:
+        raise ValueError('未知的扫描目标：%s' % target)
+    rows = params
+    if degradation is not None:  # 衰减系数并入缓存键（按各情景的经营期截取）
+        operate = params[:, kernel.INDEX['operate_period']].astype(int)
+        rows = [np.concatenate([params[s], degradation[s, :operate[s]]]) for s in range(params.shape[0])]
+    keys = cache.keys(rows, kind, **options)
+    found = cache.get_many(keys)
+    flows = flows and target == 'irr'
+    if flows:
+        flow_keys = cache.keys(rows, 'flows')
+        found_flows = cache.get_many(flow_keys)
+    missing = [s for s, key in enumerate(keys) if key not in found or flows and flow_keys[s] not in found_flows]
+    computed = evaluate(params[missing], target=target, pro_irr=pro_irr, cap_irr=cap_irr, mode=mode, jit=jit,
+                        flows=flows, after_irr=after_irr, method=method, engine=engine,
+                        degradation=None if degradation is None else degradation[missing])
+    names = TARGETS[target]
+    new = {}
+    for k, s in enumerate(missing):
+        found[keys[s]] = new[keys[s]] = np.array([computed[name][k] for name in names])
+    cache.put_many(new)
+    values = {name: np.array([found[key][k] for key in keys]) for k, name in enumerate(names)}
+    values['evaluations'] = np.zeros(params.shape[0])
+    values['evaluations'][missing] = computed['evaluations']
+    if flows:
+        cells = np.ceil(params[:, kernel.INDEX['build_period']]) + params[:, kernel.INDEX['operate_period']]
+        flow = np.zeros((params.shape[0], 3, int(cells.max()) if len(cells) else 0))
+        new = {}
+        for k, s in enumerate(missing):
+            flow_k = computed['flows'][k, :, :int(cells[s])]
+            found_flows[flow_keys[s]] = new[flow_keys[s]] = flow_k.reshape(-1)
+        cache.put_many(new)
+        for s, key in enumerate(flow_keys):
+            flow[s, :, :int(cells[s])] = found_flows[key].reshape(3, -1)
+        values['flows'] = flow
+    return values
+
+
+def _reference_flows(params, degradation=None):
+    """
+    以 Finance.com_finance 逐情景计算现金流（jit 为 False 时使用）。
+    """
+    return np.array([_unpack(params, degradation, s).com_finance() for s in range(params.shape[0])])
+
+
+def _reference_irr(flows):
+    """
+    以 Finance.com_irr 逐条计算 IRR（jit 为 False 时使用）。
+    """
+    from finance.base import Finance
+    return np.array([[Finance.com_irr(flow) for flow in row] for row in flows])
+
+
+def _max_cells(base, axes):
+    """
+    扫描网格内最长的现金流序列长度（建设期、经营期也可作为扫描轴）。
+    """
+    period = dict(axes)
+    build = period.get('build_period', [base[kernel.INDEX['build_period']]])
+    operate = period.get('operate_period', [base[kernel.INDEX['operate_period']]])
+    return int(np.max(np.ceil(build)) + np.max(operate))
+
+
+_WORKER = None  # 工作进程内的计算上下文（基准参数，扫描轴，衰减系数，计算选项，共享结果网格）
+
+
+def _init_worker(base, axes, curves, options, paths, compact):
+    """
+    工作进程初始化：打开共享的结果网格。
+    """
+    global _WORKER
+    _WORKER = (base, axes, curves, options, SweepResult.attach(axes, paths, compact))
+    budget.reset()
+
+
+def _run_chunk(span):
+    """
+    工作进程计算一个批次，并将结果原地写入共享的结果网格。
+    """
+    base, axes, curves, options, result = _WORKER
+    start, stop = span
+    values = evaluate(grid_params(base, axes, start, stop), degradation=grid_degradation(axes, curves, start, stop),
+                      **options)
+    result.put(start, values)
+    return dict(_chunk_summary(axes, start, values), peak=budget.peak())
+
+
+def _chunk_summary(axes, start, values):
+    """
+    批次的运行监测信息：单元范围、计算次数合计与最大值，及计算次数最多的单元的参数取值。
+    """
+    evaluations = values['evaluations']
+    worst = int(np.argmax(evaluations))
+    index = np.unravel_index(start + worst, tuple(len(v) for _, v in axes))
+    return {'start': start, 'stop': start + len(evaluations), 'evaluations': int(evaluations.sum()),
+            'max_evaluations': int(evaluations[worst]),
+            'worst': {name: float(v[i]) for (name, v), i in zip(axes, index)}}
+
+
+def prepare(finance, axes, target='irr', engine=None, reorder=True):
+    """
+    整理扫描方案：检查扫描轴和目标，将衰减曲线轴转换为曲线序号，并按计算引擎规划扫描轴的计算顺序。
+
+    输入参数：
+    ----------
+        finance, axes, target, engine:
+            基准项目边界、扫描轴、扫描目标和计算引擎，见 sweep
+
+        reorder: bool, default = True
+            是否按计算引擎重排扫描轴（流式扫描须按输入顺序逐块输出，不重排）
+
+    返回结果：
+    ----------
+        base: np.array<float>
+            基准参数向量（kernel.pack）
+
+        axes: list<(str, np.array<float>)>
+            按计算顺序排列的扫描轴
+
+        curves: np.array<float> or None
+            衰减系数矩阵，见 grid_degradation
+
+        order: list<int>
+            计算顺序中各轴在输入扫描轴中的序号，计算完成后以 SweepResult.transpose(np.argsort(order)) 还原
+
+        engine: str
+            实际使用的计算引擎
+
+        labels: list<str> or None
+            各衰减曲线的说明
+    """
+    axes = list(axes.items()) if isinstance(axes, dict) else list(axes)
+    if getattr(finance, 'price_path', None) is not None or getattr(finance, 'aep_path', None) is not None:
+        raise ValueError('参数扫描不支持逐年电价、发电小时数路径，请用 finance.paths.simulate 测算')
+    specs = [finance.degradation] if finance.degradation is not None else None
+    for k, (name, values) in enumerate(axes):
+        if name == DEGRADATION:  # 衰减曲线轴以曲线序号参与网格计算
+            specs = list(values)
+            axes[k] = (name, np.arange(len(specs)))
+    axes = [(name, np.asarray(values, dtype=np.float64)) for name, values in axes]
+    for name, _ in axes:
+        if name not in kernel.INDEX and name not in UNIT_AXES and name != DEGRADATION:
+            raise ValueError('不支持扫描的参数：%s' % name)
+    if target not in TARGETS:
+        raise ValueError('未知的扫描目标：%s' % target)
+    if engine is None:
+        engine = 'kernel' if kernel.HAVE_NUMBA else 'batch'
+    order = list(range(len(axes)))
+    if reorder and engine == 'batch' and target == 'irr':  # 按计算块规划扫描轴的计算顺序，完成后转置回输入顺序
+        order = batch.plan([name for name, _ in axes])
+        axes = [axes[k] for k in order]
+    base = kernel.pack(finance)
+    curves, labels = None, None
+    if specs is not None:
+        operate = dict(axes).get('operate_period', [base[kernel.INDEX['operate_period']]])
+        curves = degradation.matrix(specs, int(np.max(operate)))
+        labels = [degradation.label(spec) for spec in specs]
+    return base, axes, curves, order, engine, labels
+
+
+def _plan_memory(base, axes, curves, target, engine, flows, chunk, memory, workers, pending, reserved):
+    """
+    确定批次大小：给定内存预算时按预算估算（不超过给定的 chunk，且使每个进程都有批次可算），否则取 chunk
+    （缺省 4096）；返回批次大小和内存用量记录（'budget'、'chunk'、'estimate'、扫描前的常驻内存 'baseline'，
+    峰值 'peak'、'worker_peak' 在扫描过程中填入）。
+    """
+    size = int(np.prod([len(values) for _, values in axes], dtype=np.int64))
+    options = {'cells': _max_cells(base, axes), 'target': target, 'engine': engine, 'flows': flows,
+               'degraded': curves is not None, 'names': len(TARGETS[target]), 'axes': len(axes), 'workers': workers,
+               'pending': pending, 'reserved': reserved}
+    if memory is not None:
+        memory = budget.parse(memory)
+        auto = min(budget.chunk_size(memory, **options), -(-size // workers))
+        chunk = auto if chunk is None else min(chunk, auto)
+    elif chunk is None:
+        chunk = 4096
+    chunk = max(int(chunk), 1)
+    usage = {'budget': memory, 'chunk': chunk, 'estimate': budget.estimate(min(chunk, max(size, 1)), **options),
+             'baseline': budget.current(), 'peak': None, 'worker_peak': None}
+    return chunk, usage
+
+
+def sweep(finance, axes, target='irr', pro_irr=0.06, cap_irr=0.08, mode=0, jit=True,
+          flows=False, compact=False, chunk=None, workers=1, directory=None, progress=None, after_irr=None,
+          method='step', cache=None, engine=None, memory=None):
+    """
+    在参数网格上批量计算 IRR 或临界值。
+
+    输入参数：
+    ----------
+        finance: Finance
+            基准项目边界，未扫描的参数取其值
+
+        axes: list<(str, sequence)> or dict
+            扫描轴，参数名须为 Finance 的标量成员变量（如 'price', 'aep', 'static_investment'），
+            或 UNIT_AXES 中的派生参数（如 'unit_investment'，单位千瓦静态投资，元/kW），
+            或衰减曲线轴 'degradation'（取值为衰减曲线的列表，见 finance.degradation，结果网格中以曲线序号
+            表示，曲线说明记入 attrs['degradation']）
+
+        target: str, default = 'irr'
+            扫描目标，'irr'、'price'、'prices'、'aep' 或 'investment'，见 evaluate
+
+        pro_irr, cap_irr, mode:
+            临界值测算的收益率标准和测算模式，含义同 cal_price
+
+        jit: bool, default = True
+            是否使用编译内核（未安装 numba 时自动退回 numpy 实现）
+
+        flows: bool, default = False
+            是否保存逐年净现金流
+
+        compact: bool, default = False
+            紧凑存储模式，见 SweepResult
+
+        chunk: integer, default = None
+            每批计算的单元数，为 None 时由内存预算确定，未给出预算时取 4096
+
+        workers: integer, default = 1
+            并行计算的进程数，大于 1 时各进程将结果原地写入共享的内存映射结果网格
+
+        directory: str, default = None
+            并行计算时内存映射文件（各结果项的 .npy）的存放目录；为 None 时使用临时目录，
+            并在结果对象释放后删除
+
+        progress: callable or bool, default = None
+            运行监测回调，每完成一个批次以进度事件（见 finance.progress）调用一次；
+            为 True 时使用内置的 Progress 报告器
+
+        after_irr: float, default = None
+            项目投资 IRR（税后）标准，见 evaluate
+
+        method: str, default = 'step'
+            临界电价（发电量）的求解方法，见 evaluate
+
+        cache: Cache, default = None
+            测算结果缓存，见 evaluate；并行计算时各工作进程各自连接同一缓存文件
+
+        engine: str, default = None
+            现金流计算引擎，见 evaluate；为 None 时安装了 numba 用 'kernel'，否则用 'batch'。
+            使用 'batch' 时按 batch.plan 重排扫描轴的计算顺序（只影响电价、发电量、税率等收入税金块的参数
+            在内层），结果网格仍按输入的扫描轴顺序排列
+
+        memory: integer or str, default = None
+            内存预算（字节数或 '2GB' 等，见 finance.memory），按经营期和结果项估算每个单元的工作集，
+            扣除结果网格后自动确定批次大小；预算不足时抛出 ValueError
+
+    返回结果：
+    ----------
+        result: SweepResult
+            扫描结果，attrs['memory'] 记录内存预算、批次大小、估算用量、扫描前的常驻内存及主进程（和各工作进程中）的
+            实际峰值常驻内存（字节，含 Python 解释器及库本身，peak - baseline 为扫描新增的内存）
+
+    备注：
+    ----------
+        1. 计算以 float64 分批进行，结果逐批写入（紧凑模式下为 float32/int32 的）结果网格，
+           因而峰值内存约为结果网格本身加一个批次的中间量；
+        2. 并行计算时结果不经序列化回传，主进程只持有一份（内存映射的）结果网格。
+    """
+    budget.reset()
+    base, axes, curves, order, engine, labels = prepare(finance, axes, target, engine)
+    cells = _max_cells(base, axes) if flows else 0
+    attrs = {'target': target, 'pro_irr': pro_irr, 'cap_irr': cap_irr, 'mode': mode, 'after_irr': after_irr,
+             'method': method}
+    if labels is not None:
+        attrs['degradation'] = labels
+    result = SweepResult(axes, TARGETS[target], cells=cells, flows=flows and target == 'irr',
+                         compact=compact, attrs=attrs)
+    options = {'target': target, 'pro_irr': pro_irr, 'cap_irr': cap_irr, 'mode': mode,
+               'jit': jit, 'flows': flows, 'after_irr': after_irr, 'method': method,
+               'cache': cache, 'engine': engine}
+    chunk, usage = _plan_memory(base, axes, curves, target, engine, flows, chunk, memory, workers, 1, result.nbytes)
+    result.attrs['memory'] = usage
+    spans = [(start, min(start + chunk, result.size)) for start in range(0, result.size, chunk)]
+    if progress is True:
+        progress = Progress()
+    clock = time.perf_counter()
+    done = {'cells': 0, 'evaluations': 0}
+
+    def monitor(summary):
+        done['cells'] += summary['stop'] - summary['start']
+        done['evaluations'] += summary['evaluations']
+        if progress:
+            progress(make_event(done['cells'], result.size, time.perf_counter() - clock,
+                                done['evaluations'], summary))
+    if workers > 1 and len(spans) > 1:
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix='finance-sweep-')
+            weakref.finalize(result, shutil.rmtree, directory, True)
+        paths = result.share(directory)
+        with multiprocessing.Pool(workers, _init_worker, (base, axes, curves, options, paths, compact)) as pool:
+            for summary in pool.imap_unordered(_run_chunk, spans):
+                peak = summary.pop('peak')
+                if peak is not None:
+                    usage['worker_peak'] = max(usage['worker_peak'] or 0, peak)
+                monitor(summary)
+    else:
+        for start, stop in spans:
+            values = evaluate(grid_params(base, axes, start, stop),
+                              degradation=grid_degradation(axes, curves, start, stop), **options)
+            result.put(start, values)
+            monitor(_chunk_summary(axes, start, values))
+    if order != sorted(order):
+        result.transpose(np.argsort(order))
+    usage['peak'] = budget.peak()
+    return result
+
+
+_STREAM = None  # 流式扫描工作进程内的计算上下文（基准参数，扫描轴，衰减系数，计算选项）
+
+
+def _init_stream(base, axes, curves, options):
+    """
+    流式扫描工作进程初始化。
+    """
+    global _STREAM
+    _STREAM = (base, axes, curves, options)
+    budget.reset()
+
+
+def _stream_chunk(span):
+    """
+    流式扫描工作进程计算一个批次，结果及本进程的峰值内存回传主进程。
+    """
+    base, axes, curves, options = _STREAM
+    start, stop = span
+    values = evaluate(grid_params(base, axes, start, stop), degradation=grid_degradation(axes, curves, start, stop),
+                      **options)
+    return values, budget.peak()
+
+
+def stream(finance, axes, target='irr', pro_irr=0.06, cap_irr=0.08, mode=0, jit=True, flows=False, chunk=None,
+           workers=1, progress=None, after_irr=None, method='step', cache=None, engine=None, memory=None):
+    """
+    流式参数扫描：按网格展平顺序逐批计算，每批以结果块（Block，含扫描参数坐标）产出，不保留整个结果网格。
+
+    输入参数：
+    ----------
+        finance, axes, target, pro_irr, cap_irr, mode, jit, flows, chunk, progress, after_irr, method, cache, engine:
+            同 sweep
+
+        memory: integer or str, default = None
+            内存预算，见 sweep；按同时在算（及待产出）的批次估算批次大小，不含结果块写出后的文件
+
+        workers: integer, default = 1
+            并行计算的进程数，大于 1 时各批次并行计算、按顺序产出，同时在算的批次不超过 2 × workers
+
+    返回结果：
+    ----------
+        blocks: generator<Block>
+            依次产出的结果块，可直接交给 store.write_blocks 写入 csv、excel 或二进制结果文件；
+            各块共用的 attrs['memory'] 记录内存预算、批次大小、估算用量和截至当前的峰值常驻内存（字节）
+
+    备注：
+    ----------
+        1. 峰值内存约为 2 × workers 个批次的中间量，与网格大小无关；
+        2. 扫描轴始终按输入顺序展平，engine 为 'batch' 时也不重排（见 sweep 的 engine 参数）。
+    """
+    budget.reset()
+    base, axes, curves, _, engine, labels = prepare(finance, axes, target, engine, reorder=False)
+    attrs = {'target': target, 'pro_irr': pro_irr, 'cap_irr': cap_irr, 'mode': mode, 'after_irr': after_irr,
+             'method': method}
+    if labels is not None:
+        attrs['degradation'] = labels
+    cells = _max_cells(base, axes) if flows else 0
+    options = {'target': target, 'pro_irr': pro_irr, 'cap_irr': cap_irr, 'mode': mode,
+               'jit': jit, 'flows': flows, 'after_irr': after_irr, 'method': method,
+               'cache': cache, 'engine': engine}
+    size = int(np.prod([len(values) for _, values in axes], dtype=np.int64))
+    in_flight = 2 * workers if workers > 1 else 1
+    chunk, usage = _plan_memory(base, axes, curves, target, engine, flows, chunk, memory, workers, in_flight, 0)
+    attrs['memory'] = usage
+    spans = [(start, min(start + chunk, size)) for start in range(0, size, chunk)]
+    if progress is True:
+        progress = Progress()
+    clock = time.perf_counter()
+    done = {'cells': 0, 'evaluations': 0}
+
+    def block(start, values):
+        summary = _chunk_summary(axes, start, values)
+        done['cells'] += summary['stop'] - summary['start']
+        done['evaluations'] += summary['evaluations']
+        if progress:
+            progress(make_event(done['cells'], size, time.perf_counter() - clock, done['evaluations'], summary))
+        usage['peak'] = budget.peak()
+        return Block(axes, start, values, cells, attrs)
+    if workers > 1 and len(spans) > 1:
+        with multiprocessing.Pool(workers, _init_stream, (base, axes, curves, options)) as pool:
+            pending = collections.deque()
+            remaining = iter(spans)
+            for span in remaining:
+                pending.append((span, pool.apply_async(_stream_chunk, (span,))))
+                if len(pending) >= 2 * workers:
+                    break
+            while pending:
+                span, task = pending.popleft()
+                values, peak = task.get()
+                if peak is not None:
+                    usage['worker_peak'] = max(usage['worker_peak'] or 0, peak)
+                following = next(remaining, None)
+                if following is not None:
+                    pending.append((following, pool.apply_async(_stream_chunk, (following,))))
+                yield block(span[0], values)
+    else:
+        for start, stop in spans:
+            values = evaluate(grid_params(base, axes, start, stop),
+                              degradation=grid_degradation(axes, curves, start, stop), **options)
+            yield block(start, values)
@@ -11,7 +11,6 @@
 # Start typing your code from here
 # 这里是一些基础的工具
 
-import xlsxwriter as xlsw
 import numpy as np
 
 
@@ -48,6 +47,8 @@ def write_excel(data, sheet_name=[], row_header=[], column_header=[], file='resu
         2. 暂时不考虑表格的格式化问题，包括标题、表头、列头等，后续再行补加。
 
     """
+    import xlsxwriter as xlsw  # 仅在写入 excel 时导入
+
     # 取得 data 列表维度
     dim = len(np.array(data).shape)
 
@@ -0,0 +1,202 @@
+#!/usr/bin/python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   verify.py
+@Time    :   2026/10/19 19:48:06
+@Author  :   liuzy2020
+@Version :   1.0
+@Contact :   liuzy2013@163.com
+@WebSite :   https://github.com/path2019
+'''
+# Start typing your code from here
+# 计算引擎的差分校验：在风电、光伏典型参数范围内随机生成项目边界，以参考实现（Finance.com_finance、npf.irr、
+# 逐步搜索的 cal_price）为准，逐项比较各候选引擎的现金流、IRR 和临界电价，并列出各引擎相对参考实现的加速比
+#
+# 用法：
+#     python -m finance.verify --kind wind --cases 200 --prices 20
+#     rows = run('pv', cases=200); print(report(rows))
+
+import argparse
+import sys
+import time
+import numpy as np
+
+from finance import kernel
+from finance.base import Finance
+from finance.sweep import UNIT_AXES, evaluate
+
+# 随机边界的取值范围：(下限, 上限) 为均匀分布，列表为等概率的离散取值；未列出的参数取 Finance 的默认值
+RANGES = {'wind': {'aep': (1800.0, 3500.0), 'unit_investment': (4000.0, 8000.0), 'price': (0.2, 0.45),
+                   'capital_ratio': (0.2, 0.35), 'loan_rate': (0.03, 0.05), 'vat_refund_rate': [0.0, 0.5],
+                   'in_repair_rate': (0.003, 0.008), 'out_repair_rate': (0.01, 0.02), 'build_period': [1, 2],
+                   'operate_period': [20], 'loan_period': [10, 12, 15], 'warranty': [3, 5],
+                   'depreciation_period': [15, 20]},
+          'pv': {'aep': (1000.0, 1800.0), 'unit_investment': (3000.0, 5000.0), 'price': (0.2, 0.45),
+                 'capital_ratio': (0.2, 0.35), 'loan_rate': (0.03, 0.05), 'vat_refund_rate': [0.0],
+                 'in_repair_rate': (0.001, 0.003), 'out_repair_rate': (0.003, 0.008), 'other_quota': (15.0, 25.0),
+                 'build_period': [1], 'operate_period': [25], 'loan_period': [10, 15, 18], 'warranty': [3, 5],
+                 'depreciation_period': [20]}}
+
+# 候选引擎：名称 -> sweep.evaluate 的选项
+FLOW_ENGINES = {'kernel': {'jit': True, 'engine': 'kernel'},
+                'batch': {'jit': True, 'engine': 'batch'}}
+PRICE_ENGINES = {'step-kernel': {'jit': True, 'method': 'step'},
+                 'exact': {'jit': False, 'method': 'exact'},
+                 'exact-kernel': {'jit': True, 'method': 'exact'}}
+
+# 容许误差：现金流为相对误差（以参考现金流的最大绝对值计），IRR、电价为绝对误差；
+# 精确求解与逐步搜索（步长 0.0001 元）的电价相差不超过一个步长
+TOLERANCES = {'flows': 1e-9, 'irr': 1e-9, 'price': 1e-9, 'price-exact': 1.0001e-4}
+
+
+def samples(kind='wind', cases=200, seed=0):
+    """
+    在 RANGES[kind] 的范围内随机生成项目边界。
+
+    输入参数：
+    ----------
+        kind: str, default = 'wind'
+            项目类型，'wind' 或 'pv'
+
+        cases: integer, default = 200
+            生成的边界组数
+
+        seed: integer, default = 0
+            随机数种子，相同种子生成相同的边界
+
+    返回结果：
+    ----------
+        params: np.array<float>
+            参数矩阵（情景数, len(kernel.FIELDS)）
+    """
+    if kind not in RANGES:
+        raise ValueError('未知的项目类型：%s' % kind)
+    rng = np.random.default_rng(seed)
+    params = np.tile(kernel.pack(Finance()), (cases, 1))
+    for name, span in RANGES[kind].items():
+        if isinstance(span, tuple):
+            values = rng.uniform(span[0], span[1], cases)
+        else:
+            values = rng.choice(np.asarray(span, dtype=np.float64), cases)
+        if name in UNIT_AXES:
+            params[:, kernel.INDEX[UNIT_AXES[name]]] = values * params[:, kernel.INDEX['capacity']]
+        else:
+            params[:, kernel.INDEX[name]] = values
+    return params
+
+
+def _timed(function):
+    """
+    调用 function()，返回（结果，用时秒数）。
+    """
+    start = time.perf_counter()
+    value = function()
+    return value, time.perf_counter() - start
+
+
+def _error(value, reference, scale=None):
+    """
+    最大误差：两者均为 nan（IRR 不存在）时视为一致，仅一方为 nan 时误差为 inf。
+    """
+    value, reference = np.asarray(value), np.asarray(reference)
+    both = np.isnan(value) & np.isnan(reference)
+    diff = np.where(both, 0.0, np.abs(value - reference))
+    diff = np.where(np.isnan(diff), np.inf, diff)
+    if scale is not None:
+        diff = diff / scale
+    return float(diff.max()) if diff.size else 0.0
+
+
+def run(kind='wind', cases=200, prices=20, seed=0, pro_irr=0.06, cap_irr=0.08, mode=0, engines=None):
+    """
+    执行差分校验。
+
+    输入参数：
+    ----------
+        kind, cases, seed:
+            随机边界的项目类型、组数和种子，见 samples
+
+        prices: integer, default = 20
+            参与临界电价校验的边界组数（取前 prices 组），参考实现逐步搜索较慢，为 0 时不校验
+
+        pro_irr, cap_irr, mode:
+            临界电价的收益率标准和测算模式，含义同 cal_price
+
+        engines: list<str>, default = None
+            参与校验的候选引擎（FLOW_ENGINES、PRICE_ENGINES 中的名称），为 None 时全部参与
+
+    返回结果：
+    ----------
+        rows: list<dict>
+            每个（校验项，引擎）一行：'check'、'engine'、'cases'、'error'（最大误差）、'tolerance'、'passed'、
+            'reference'（参考实现用时，秒）、'seconds'（引擎用时，秒）、'speedup'（加速比）
+    """
+    params = samples(kind, cases, seed)
+    rows = []
+    reference, ref_seconds = _timed(lambda: evaluate(params, target='irr', jit=False, flows=True))
+    flows = reference['flows']
+    scale = np.maximum(np.abs(flows).max(axis=2, keepdims=True), 1.0)
+    for name, options in FLOW_ENGINES.items():
+        if engines is not None and name not in engines:
+            continue
+        evaluate(params[:2], target='irr', flows=True, **options)  # 预热（编译内核）
+        values, seconds = _timed(lambda: evaluate(params, target='irr', flows=True, **options))
+        error = _error(values['flows'], flows, scale)
+        rows.append(_row('flows', name, cases, error, TOLERANCES['flows'], ref_seconds, seconds))
+        error = max(_error(values[item], reference[item]) for item in ('pre_pro_irr', 'after_pro_irr', 'cap_irr'))
+        rows.append(_row('irr', name, cases, error, TOLERANCES['irr'], ref_seconds, seconds))
+    if prices:
+        subset = params[:prices]
+        criteria = {'pro_irr': pro_irr, 'cap_irr': cap_irr, 'mode': mode}
+        reference, ref_seconds = _timed(lambda: evaluate(subset, target='price', jit=False, method='step',
+                                                         **criteria))
+        for name, options in PRICE_ENGINES.items():
+            if engines is not None and name not in engines:
+                continue
+            evaluate(subset[:1], target='price', **criteria, **options)
+            values, seconds = _timed(lambda: evaluate(subset, target='price', **criteria, **options))
+            tolerance = TOLERANCES['price-exact' if options['method'] == 'exact' else 'price']
+            rows.append(_row('price', name, len(subset), _error(values['price'], reference['price']), tolerance,
+                             ref_seconds, seconds))
+    return rows
+
+
+def _row(check, engine, cases, error, tolerance, reference, seconds):
+    return {'check': check, 'engine': engine, 'cases': cases, 'error': error, 'tolerance': tolerance,
+            'passed': error <= tolerance, 'reference': reference, 'seconds': seconds,
+            'speedup': reference / seconds if seconds > 0 else np.inf}
+
+
+def report(rows):
+    """
+    将校验结果排版为文本表格。
+    """
+    lines = ['%-6s %-13s %6s %12s %12s %6s %10s %10s %9s' % ('check', 'engine', 'cases', 'error', 'tolerance',
+                                                             'passed', 'ref(s)', 'engine(s)', 'speedup')]
+    for row in rows:
+        lines.append('%-6s %-13s %6d %12.3g %12.3g %6s %10.4f %10.4f %8.1fx' % (
+            row['check'], row['engine'], row['cases'], row['error'], row['tolerance'],
+            'yes' if row['passed'] else 'NO', row['reference'], row['seconds'], row['speedup']))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """
+    命令行入口：python -m finance.verify [--kind wind|pv] [--cases N] [--prices N] [--seed S] [--mode M]
+    全部校验项通过时返回 0，否则返回 1。
+    """
+    parser = argparse.ArgumentParser(prog='finance-verify', description='计算引擎与参考实现的差分校验')
+    parser.add_argument('--kind', choices=sorted(RANGES), default='wind', help='项目类型')
+    parser.add_argument('--cases', type=int, default=200, help='随机边界组数')
+    parser.add_argument('--prices', type=int, default=20, help='参与临界电价校验的边界组数')
+    parser.add_argument('--seed', type=int, default=0, help='随机数种子')
+    parser.add_argument('--mode', type=int, default=0, help='临界电价的测算模式')
+    parser.add_argument('--engine', action='append', help='只校验指定引擎（可多次给出）')
+    args = parser.parse_args(argv)
+    rows = run(args.kind, args.cases, args.prices, args.seed, mode=args.mode, engines=args.engine)
+    print(report(rows))
+    return 0 if all(row['passed'] for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
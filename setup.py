@@ -29,6 +29,10 @@ REQUIRED = [
 # What packages are optional?
 EXTRAS = {
     # 'fancy feature': ['django'],
+    'jit': ['numba'],
+    'yaml': ['PyYAML'],
+    'xlsx': ['openpyxl'],
+    'report': ['matplotlib'],
 }
 
 # The rest you shouldn't have to touch too much :)
@@ -108,9 +112,11 @@ setup(
     # If your package is a single module, use this instead of 'packages':
     # py_modules=['mypackage'],
 
-    # entry_points={
-    #     'console_scripts': ['mycli=mymodule:cli'],
-    # },
+    entry_points={
+        'console_scripts': ['finance=finance.cli:main', 'finance-server=finance.server:main',
+                            'finance-shard=finance.shard:main', 'finance-verify=finance.verify:main',
+                            'finance-register=finance.register:main', 'finance-report=finance.report:main'],
+    },
     install_requires=REQUIRED,
     extras_require=EXTRAS,
     include_package_data=True,
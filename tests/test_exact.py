@@ -0,0 +1,38 @@
+# 临界电价（发电量）精确求解与逐步搜索相差不超过一个步长
+
+import pytest
+
+from finance import kernel
+from finance.base import Finance
+from finance.calculate import cal_aep, cal_price
+
+PRICE_STEP = 0.0001  # cal_price 逐步搜索的步长（元/kWh）
+AEP_STEP = 1.0  # cal_aep 逐步搜索的步长（小时）
+
+CASES = [
+    {},
+    {'aep': 1800, 'price': 0.35},
+    {'aep': 3200, 'price': 0.2, 'build_period': 2, 'capital_ratio': 0.3},
+    {'static_investment': 600000, 'loan_period': 12, 'build_period': 0},
+]
+
+
+@pytest.mark.parametrize('mode', [0, 1, 2])
+@pytest.mark.parametrize('values', CASES)
+def test_exact_price_within_one_step(values, mode):
+    step = cal_price(Finance(**values), mode=mode, method='step')
+    exact = cal_price(Finance(**values), mode=mode, method='exact')
+    assert abs(exact - step) <= PRICE_STEP * (1 + 1e-6)
+
+
+@pytest.mark.parametrize('mode', [0, 1, 2])
+@pytest.mark.parametrize('values', CASES)
+def test_exact_aep_within_one_step(values, mode):
+    step = cal_aep(Finance(**values), mode=mode, method='step')
+    exact = cal_aep(Finance(**values), mode=mode, method='exact')
+    assert abs(exact - step) <= AEP_STEP * (1 + 1e-6)
+
+
+def test_exact_price_is_the_root():
+    price = cal_price(Finance(), cap_irr=0.08, mode=0, method='exact')
+    assert kernel.evaluate(Finance(price=price))[2] == pytest.approx(0.08, abs=1e-9)
@@ -0,0 +1,38 @@
+# 编译内核与 Finance.com_finance 逐位一致
+
+import numpy as np
+import pytest
+
+from finance import kernel
+from finance.base import Finance
+
+CASES = [
+    {},
+    {'aep': 1800, 'price': 0.25, 'static_investment': 45000},
+    {'build_period': 0, 'loan_period': 10, 'capital_ratio': 0.3},
+    {'build_period': 2, 'operate_period': 25, 'depreciation_period': 15, 'warranty': 3},
+    {'build_period': 1.5, 'grace_period': 2, 'rate_discount': 0.9, 'working_ratio': 1.0},
+]
+
+
+@pytest.mark.parametrize('values', CASES)
+def test_flows_match_reference(values):
+    expected = Finance(**values).com_finance()
+    flows = kernel.com_finance(Finance(**values))
+    for reference, value in zip(expected, flows):
+        assert np.array_equal(np.asarray(reference, dtype=np.float64), value)
+
+
+def test_batch_rows_match_single_cases():
+    params = np.array([kernel.pack(Finance(**values)) for values in CASES[:2]])
+    flows = kernel.com_flows(params)
+    for k, values in enumerate(CASES[:2]):
+        expected = np.array(Finance(**values).com_finance())
+        assert np.array_equal(flows[k, :, :expected.shape[-1]], expected)
+
+
+def test_pack_does_not_modify_instance():
+    finance = Finance(aep=2600)
+    kernel.com_finance(finance)
+    assert finance.aep == 2600
+    assert np.all(kernel.pack(finance) == kernel.pack(Finance(aep=2600)))
@@ -0,0 +1,30 @@
+# 进度日志：每行为严格的 JSON（无 NaN、Infinity）
+
+import json
+
+import numpy as np
+
+from finance.base import Finance
+from finance.progress import Progress, make_event
+from finance.sweep import sweep
+
+
+def _strict(line):
+    def reject(constant):
+        raise ValueError('非严格 JSON：%s' % constant)
+    return json.loads(line, parse_constant=reject)
+
+
+def test_unknown_eta_is_null(tmp_path):
+    progress = Progress(stream=None, log=str(tmp_path / 'progress.jsonl'))
+    progress(make_event(0, 10, 0.0, 0, {'max_evaluations': 1, 'worst': {'aep': float('nan')}}))
+    progress.log.close()
+    record = _strict((tmp_path / 'progress.jsonl').read_text(encoding='utf-8'))
+    assert record['eta'] is None and record['chunk']['worst']['aep'] is None
+
+
+def test_sweep_log_is_strict_json(tmp_path):
+    progress = Progress(stream=None, log=str(tmp_path / 'progress.jsonl'))
+    sweep(Finance(), [('aep', np.linspace(2000, 3000, 9))], chunk=3, progress=progress)  # 扫描结束时关闭日志
+    records = [_strict(line) for line in (tmp_path / 'progress.jsonl').read_text(encoding='utf-8').splitlines()]
+    assert records[-1]['cells'] == records[-1]['total'] == 9
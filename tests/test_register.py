@@ -0,0 +1,23 @@
+# 项目清单：无效行只在该行报告错误，其它行照常计算
+
+import numpy as np
+import pytest
+
+from finance import kernel, register
+from finance.base import Finance
+
+
+@pytest.mark.parametrize('name, value', [('warranty', -3), ('warranty', 'inf'), ('loan_period', 'nan'),
+                                         ('loan_period', 0), ('operate_period', 20.5)])
+def test_invalid_row_is_reported(name, value):
+    rows = [{'aep': '2200'}, {'aep': '2200', name: str(value)}]
+    results = register.evaluate(rows)
+    assert results[0]['error'] is None
+    assert results[0]['cap_irr'] == pytest.approx(kernel.evaluate(Finance(aep=2200))[2], abs=1e-12)
+    assert name in results[1]['error']
+    assert results[1]['cap_irr'] is None
+
+
+def test_validate_accepts_default_boundary():
+    assert register.validate(kernel.pack(Finance())) == []
+    assert register.validate(np.full(len(kernel.FIELDS), np.nan))
@@ -0,0 +1,61 @@
+# 敏感性分析报告：未安装 matplotlib 时只生成汇总表和汇总页
+
+import os
+import zipfile
+
+import numpy as np
+import pytest
+
+from finance import report
+from finance.base import Finance
+from finance.sweep import sweep
+
+AXES = [('price', [0.25, 0.3, 0.35]), ('aep', [2000, 2500, 3000])]
+
+
+@pytest.fixture
+def results(tmp_path):
+    files = []
+    for directory in ('first', 'second'):  # 不同目录下的同名结果文件
+        os.makedirs(tmp_path / directory)
+        files.append(str(tmp_path / directory / 'wind.npz'))
+        sweep(Finance(), AXES).save(files[-1])
+    return files
+
+
+def test_tables_and_index_without_matplotlib(tmp_path, results, monkeypatch):
+    monkeypatch.setattr(report, 'have_matplotlib', lambda: False)
+    output = str(tmp_path / 'report')
+    built = report.build(results, output, workers=1)
+    assert built['figures'] == []
+    assert 'matplotlib' in built['skipped']
+    with zipfile.ZipFile(built['tables']) as archive:
+        workbook = archive.read('xl/workbook.xml').decode('utf-8')
+    assert 'name="summary"' in workbook and 'name="tornado"' in workbook
+    with open(built['index'], encoding='utf-8') as f:
+        index = f.read()
+    assert '<h2>wind</h2>' in index and '<h2>wind_2</h2>' in index  # 同名输入各有名称
+
+
+def test_figures_required_without_matplotlib(tmp_path, results, monkeypatch):
+    monkeypatch.setattr(report, 'have_matplotlib', lambda: False)
+    with pytest.raises(ImportError):
+        report.build(results, str(tmp_path / 'report'), figures=True)
+
+
+@pytest.mark.parametrize('prices', [[0.25, 0.3, 0.35], [0.3078, 0.2595, 0.372]])  # 后者如分省测算的省份轴
+def test_summary_and_tornado_values(prices):
+    result = sweep(Finance(), [('price', prices), ('aep', [2000, 2500, 3000])])
+    values = result['cap_irr']
+    mid = int(np.argsort(prices)[1])  # 按取值居中的电价
+    row = {item['name']: item for item in report.summary(result)}['cap_irr']
+    assert row['base'] == values[mid, 1]
+    assert row['min'] == np.nanmin(values) and row['max'] == np.nanmax(values)
+    bars = {bar['axis']: bar for bar in report.tornado(result, 'cap_irr')}
+    lo, hi = int(np.argmin(prices)), int(np.argmax(prices))
+    assert (bars['price']['low'], bars['price']['high']) == (min(prices), max(prices))
+    assert (bars['price']['at_low'], bars['price']['at_high']) == (values[lo, 1], values[hi, 1])
+    assert (bars['aep']['at_low'], bars['aep']['at_high']) == (values[mid, 0], values[mid, 2])
+    assert bars['price']['at_low'] < bars['price']['base'] < bars['price']['at_high']
+    spans = [bar['span'] for bar in report.tornado(result, 'cap_irr')]
+    assert spans == sorted(spans, reverse=True)
@@ -0,0 +1,80 @@
+# 本地测算服务：在本机端口上启动，检查请求合并、错误隔离和衰减曲线、逐年路径
+
+import asyncio
+import http.client
+import json
+
+import pytest
+
+from finance import kernel, server
+from finance.base import Finance
+
+
+def _post(port, target, body):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    connection.request('POST', '/evaluate/' + target, json.dumps(body))
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def _run(requests, window=0.05):
+    """
+    启动服务（系统分配端口），并发提交 [(target, body), ...]，返回各请求的（状态码，结果）及服务对象。
+    """
+    async def main():
+        service = server.Service(window=window)
+        await service.start(port=0)
+        loop = asyncio.get_running_loop()
+        try:
+            responses = await asyncio.gather(*[loop.run_in_executor(None, _post, service.port, target, body)
+                                               for target, body in requests])
+        finally:
+            service.server.close()
+            await service.server.wait_closed()
+        return responses, service
+    return asyncio.run(main())
+
+
+def test_irr_matches_kernel():
+    (status, values), = _run([('irr', {'params': {'aep': 2300, 'price': 0.32}})])[0]
+    expected = kernel.evaluate(Finance(aep=2300, price=0.32))
+    assert status == 200
+    assert [values['pre_pro_irr'], values['after_pro_irr'], values['cap_irr']] == pytest.approx(expected, abs=1e-12)
+
+
+def test_concurrent_requests_are_batched():
+    requests = [('irr', {'params': {'aep': 2000 + 100 * k}}) for k in range(6)]
+    responses, service = _run(requests, window=0.2)
+    assert [status for status, _ in responses] == [200] * 6
+    assert service.batcher.batches < len(requests)
+    for k, (_, values) in enumerate(responses):
+        assert values['cap_irr'] == pytest.approx(kernel.evaluate(Finance(aep=2000 + 100 * k))[2], abs=1e-12)
+
+
+def test_invalid_request_does_not_fail_others():
+    requests = [('irr', {'params': {'aep': 2400}})] * 3 + [('irr', {'params': {'loan_period': 0}})]
+    responses, _ = _run(requests)
+    assert [status for status, _ in responses] == [200, 200, 200, 400]
+
+
+def test_failing_batch_is_retried_per_request(monkeypatch):
+    monkeypatch.setattr(server, '_build', lambda row, target, k: server.build_finance(row))  # 跳过检查，使批次出错
+    requests = [('irr', {'params': {'aep': 2400}})] * 3 + [('irr', {'params': {'loan_period': 0}})]
+    responses, _ = _run(requests)
+    assert [status for status, _ in responses] == [200, 200, 200, 500]
+
+
+@pytest.mark.parametrize('params', [{'price_path': [0.6] * 20}, {'aep_path': [2800] * 10 + [2200] * 10},
+                                    {'degradation': 'linear'}])
+def test_paths_and_curves_are_honoured(params):
+    (status, values), = _run([('irr', {'params': params})])[0]
+    expected = kernel.evaluate(Finance(**params))
+    assert status == 200
+    assert [values['pre_pro_irr'], values['after_pro_irr'], values['cap_irr']] == pytest.approx(expected, abs=1e-12)
+    assert values['cap_irr'] != pytest.approx(kernel.evaluate(Finance())[2], abs=1e-6)
+
+
+def test_paths_rejected_for_critical_values():
+    (status, values), = _run([('price', {'params': {'price_path': [0.6] * 20}})])[0]
+    assert status == 400
+    assert 'price_path' in values['error']
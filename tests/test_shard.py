@@ -0,0 +1,67 @@
+# 分片扫描：合并结果与单机扫描一致、重复提交与合并幂等、中断的分片不无限重领
+
+import json
+
+import numpy as np
+import pytest
+
+from finance import shard
+from finance.base import Finance
+from finance.store import SweepResult
+from finance.sweep import sweep
+
+AXES = [('aep', np.linspace(1800, 3000, 7)), ('degradation', ['legacy', 'linear']), ('price', [0.25, 0.3, 0.35])]
+
+
+def _same(result, expected):
+    return all(np.array_equal(result[name], expected[name], equal_nan=True) for name in expected.data)
+
+
+@pytest.mark.parametrize('options', [{'target': 'irr'}, {'target': 'price', 'method': 'exact'}])
+def test_merge_equals_local_sweep(tmp_path, options):
+    queue = shard.SqliteQueue(str(tmp_path / 'queue.sqlite'))
+    job = shard.submit(queue, Finance(), AXES, shard=8, **options)
+    assert shard.work(queue, job) == 6
+    assert _same(shard.merge(queue, job), sweep(Finance(), AXES, **options))
+
+
+def test_resubmit_and_merge_are_idempotent(tmp_path):
+    queue = shard.SqliteQueue(str(tmp_path / 'queue.sqlite'))
+    job = shard.submit(queue, Finance(), AXES, shard=8)
+    shard.work(queue, job)
+    first = shard.merge(queue, job)
+    assert shard.submit(queue, Finance(), AXES, shard=8) == job
+    assert shard.work(queue, job) == 0  # 已完成的分片不重算
+    assert _same(shard.merge(queue, job), first)
+    assert queue.complete(job, 0, b'ignored') is False
+
+
+def test_spec_is_stored_without_pickle(tmp_path):
+    queue = shard.SqliteQueue(str(tmp_path / 'queue.sqlite'))
+    job = shard.submit(queue, Finance(), AXES, target='price', method='exact', shard=8)
+    spec = shard.load_spec(queue.spec(job))
+    assert spec['options']['method'] == 'exact'
+    assert [name for name, _ in spec['axes']] == [name for name, _ in AXES]
+    assert queue.spec(job)[:2] == b'PK'  # npz（zip）归档，不是 pickle
+
+
+def test_expired_lease_is_not_reclaimed_forever(tmp_path):
+    queue = shard.SqliteQueue(str(tmp_path / 'queue.sqlite'), retries=2)
+    job = shard.submit(queue, Finance(), [('aep', [2000.0])], shard=1)
+    claims = 0
+    while queue.claim('crashed', lease=-1.0, job=job) is not None:  # 领取后不提交也不报告失败，租约立即到期
+        claims += 1
+        assert claims <= 2
+    assert queue.status(job)['failed'] == 1
+
+
+def test_cli_submit_with_memory_budget(tmp_path, capsys):
+    spec = {'base': {'capacity': 100.0}, 'axes': {'aep': [2000, 2500], 'price': [0.25, 0.3]}, 'memory': '64MB'}
+    (tmp_path / 'spec.json').write_text(json.dumps(spec))
+    queue = str(tmp_path / 'queue.sqlite')
+    assert shard.main(['submit', str(tmp_path / 'spec.json'), queue, '--shard', '2']) == 0
+    job = capsys.readouterr().out.strip()
+    assert shard.main(['work', queue]) == 0
+    assert shard.main(['merge', queue, job, '-o', str(tmp_path / 'result.npz')]) == 0
+    expected = sweep(Finance(capacity=100.0), [('aep', [2000, 2500]), ('price', [0.25, 0.3])])
+    assert _same(SweepResult.load(str(tmp_path / 'result.npz')), expected)
@@ -0,0 +1,47 @@
+# 结果存储：流式写入中断时不生成结果文件，未写入的单元为缺失值
+
+import os
+
+import numpy as np
+import pytest
+
+from finance.base import Finance
+from finance.store import SweepResult, StoreWriter, write_blocks
+from finance.sweep import stream
+
+AXES = [('aep', np.linspace(1800, 3000, 5)), ('price', np.linspace(0.25, 0.35, 17))]
+
+
+def _interrupted(blocks, count):
+    for k, block in enumerate(blocks):
+        if k == count:
+            raise KeyboardInterrupt
+        yield block
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_interrupted_stream_writes_nothing(tmp_path, compact):
+    file = str(tmp_path / 'result.npz')
+    blocks = stream(Finance(), AXES, chunk=17)
+    with pytest.raises(KeyboardInterrupt):
+        write_blocks(_interrupted(blocks, 2), file, compact=compact)
+    assert not os.path.exists(file)
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_unwritten_cells_are_missing(tmp_path, compact):
+    file = str(tmp_path / 'result.npz')
+    blocks = list(stream(Finance(), AXES, chunk=17))
+    writer = StoreWriter(file, compact=compact)
+    for block in blocks[:2]:
+        writer.write(block)
+    writer.close()
+    values = SweepResult.load(file)['cap_irr']
+    assert not np.isnan(values[:2]).any()
+    assert np.isnan(values[2:]).all()
+
+
+def test_complete_stream_is_saved(tmp_path):
+    file = str(tmp_path / 'result.npz')
+    assert write_blocks(stream(Finance(), AXES, chunk=17), file) == 85
+    assert not np.isnan(SweepResult.load(file)['cap_irr']).any()
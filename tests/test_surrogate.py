@@ -0,0 +1,25 @@
+# 代理模型：盒外精确计算与 kernel.evaluate 一致（含衰减曲线），保存读取后不变
+
+import pytest
+
+from finance import kernel
+from finance.base import Finance
+from finance.surrogate import Surrogate
+
+BOX = {'aep': (2000, 3000), 'price': (0.25, 0.35)}
+
+
+@pytest.mark.parametrize('curve', [None, 'linear'])
+def test_outside_box_matches_kernel(tmp_path, curve):
+    model = Surrogate.fit(Finance(degradation=curve), BOX, degree=6, validate=20)
+    expected = kernel.evaluate(Finance(degradation=curve, aep=3001, price=0.351))[2]
+    assert model(aep=3001, price=0.351)['cap_irr'] == pytest.approx(expected, abs=1e-12)
+    model.save(str(tmp_path / 'model.npz'))
+    loaded = Surrogate.load(str(tmp_path / 'model.npz'))
+    assert loaded(aep=3001, price=0.351)['cap_irr'] == pytest.approx(expected, abs=1e-12)
+
+
+def test_inside_box_close_to_kernel():
+    model = Surrogate.fit(Finance(degradation='linear'), BOX, degree=8, validate=20)
+    expected = kernel.evaluate(Finance(degradation='linear', aep=2500, price=0.3))[2]
+    assert model(aep=2500, price=0.3)['cap_irr'] == pytest.approx(expected, abs=1e-3)